@@ -15,8 +15,11 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import time
+
 import mxnet as mx
 from benchmark.opperf.utils.benchmark_utils import run_op_benchmarks
+from benchmark.opperf.utils.common_utils import merge_map_list
 from benchmark.opperf.utils.op_registry_utils import get_all_optimizer_operators
 
 """Performance benchmark tests for MXNet Neural Network Optimizer Update Operators.
@@ -33,8 +36,23 @@ from benchmark.opperf.utils.op_registry_utils import get_all_optimizer_operators
 5. rmsprop_update
 6. ftrl_update
 7. adam_update
+8. Multi-tensor updates, fused versus one launch per tensor
+    8.1 multi_adam_update
+    8.2 multi_rmsprop_update
+    8.3 multi_nag_mom_update
+    8.4 multi_adagrad_update
+    8.5 multi_ftrl_update
 """
 
+# (fused operator, per-tensor operator, number of states, hyperparameters)
+MULTI_TENSOR_OPTIMIZER_OPS = [
+    ('multi_adam_update', 'adam_update', 2, {'beta1': 0.9, 'beta2': 0.999, 'epsilon': 1e-8}),
+    ('multi_rmsprop_update', 'rmsprop_update', 1, {'gamma1': 0.9, 'epsilon': 1e-8}),
+    ('multi_nag_mom_update', 'nag_mom_update', 1, {'momentum': 0.9}),
+    ('multi_adagrad_update', None, 1, {'epsilon': 1e-7}),
+    ('multi_ftrl_update', 'ftrl_update', 2, {'lamda1': 0.01, 'beta': 1.0}),
+]
+
 
 def run_optimizer_operators_benchmarks(ctx=mx.cpu(), dtype='float32', profiler='native', warmup=25, runs=100):
     """Runs benchmarks with the given context and precision (dtype) for all the neural network
@@ -61,4 +79,77 @@ def run_optimizer_operators_benchmarks(ctx=mx.cpu(), dtype='float32', profiler='
 
     # Run benchmarks
     mx_optimizer_op_results = run_op_benchmarks(mx_optimizer_ops, dtype, ctx, profiler, warmup, runs)
-    return mx_optimizer_op_results
+    mx_multi_tensor_results = run_multi_tensor_optimizer_benchmarks(ctx=ctx, dtype=dtype,
+                                                                    warmup=warmup, runs=runs)
+    return merge_map_list([mx_optimizer_op_results, mx_multi_tensor_results])
+
+
+def _time_per_run(func, warmup, runs):
+    for _ in range(warmup):
+        func()
+    mx.nd.waitall()
+    start = time.perf_counter()
+    for _ in range(runs):
+        func()
+    mx.nd.waitall()
+    return (time.perf_counter() - start) * 1000 / runs
+
+
+def run_multi_tensor_optimizer_benchmarks(ctx=mx.cpu(), dtype='float32', num_weights=48,
+                                          shape=(64, 64), warmup=25, runs=100):
+    """Runs benchmarks comparing the fused multi-tensor optimizer updates against
+    one per-tensor update launch per weight, on many small tensors.
+
+    Parameters
+    ----------
+    ctx: mx.ctx
+        Context to run benchmarks
+    dtype: str, default 'float32'
+        Precision to use for benchmarks
+    num_weights: int, default 48
+        Number of weights updated per step. At most 60.
+    shape: tuple, default (64, 64)
+        Shape of every weight
+    warmup: int, default 25
+        Number of times to run for warmup
+    runs: int, default 100
+        Number of runs to capture benchmark results
+
+    Returns
+    -------
+    Dictionary of results. Key -> Name of the operator, Value -> Benchmark results.
+    Per-tensor baselines are reported as `<operator>_loop`.
+
+    """
+    results = {}
+    inputs = {'num_weights': num_weights, 'shape': shape}
+    for fused_name, loop_name, num_states, hyper_params in MULTI_TENSOR_OPTIMIZER_OPS:
+        weights = [mx.nd.random.uniform(shape=shape, ctx=ctx, dtype=dtype) for _ in range(num_weights)]
+        grads = [mx.nd.random.uniform(shape=shape, ctx=ctx, dtype=dtype) for _ in range(num_weights)]
+        states = [[mx.nd.zeros(shape, ctx=ctx, dtype=dtype) for _ in range(num_states)]
+                  for _ in range(num_weights)]
+        lrs = [0.01] * num_weights
+        wds = [0.0] * num_weights
+        flat_inputs = []
+        for weight, grad, state in zip(weights, grads, states):
+            flat_inputs += [weight, grad] + state
+        fused_op = getattr(mx.nd, fused_name)
+
+        def fused_step():
+            fused_op(*flat_inputs, out=weights, num_weights=num_weights,
+                     lrs=lrs, wds=wds, **hyper_params)
+
+        results[fused_name] = [{'avg_time_' + fused_name: _time_per_run(fused_step, warmup, runs),
+                                'inputs': inputs}]
+        if loop_name is None:
+            continue
+        loop_op = getattr(mx.nd, loop_name)
+
+        def loop_step():
+            for weight, grad, state in zip(weights, grads, states):
+                loop_op(weight, grad, *state, out=weight, lr=0.01, wd=0.0, **hyper_params)
+
+        results[loop_name + '_loop'] = [{'avg_time_' + loop_name + '_loop':
+                                         _time_per_run(loop_step, warmup, runs),
+                                         'inputs': inputs}]
+    return results
@@ -0,0 +1,84 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import mxnet as mx
+import numpy as np
+import time
+import logging
+import argparse
+
+logging.basicConfig(level=logging.INFO)
+parser = argparse.ArgumentParser(description='Gluon DataLoader worker transport benchmark')
+parser.add_argument('--num-samples', type=int, default=2048)
+parser.add_argument('--batch-size', type=int, default=64)
+parser.add_argument('--num-workers', type=int, default=4)
+parser.add_argument('--data-shape', type=str, default='3,224,224',
+                    help='Shape of each image sample.')
+parser.add_argument('--dtype', type=str, default='uint8')
+parser.add_argument('--num-epochs', type=int, default=3)
+parser.add_argument('--shm-slots', type=int, default=0,
+                    help='Number of shared memory slots. By default, uses 2 * prefetch.')
+parser.add_argument('--transport', type=str, default='all', choices=['all', 'pickle', 'shm'])
+
+opt = parser.parse_args()
+
+
+class SyntheticImageDataset(mx.gluon.data.Dataset):
+    """Synthetic dataset returning fixed-size images and labels."""
+    def __init__(self, length, shape, dtype):
+        self._length = length
+        self._shape = shape
+        self._dtype = dtype
+
+    def __getitem__(self, idx):
+        return mx.nd.full(self._shape, idx % 255, dtype=self._dtype), idx
+
+    def __len__(self):
+        return self._length
+
+
+def run(loader, num_epochs):
+    num_batches = 0
+    # first epoch warms up the worker pool
+    for x, y in loader:
+        x.wait_to_read()
+    tic = time.time()
+    for _ in range(num_epochs):
+        for x, y in loader:
+            x.wait_to_read()
+            num_batches += 1
+    return time.time() - tic, num_batches
+
+
+if __name__ == '__main__':
+    shape = tuple(int(i) for i in opt.data_shape.split(','))
+    dataset = SyntheticImageDataset(opt.num_samples, shape, opt.dtype)
+    prefetch = 2 * opt.num_workers
+    shm_slots = opt.shm_slots if opt.shm_slots > 0 else 2 * prefetch
+    # room for the image batch plus labels and alignment padding
+    slot_size = opt.batch_size * int(np.prod(shape)) * np.dtype(opt.dtype).itemsize + (1 << 20)
+    transports = ['pickle', 'shm'] if opt.transport == 'all' else [opt.transport]
+    for transport in transports:
+        if transport == 'shm':
+            loader = mx.gluon.data.DataLoader(dataset, opt.batch_size, num_workers=opt.num_workers,
+                                              shm_slots=shm_slots, shm_slot_size=slot_size)
+        else:
+            loader = mx.gluon.data.DataLoader(dataset, opt.batch_size, num_workers=opt.num_workers)
+        elapsed, num_batches = run(loader, opt.num_epochs)
+        logging.info('transport: %s, %d batches in %.3f sec, %.1f samples/s',
+                     transport, num_batches, elapsed, num_batches * opt.batch_size / elapsed)
+        del loader
@@ -22,7 +22,9 @@ import logging
 import argparse
 import subprocess
 import os
+import sys
 import errno
+import threading
 
 logging.basicConfig(level=logging.INFO)
 parser = argparse.ArgumentParser(description='Gluon modelzoo-based CNN performance benchmark')
@@ -44,7 +46,16 @@ parser.add_argument('--num-batches', type=int, default=10)
 parser.add_argument('--gpus', type=str, default='',
                     help='GPU IDs to use for this benchmark task. Example: --gpus=0,1,2,3 to use 4 GPUs.'
                          'By default, use CPU only.')
-parser.add_argument('--type', type=str, default='inference', choices=['all', 'training', 'inference'])
+parser.add_argument('--type', type=str, default='inference',
+                    choices=['all', 'training', 'inference', 'overhead', 'concurrent'],
+                    help='overhead measures the per-call Python overhead of a hybridized '
+                         'model with many small layers instead of a model zoo network. '
+                         'concurrent measures the inference throughput of a single '
+                         'thread safe hybridized model called from several threads.')
+parser.add_argument('--num-layers', type=int, default=100,
+                    help='Number of layers of the model used with --type=overhead.')
+parser.add_argument('--num-threads', type=str, default='1,2,4,8',
+                    help='Numbers of calling threads used with --type=concurrent.')
 
 opt = parser.parse_args()
 
@@ -115,10 +126,83 @@ def train(network, batch_size, ctx):
     bwd = time.time() - tic
     return bwd
 
+def call_overhead(num_layers, num_calls, ctx):
+    """Returns the time per call of a hybridized model with many small layers,
+    and the part of it spent outside of invoking the CachedOp."""
+    net = mx.gluon.nn.HybridSequential()
+    with net.name_scope():
+        for _ in range(num_layers):
+            net.add(mx.gluon.nn.Dense(4, in_units=4))
+    net.initialize(ctx=ctx)
+    net.hybridize(static_alloc=True, static_shape=True)
+    data = mx.nd.ones((1, 4), ctx=ctx)
+    for _ in range(dry_run):
+        net(data)
+    mx.nd.waitall()
+
+    tic = time.time()
+    for _ in range(num_calls):
+        net(data)
+    mx.nd.waitall()
+    call = (time.time() - tic) / num_calls
+
+    handles = net._get_cached_op_handles([data])
+    tic = time.time()
+    for _ in range(num_calls):
+        net._cached_op._call_with_handles(handles)
+    mx.nd.waitall()
+    invoke = (time.time() - tic) / num_calls
+    return call, call - invoke
+
+def concurrent_score(network, batch_size, num_threads, ctx):
+    """Returns the time taken by `num_threads` threads to run `num_batches`
+    inference batches each with one thread safe hybridized model."""
+    net = models.get_model(network)
+    net.initialize(mx.init.Xavier(magnitude=2.), ctx=ctx)
+    net.hybridize(static_alloc=True, static_shape=True, thread_safe=True)
+    image_shape = image_shapes[1] if 'inceptionv3' == network else image_shapes[0]
+    data = [mx.random.uniform(-1.0, 1.0, shape=(batch_size,) + image_shape, ctx=ctx)
+            for _ in range(num_threads)]
+
+    def run(x, num_calls):
+        for _ in range(num_calls):
+            net(x).wait_to_read()
+
+    def run_threads(num_calls):
+        threads = [threading.Thread(target=run, args=(x, num_calls)) for x in data]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    # creates one execution state per thread
+    run_threads(dry_run)
+    tic = time.time()
+    run_threads(num_batches)
+    return time.time() - tic
+
 if __name__ == '__main__':
     runtype = opt.type
     bs = opt.batch_size
 
+    if runtype == 'concurrent':
+        ctx = mx.gpu(int(opt.gpus.split(',')[0])) if opt.gpus.strip() else mx.cpu()
+        network = 'resnet18_v1' if opt.model == 'all' else opt.model
+        batch_size = bs if bs != 0 else 1
+        for num_threads in [int(i) for i in opt.num_threads.split(',')]:
+            fwd_time = concurrent_score(network, batch_size, num_threads, ctx)
+            fps = (batch_size * num_batches * num_threads) / fwd_time
+            logging.info('%s inference perf for BS %d with %d threads sharing the parameters '
+                         'is %f img/s', network, batch_size, num_threads, fps)
+        sys.exit(0)
+
+    if runtype == 'overhead':
+        ctx = mx.gpu(int(opt.gpus.split(',')[0])) if opt.gpus.strip() else mx.cpu()
+        call, overhead = call_overhead(opt.num_layers, max(num_batches, 1000), ctx)
+        logging.info('%d-layer hybridized model: %.1f us per call, of which %.1f us '
+                     'are spent outside of the CachedOp', opt.num_layers, call * 1e6, overhead * 1e6)
+        sys.exit(0)
+
     if opt.model == 'all':
         networks = ['alexnet', 'densenet121', 'densenet161', 'densenet169', 'densenet201',
                     'inceptionv3', 'mobilenet0.25', 'mobilenet0.5', 'mobilenet0.75',
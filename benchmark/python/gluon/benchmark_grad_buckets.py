@@ -0,0 +1,92 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import mxnet as mx
+from mxnet import gluon, autograd
+from mxnet.gluon import nn
+import time
+import logging
+import argparse
+
+logging.basicConfig(level=logging.INFO)
+parser = argparse.ArgumentParser(description='Trainer gradient bucketing benchmark on CPU contexts')
+parser.add_argument('--num-contexts', type=int, default=4,
+                    help='Number of CPU contexts, i.e. mx.cpu(0..N-1).')
+parser.add_argument('--num-layers', type=int, default=100,
+                    help='Number of Dense + LayerNorm blocks, each with 4 parameters.')
+parser.add_argument('--hidden-size', type=int, default=64)
+parser.add_argument('--batch-size', type=int, default=8)
+parser.add_argument('--num-steps', type=int, default=50)
+parser.add_argument('--kvstore', type=str, default='device')
+parser.add_argument('--bucket-sizes', type=str, default='0,65536,1048576,4194304',
+                    help='Comma separated bucket sizes in bytes. 0 reduces one key per parameter.')
+parser.add_argument('--priority-tiers', type=str, default='1,4,0',
+                    help='Comma separated numbers of kvstore calls per step, split by priority. '
+                         '0 issues one call per key.')
+
+opt = parser.parse_args()
+
+
+def make_net():
+    net = nn.HybridSequential()
+    with net.name_scope():
+        for _ in range(opt.num_layers):
+            net.add(nn.Dense(opt.hidden_size, in_units=opt.hidden_size, flatten=False))
+            net.add(nn.LayerNorm(in_channels=opt.hidden_size))
+    return net
+
+
+def run(grad_bucket_size, priority_tiers, ctx):
+    net = make_net()
+    net.initialize(mx.init.Xavier(), ctx=ctx)
+    net.hybridize()
+    trainer = gluon.Trainer(net.collect_params(), 'sgd', {'learning_rate': 0.01},
+                            kvstore=opt.kvstore, update_on_kvstore=False,
+                            grad_bucket_size=grad_bucket_size)
+    trainer._num_priority_tiers = priority_tiers if priority_tiers > 0 else len(trainer._params)
+    data = [mx.nd.random.uniform(shape=(opt.batch_size, opt.hidden_size), ctx=c) for c in ctx]
+
+    def step():
+        with autograd.record():
+            losses = [net(x).sum() for x in data]
+        autograd.backward(losses)
+        trainer.step(opt.batch_size * len(ctx))
+
+    # warm up
+    step()
+    mx.nd.waitall()
+    tic = time.time()
+    for _ in range(opt.num_steps):
+        step()
+    mx.nd.waitall()
+    elapsed = time.time() - tic
+    num_params = len(trainer._params)
+    if trainer._grad_buckets:
+        num_keys = len(trainer._grad_buckets) + num_params - \
+            sum(len(bucket.indices) for bucket in trainer._grad_buckets)
+    else:
+        num_keys = num_params
+    return num_keys, elapsed / opt.num_steps
+
+
+if __name__ == '__main__':
+    ctx = [mx.cpu(i) for i in range(opt.num_contexts)]
+    for size in [int(s) for s in opt.bucket_sizes.split(',')]:
+        for tiers in [int(t) for t in opt.priority_tiers.split(',')]:
+            num_keys, step_time = run(size, tiers, ctx)
+            logging.info('grad_bucket_size: %d bytes, priority tiers: %s, keys per step: %d, '
+                         'step time: %.2f ms', size, tiers if tiers > 0 else 'per key',
+                         num_keys, step_time * 1000)
@@ -0,0 +1,103 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import mxnet as mx
+from mxnet.gluon.data.vision import transforms
+import time
+import logging
+import argparse
+
+logging.basicConfig(level=logging.INFO)
+parser = argparse.ArgumentParser(description='Per-sample vs. batched image transform benchmark')
+parser.add_argument('--batch-size', type=int, default=64)
+parser.add_argument('--num-batches', type=int, default=20)
+parser.add_argument('--image-size', type=int, default=256,
+                    help='Height and width of the raw images.')
+parser.add_argument('--crop-size', type=int, default=224)
+parser.add_argument('--transform', type=str, default='all',
+                    choices=['all', 'resized_crop', 'flip', 'color_jitter', 'pipeline'])
+
+opt = parser.parse_args()
+
+
+def per_sample_transforms(crop_size):
+    """Per-sample transforms on (H x W x C) uint8 images."""
+    return {
+        'resized_crop': transforms.Compose([transforms.RandomResizedCrop(crop_size),
+                                            transforms.ToTensor()]),
+        'flip': transforms.Compose([transforms.RandomFlipLeftRight(),
+                                    transforms.ToTensor()]),
+        'color_jitter': transforms.Compose([transforms.ToTensor(),
+                                            transforms.RandomColorJitter(0.4, 0.4, 0.4, 0.1)]),
+        'pipeline': transforms.Compose([transforms.RandomResizedCrop(crop_size),
+                                        transforms.RandomFlipLeftRight(),
+                                        transforms.ToTensor(),
+                                        transforms.RandomColorJitter(0.4, 0.4, 0.4, 0.1),
+                                        transforms.Normalize(0.5, 0.25)]),
+    }
+
+
+def batch_transforms(crop_size):
+    """Equivalent batch transforms on (N x H x W x C) uint8 batches."""
+    return {
+        'resized_crop': transforms.Compose([transforms.ToTensor(),
+                                            transforms.BatchRandomResizedCrop(crop_size)]),
+        'flip': transforms.Compose([transforms.ToTensor(),
+                                    transforms.BatchRandomFlipLeftRight()]),
+        'color_jitter': transforms.Compose([transforms.ToTensor(),
+                                            transforms.BatchRandomColorJitter(0.4, 0.4, 0.4, 0.1)]),
+        'pipeline': transforms.Compose([transforms.ToTensor(),
+                                        transforms.BatchRandomResizedCrop(crop_size),
+                                        transforms.BatchRandomFlipLeftRight(),
+                                        transforms.BatchRandomColorJitter(0.4, 0.4, 0.4, 0.1),
+                                        transforms.Normalize(0.5, 0.25)]),
+    }
+
+
+def run_per_sample(transform, images, num_batches):
+    tic = time.time()
+    for _ in range(num_batches):
+        out = mx.nd.stack(*[transform(image) for image in images])
+    out.wait_to_read()
+    return time.time() - tic
+
+
+def run_batch(transform, images, num_batches):
+    batch = mx.nd.stack(*images)
+    tic = time.time()
+    for _ in range(num_batches):
+        out = transform(batch)
+    out.wait_to_read()
+    return time.time() - tic
+
+
+if __name__ == '__main__':
+    shape = (opt.image_size, opt.image_size, 3)
+    images = [mx.nd.random.uniform(0, 255, shape).astype('uint8')
+              for _ in range(opt.batch_size)]
+    samples = per_sample_transforms(opt.crop_size)
+    batches = batch_transforms(opt.crop_size)
+    names = sorted(samples.keys()) if opt.transform == 'all' else [opt.transform]
+    for name in names:
+        # warm up
+        run_per_sample(samples[name], images, 1)
+        run_batch(batches[name], images, 1)
+        num_samples = opt.batch_size * opt.num_batches
+        sample_time = run_per_sample(samples[name], images, opt.num_batches)
+        batch_time = run_batch(batches[name], images, opt.num_batches)
+        logging.info('%s: per-sample %.1f samples/s, batched %.1f samples/s, speedup %.2fx',
+                     name, num_samples / sample_time, num_samples / batch_time,
+                     sample_time / batch_time)
@@ -2916,6 +2916,24 @@ MXNET_DLL int MXRecordIOReaderFree(RecordIOHandle handle);
 MXNET_DLL int MXRecordIOReaderReadRecord(RecordIOHandle handle,
                                         char const **buf, size_t *size);
 
+/**
+ * \brief Read the records at multiple positions with one call.
+ *  Positions are visited in ascending order and adjacent records are read
+ *  sequentially without seeking. The returned buffers stay valid until the
+ *  next read on the handle.
+ * \param handle handle to RecordIO object
+ * \param num number of records to read
+ * \param positions positions of the records
+ * \param bufs pointer to return buffers, in the order of positions. NULL at end of file.
+ * \param sizes pointer to return sizes of buffers
+ * \return 0 when success, -1 when failure happens
+*/
+MXNET_DLL int MXRecordIOReaderReadRecordBatch(RecordIOHandle handle,
+                                             uint32_t num,
+                                             const size_t *positions,
+                                             char const **bufs,
+                                             size_t *sizes);
+
 /**
  * \brief Set the current reader pointer position
  * \param handle handle to RecordIO object
@@ -171,6 +171,26 @@ class CachedOp(object):
 
         if original_output is not None:
             return original_output
+        return self._create_outputs(num_output, output_vars, out_stypes)
+
+    def _call_with_handles(self, handles):
+        """Invokes with a prebuilt array of input handles, e.g. created by
+        `c_handle_array`, so that the array is not rebuilt on every call."""
+        output_vars = ctypes.POINTER(NDArrayHandle)()
+        num_output = ctypes.c_int(0)
+        out_stypes = ctypes.POINTER(ctypes.c_int)()
+
+        check_call(_LIB.MXInvokeCachedOpEx(
+            self.handle,
+            ctypes.c_int(len(handles)),
+            handles,
+            ctypes.byref(num_output),
+            ctypes.byref(output_vars),
+            ctypes.byref(out_stypes)))
+
+        return self._create_outputs(num_output, output_vars, out_stypes)
+
+    def _create_outputs(self, num_output, output_vars, out_stypes):
         create_ndarray_fn = _np_ndarray_cls if self.is_np_sym else _ndarray_cls
         if num_output.value == 1:
             return create_ndarray_fn(ctypes.cast(output_vars[0], NDArrayHandle),
@@ -277,11 +277,17 @@ FP16_FP32_FUNCS = [
     'min_axis',
     'mp_sgd_mom_update',
     'mp_sgd_update',
+    'multi_adagrad_update',
+    'multi_adam_update',
     'multi_all_finite',
+    'multi_ftrl_update',
     'multi_mp_sgd_mom_update',
     'multi_mp_sgd_update',
+    'multi_nag_mom_update',
+    'multi_rmsprop_update',
     'multi_sgd_mom_update',
     'multi_sgd_update',
+    'multi_sum_sq',
     'negative',
     'normal',
     'one_hot',
@@ -174,6 +174,27 @@ cdef class CachedOp:
         else:
             return [NewArray(p_output_vars[i], p_output_stypes[i], self.is_np_sym) for i in range(num_output)]
 
+    def _call_with_handles(self, handles):
+        """Invokes with a prebuilt ctypes array of input handles, e.g. created by
+        `c_handle_array`, so that the array is not rebuilt on every call."""
+        cdef NDArrayHandle* p_output_vars = NULL
+        cdef int num_output = 0
+        cdef const int* p_output_stypes
+        cdef unsigned long long p_handles = _ctypes.addressof(handles)
+
+        CALL(MXInvokeCachedOpEx(
+            self.chandle,
+            <int>len(handles),
+            <NDArrayHandle*>p_handles if len(handles) != 0 else NULL,
+            &num_output,
+            &p_output_vars,
+            &p_output_stypes))
+
+        if num_output == 1:
+            return NewArray(p_output_vars[0], p_output_stypes[0], self.is_np_sym)
+        else:
+            return [NewArray(p_output_vars[i], p_output_stypes[i], self.is_np_sym) for i in range(num_output)]
+
     def _register_op_hook(self, callback, monitor_all=False):
         cb_type = _ctypes.CFUNCTYPE(None, _ctypes.c_char_p, _ctypes.c_char_p, _ctypes.c_void_p, _ctypes.c_void_p)
         if callback:
@@ -20,7 +20,9 @@
 from __future__ import absolute_import
 
 import ctypes
-from .base import _LIB, check_call
+import itertools
+import threading
+from .base import _LIB, check_call, c_str, NDArrayHandle, MXNetError
 
 
 def set_bulk_size(size):
@@ -73,3 +75,68 @@ def bulk(size):
                 x += 1
     """
     return _BulkScope(size)
+
+
+class _EngineContext(ctypes.Structure):
+    """Mirrors the layout of the C++ ``mxnet::Context``."""
+    _fields_ = [('dev_type', ctypes.c_int), ('dev_id', ctypes.c_int)]
+
+
+# value of FnProperty::kNoSkip, the callback also runs if a dependency failed
+_FN_PROPERTY_NO_SKIP = ctypes.c_int(7)
+_ENGINE_SYNC_FUNC = ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.c_void_p)
+_CALLBACKS = {}
+_CALLBACKS_LOCK = threading.Lock()
+_CALLBACK_TOKENS = itertools.count(1)
+
+
+def _run_callback(_, token):
+    with _CALLBACKS_LOCK:
+        callback = _CALLBACKS.pop(token)
+    callback()
+
+_RUN_CALLBACK = _ENGINE_SYNC_FUNC(_run_callback)
+
+
+def on_complete(arrays, callback, priority=0):
+    """Calls `callback` once all operations writing to `arrays` that have been
+    pushed so far are completed, without blocking the calling thread.
+
+    The callback is scheduled as an engine operation reading `arrays` and runs
+    on an engine worker thread, so it must be thread-safe and should return
+    quickly. It shows up as ``OnComplete`` in profiler traces. Exceptions
+    raised by the callback are printed and ignored.
+
+    Parameters
+    ----------
+    arrays : list of NDArray
+        Arrays to wait for. The callback runs on the context of the first array.
+    callback : function
+        Function without arguments.
+    priority : int, default 0
+        Priority of the callback, as a hint to the engine.
+
+    Example::
+
+        >>> y = x * 2
+        >>> mx.engine.on_complete([y], lambda: print('y is ready'))
+    """
+    if not arrays:
+        callback()
+        return
+    ctx = arrays[0].context
+    with _CALLBACKS_LOCK:
+        token = next(_CALLBACK_TOKENS)
+        _CALLBACKS[token] = callback
+    handles = (NDArrayHandle * len(arrays))(*[arr.handle for arr in arrays])
+    try:
+        check_call(_LIB.MXEnginePushSyncND(
+            _RUN_CALLBACK, ctypes.c_void_p(token), None,
+            ctypes.byref(_EngineContext(ctx.device_typeid, ctx.device_id)),
+            handles, ctypes.c_int(len(arrays)), None, ctypes.c_int(0),
+            ctypes.byref(_FN_PROPERTY_NO_SKIP), ctypes.c_int(priority),
+            c_str('OnComplete')))
+    except MXNetError:
+        with _CALLBACKS_LOCK:
+            _CALLBACKS.pop(token, None)
+        raise
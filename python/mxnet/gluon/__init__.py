@@ -29,6 +29,8 @@ from . import rnn
 
 from .trainer import *
 
+from .checkpoint import *
+
 from . import loss
 
 from . import utils
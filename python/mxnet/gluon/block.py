@@ -22,17 +22,25 @@ __all__ = ['Block', 'HybridBlock', 'SymbolBlock']
 
 import threading
 import copy
+import time
 import warnings
 import re
+import os
+import json
+import hashlib
+import inspect
 from collections import OrderedDict
 
-from ..base import mx_real_t, MXNetError
+import numpy as np
+
+from ..base import mx_real_t, MXNetError, NDArrayHandle, __version__
+from ..context import current_context
 from .. import symbol, ndarray, initializer
 from ..symbol import Symbol
 from ..ndarray import NDArray
 from .. import name as _name
 from .parameter import Parameter, ParameterDict, DeferredInitializationError
-from .utils import _indent, _brief_print_list, HookHandle
+from .utils import _indent, _brief_print_list, HookHandle, shape_is_known
 from .utils import _check_same_symbol_type, _check_all_np_ndarrays
 from .. import numpy_extension as _mx_npx
 from .. import numpy as _mx_np
@@ -128,6 +136,47 @@ def _regroup(args, fmt):
     return ret, args
 
 
+# statistics are kept for this many times `cache_size` recently seen signatures
+_CACHED_OP_STATS_FACTOR = 4
+
+
+# attributes of HybridBlock which do not affect the traced graph
+_GRAPH_CACHE_IGNORED_ATTRS = frozenset([
+    '_active', '_flags', '_monitor_all', '_callback', '_in_format', '_out_format',
+    '_cached_op_args', '_cached_op_data_args', '_cached_op_flags', '_cached_op_cache_size',
+    '_shape_buckets', '_graph_cache_dir', '_graph_cache_file', '_thread_safe',
+    '_cached_op_lock', '_cached_op_pool'])
+
+
+def _is_config_value(value):
+    if isinstance(value, (tuple, list)):
+        return all(_is_config_value(i) for i in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _is_config_value(v) for k, v in value.items())
+    return value is None or isinstance(value, (bool, int, float, str))
+
+
+def _update_block_digest(block, digest):
+    """Updates `digest` with what determines the graph traced by `block`: the
+    source code of its classes, its configuration attributes and its children."""
+    for cls in type(block).__mro__:
+        if cls in (HybridBlock, Block, object):
+            break
+        try:
+            source = inspect.getsource(cls)
+        except (IOError, OSError, TypeError):
+            # source not available, e.g. for classes defined interactively
+            source = ''
+        digest.update(('%s.%s\n%s' % (cls.__module__, cls.__name__, source)).encode('utf-8'))
+    config = sorted((name, repr(sorted(value.items()) if isinstance(value, dict) else value))
+                    for name, value in vars(block).items()
+                    if name not in _GRAPH_CACHE_IGNORED_ATTRS and _is_config_value(value))
+    digest.update(repr(config).encode('utf-8'))
+    for name, child in block._children.items():
+        digest.update(name.encode('utf-8'))
+        _update_block_digest(child, digest)
+
+
 class Block(object):
     """Base class for all neural network layers and models. Your models should
     subclass this class.
@@ -548,6 +597,30 @@ class Block(object):
             Optimize for invariant input shapes between iterations. Must also
             set static_alloc to True. Change of input shapes is still allowed
             but slower.
+        cache_size : int, default None
+            Number of input shape and dtype signatures for which :py:class:`HybridBlock`
+            keeps a separate cached graph with its own memory plan. The least recently
+            used graph is evicted when more signatures are seen. By default, a single
+            cached graph is re-planned whenever the input shapes change.
+        shape_buckets : dict of int to int, default None
+            Only used with `cache_size`. Maps an axis to a multiple to which the size of
+            the inputs along that axis is rounded up by zero padding, so that varying
+            shapes share fewer cached graphs. Output axes padded this way are sliced back
+            to the original size. Only use it when the padded positions do not affect the
+            results of the others, e.g. for the batch axis at inference.
+        graph_cache_dir : str, default None
+            Directory in which the traced graph and the inferred parameter shapes are
+            saved on the first call, keyed by the block classes and their source code,
+            the block configuration, the parameters and the input signature. A later
+            process hybridizing the same block with the same directory loads them
+            instead of tracing `hybrid_forward` and inferring shapes again.
+        thread_safe : bool, default False
+            Allow calling the block from multiple threads at the same time, e.g.
+            for inference by several serving threads. The parameters are shared
+            by all threads, while every concurrent call runs with an execution state
+            of its own, including the memory of `static_alloc`, taken from a pool
+            that grows to the number of concurrent calls. Cannot be combined with
+            `cache_size`.
         """
         for cld in self._children.values():
             cld.hybridize(active, **kwargs)
@@ -767,6 +840,16 @@ class HybridBlock(Block):
         self._in_format = None
         self._active = False
         self._flags = []
+        self._cached_op_cache_size = None
+        self._shape_buckets = None
+        self._cached_ops = OrderedDict()
+        self._cached_op_stats = OrderedDict()
+        self._cached_op_handles = {}
+        self._graph_cache_dir = None
+        self._graph_cache_file = None
+        self._thread_safe = False
+        self._cached_op_lock = None
+        self._cached_op_pool = []
         self._callback = None
         self._monitor_all = False
 
@@ -776,9 +859,72 @@ class HybridBlock(Block):
         if isinstance(value, HybridBlock):
             self._clear_cached_op()
 
+    def _graph_cache_path(self, args, in_format):
+        """Returns the file of the graph cache entry for the flattened `args`."""
+        digest = hashlib.sha1(__version__.encode('utf-8'))
+        _update_block_digest(self, digest)
+        params = [(name, param.shape, np.dtype(param.dtype).name, param._stype)
+                  for name, param in self.collect_params().items()]
+        inputs = [(type(i).__name__, i.shape, np.dtype(i.dtype).name) for i in args]
+        digest.update(repr((params, inputs, in_format)).encode('utf-8'))
+        return os.path.join(self._graph_cache_dir, digest.hexdigest() + '.json')
+
+    def _load_graph_cache(self, args, in_format):
+        """Restores the graph and the parameter shapes from the graph cache.
+        Returns whether an entry was found."""
+        path = self._graph_cache_path(args, in_format)
+        try:
+            with open(path, 'r') as fin:
+                entry = json.load(fin)
+            out = symbol.load_json(entry['symbol'])
+            inputs = [symbol.var(name) for name in entry['inputs']]
+            inputs = [i.as_np_ndarray() if is_np else i
+                      for i, is_np in zip(inputs, entry['np_inputs'])]
+            if entry['np_out']:
+                out = out.as_np_ndarray()
+            param_shapes = entry['param_shapes']
+            out_format = entry['out_format']
+        except (IOError, OSError, ValueError, KeyError, MXNetError):
+            # missing or unreadable entry, the graph is traced and saved again
+            self._graph_cache_file = path
+            return False
+        for name, param in self.collect_params().items():
+            if not shape_is_known(param.shape) and name in param_shapes:
+                param.shape = tuple(param_shapes[name])
+        self._in_format = in_format
+        self._out_format = out_format
+        self._cached_graph = inputs, out
+        return True
+
+    def _save_graph_cache(self):
+        """Saves the graph and the inferred parameter shapes to the graph cache."""
+        from ..symbol.numpy import _Symbol as np_symbol
+        path, self._graph_cache_file = self._graph_cache_file, None
+        inputs, out = self._cached_graph
+        entry = {'symbol': out.tojson(),
+                 'np_inputs': [isinstance(i, np_symbol) for i in inputs],
+                 'np_out': isinstance(out, np_symbol),
+                 'inputs': [i.name for i in inputs],
+                 'out_format': self._out_format,
+                 'param_shapes': {name: param.shape for name, param in self.collect_params().items()}}
+        # write to a unique file first, so that processes sharing the directory
+        # never read a partially written entry
+        tmp_path = '%s.%d.%d.tmp' % (path, os.getpid(), threading.current_thread().ident)
+        try:
+            if not os.path.exists(self._graph_cache_dir):
+                os.makedirs(self._graph_cache_dir)
+            with open(tmp_path, 'w') as fout:
+                json.dump(entry, fout)
+            os.rename(tmp_path, path)
+        except (IOError, OSError) as e:
+            warnings.warn("Failed to save the graph of %s to the graph cache %s: %s"
+                          % (self.name, self._graph_cache_dir, e), stacklevel=4)
+
     def _get_graph(self, *args):
         if not self._cached_graph:
             args, self._in_format = _flatten(args, "input")
+            if self._graph_cache_dir and self._load_graph_cache(args, self._in_format):
+                return self._cached_graph
             if len(args) > 1:
                 inputs = [symbol.var('data%d' % i).as_np_ndarray()
                           if isinstance(args[i], _mx_np.ndarray)
@@ -826,16 +972,18 @@ class HybridBlock(Block):
         data_indices = []
         param_indices = []
         self._cached_op_args = []
+        self._cached_op_data_args = []
         for i, name in enumerate(input_names):
             if name in data_names:
                 data_indices.append(i)
                 self._cached_op_args.append((True, data_names[name]))
+                self._cached_op_data_args.append((i, data_names[name]))
             else:
                 param_indices.append(i)
                 self._cached_op_args.append((False, params[name]))
-        flags = [('data_indices', data_indices), ('param_indices', param_indices)] + \
-                self._flags
-        self._cached_op = ndarray.CachedOp(out, flags)
+        self._cached_op_flags = [('data_indices', data_indices),
+                                 ('param_indices', param_indices)] + self._flags
+        self._cached_op = ndarray.CachedOp(out, self._cached_op_flags)
 
     def _deferred_infer_shape(self, *args):
         try:
@@ -845,38 +993,211 @@ class HybridBlock(Block):
                         " cannot be inferred. {}".format(e)
             raise ValueError(error_msg)
 
+    def _get_cached_op(self, args):
+        """Returns the cached op for the shape and dtype signature of `args`,
+        its statistics and whether it was built."""
+        signature = tuple((i.shape, np.dtype(i.dtype).name) for i in args if i is not None)
+        stats = self._cached_op_stats.pop(signature, None)
+        if stats is None:
+            stats = {'hits': 0, 'misses': 0, 'build_time': 0.0}
+            # cached signatures are the most recent ones and are never dropped
+            while len(self._cached_op_stats) >= \
+                    _CACHED_OP_STATS_FACTOR * self._cached_op_cache_size:
+                self._cached_op_stats.popitem(last=False)
+        self._cached_op_stats[signature] = stats
+        cached_op = self._cached_ops.pop(signature, None)
+        built = cached_op is None
+        if built:
+            stats['misses'] += 1
+            # the first signature uses the op created by _build_cache
+            if self._cached_ops:
+                self._cached_op = ndarray.CachedOp(self._cached_graph[1], self._cached_op_flags)
+            cached_op = self._cached_op
+            if len(self._cached_ops) >= self._cached_op_cache_size:
+                self._cached_ops.popitem(last=False)
+        else:
+            stats['hits'] += 1
+        self._cached_ops[signature] = cached_op
+        self._cached_op = cached_op
+        return cached_op, stats, built
+
+    def _pad_to_buckets(self, args):
+        """Zero pads `args` to the shape buckets. Returns the padded arguments and,
+        for every bucketed axis, the original size of every padded size."""
+        sizes = {}
+        padded_args = []
+        for arg in args:
+            if arg is None:
+                padded_args.append(arg)
+                continue
+            shape = list(arg.shape)
+            for axis, multiple in self._shape_buckets.items():
+                if axis < len(shape) and shape[axis] % multiple:
+                    size = shape[axis]
+                    shape[axis] = (size // multiple + 1) * multiple
+                    sizes.setdefault(axis, {}).setdefault(shape[axis], size)
+            if tuple(shape) != arg.shape:
+                zeros = _mx_np.zeros if isinstance(arg, _mx_np.ndarray) else ndarray.zeros
+                padded = zeros(tuple(shape), ctx=arg.context, dtype=arg.dtype)
+                padded[tuple(slice(0, i) for i in arg.shape)] = arg
+                arg = padded
+            padded_args.append(arg)
+        return padded_args, sizes
+
+    @staticmethod
+    def _slice_from_buckets(out, sizes):
+        """Slices the axes of `out` padded by `_pad_to_buckets` back to the original size."""
+        index = [slice(None)] * out.ndim
+        for axis, axis_sizes in sizes.items():
+            if axis < out.ndim and out.shape[axis] in axis_sizes:
+                index[axis] = slice(0, axis_sizes[out.shape[axis]])
+        if all(i == slice(None) for i in index):
+            return out
+        return out[tuple(index)]
+
+    def _get_cached_op_handles(self, args, handle_cache=None):
+        """Returns the array of input handles of the cached op for `args`.
+
+        The handles of the parameters on the current context are looked up once
+        and reused until the arrays of any Parameter are replaced. Every execution
+        state of a thread safe block passes a `handle_cache` of its own.
+        """
+        if handle_cache is None:
+            handle_cache = self._cached_op_handles
+        ctx = current_context()
+        entry = handle_cache.get(ctx)
+        if entry is None or entry[0] != Parameter._data_version:
+            # keep the arrays alive as long as their handles are used
+            arrays = [None if is_arg else i.data() for is_arg, i in self._cached_op_args]
+            handles = (NDArrayHandle * len(arrays))()
+            for i, arr in enumerate(arrays):
+                if arr is not None:
+                    handles[i] = arr.handle
+            entry = (Parameter._data_version, handles, arrays)
+            handle_cache[ctx] = entry
+        handles = entry[1]
+        for i, j in self._cached_op_data_args:
+            handles[i] = args[j].handle
+        return handles
+
+    def _finish_deferred_init(self, args):
+        """Initializes the parameters of the cached op whose initialization was deferred."""
+        params = [i for is_arg, i in self._cached_op_args if not is_arg]
+        # shapes may already be known, e.g. from the graph cache
+        if not all(shape_is_known(i.shape) for i in params):
+            self._deferred_infer_shape(*args)
+        for i in params:
+            i._finish_deferred_init()
+
+    def _register_op_hook_on(self, cached_op):
+        cached_op._register_op_hook(self._callback, self._monitor_all)
+        if len(self._flags) >= 2 and (self._flags[1] or self._flags[0]):
+            warnings.warn("register_op_hook is experimental when static_alloc=True / static_shape=True "
+                          " and may not work correctly")
+
     def _call_cached_op(self, *args):
+        if self._thread_safe:
+            return self._call_cached_op_thread_safe(*args)
         if self._cached_op is None:
             self._build_cache(*args)
         assert self._cached_op, "cached op is not None"
-        if self._callback:
-            self._cached_op._register_op_hook(self._callback, self._monitor_all)
-            if len(self._flags) >= 2 and (self._flags[1] or self._flags[0]):
-                warnings.warn("register_op_hook is experimental when static_alloc=True / static_shape=True "
-                              " and may not work correctly")
 
         args, fmt = _flatten(args, "input")
         assert fmt == self._in_format, "Invalid input format"
+        cached_op, stats, start, bucket_sizes = self._cached_op, None, None, None
+        if self._cached_op_cache_size:
+            if self._shape_buckets:
+                args, bucket_sizes = self._pad_to_buckets(args)
+            cached_op, stats, built = self._get_cached_op(args)
+            if built:
+                start = time.time()
+        if self._callback:
+            self._register_op_hook_on(cached_op)
+
         try:
-            cargs = [args[i] if is_arg else i.data()
-                     for is_arg, i in self._cached_op_args]
+            handles = self._get_cached_op_handles(args)
         except DeferredInitializationError:
-            self._deferred_infer_shape(*args)
-            cargs = []
-            for is_arg, i in self._cached_op_args:
-                if is_arg:
-                    cargs.append(args[i])
-                else:
-                    i._finish_deferred_init()
-                    cargs.append(i.data())
-        out = self._cached_op(*cargs)
+            self._finish_deferred_init(args)
+            handles = self._get_cached_op_handles(args)
+        if self._graph_cache_file:
+            self._save_graph_cache()
+        out = cached_op._call_with_handles(handles)
+        if start is not None:
+            # graph passes and memory planning run in the first call
+            stats['build_time'] += time.time() - start
         if isinstance(out, NDArray):
             out = [out]
+        if bucket_sizes:
+            out = [self._slice_from_buckets(i, bucket_sizes) for i in out]
         return _regroup(out, self._out_format)[0]
 
+    def _call_cached_op_thread_safe(self, *args):
+        """Calls the cached graph with an execution state taken from the pool.
+
+        An execution state is a cached op, which owns the memory of its forward
+        pass, and its own array of input handles. All states share the arrays
+        of the parameters. The lock is only held to prepare a call, so concurrent
+        calls run in parallel.
+        """
+        lock = self._cached_op_lock
+        with lock:
+            if self._cached_op is None:
+                self._build_cache(*args)
+                self._cached_op_pool.append((self._cached_op, {}))
+            assert self._cached_op, "cached op is not None"
+
+            args, fmt = _flatten(args, "input")
+            assert fmt == self._in_format, "Invalid input format"
+            # states are returned to the pool they were taken from, so that
+            # the states of a cleared graph are dropped
+            pool = self._cached_op_pool
+            if pool:
+                state = pool.pop()
+            else:
+                state = (ndarray.CachedOp(self._cached_graph[1], self._cached_op_flags), {})
+        cached_op, handle_cache = state
+        try:
+            with lock:
+                if self._callback:
+                    self._register_op_hook_on(cached_op)
+                try:
+                    handles = self._get_cached_op_handles(args, handle_cache)
+                except DeferredInitializationError:
+                    self._finish_deferred_init(args)
+                    handles = self._get_cached_op_handles(args, handle_cache)
+                if self._graph_cache_file:
+                    self._save_graph_cache()
+            out = cached_op._call_with_handles(handles)
+        finally:
+            with lock:
+                pool.append(state)
+        if isinstance(out, NDArray):
+            out = [out]
+        return _regroup(out, self._out_format)[0]
+
+    def cached_op_stats(self):
+        """Returns the statistics of the cached graphs kept with `cache_size`,
+        see :py:meth:`hybridize`.
+
+        Returns
+        -------
+        dict
+            Maps every input signature, a tuple of the (shape, dtype) of the
+            inputs, to a dict with the number of `hits`, the number of `misses`,
+            i.e. builds including rebuilds after eviction, and the total
+            `build_time` in seconds, which includes graph passes and memory planning.
+            Only the `4 * cache_size` most recently seen signatures are kept.
+        """
+        return {signature: dict(stats) for signature, stats in self._cached_op_stats.items()}
+
     def _clear_cached_op(self):
         self._cached_graph = ()
         self._cached_op = None
+        self._cached_ops = OrderedDict()
+        self._cached_op_stats = OrderedDict()
+        self._cached_op_handles = {}
+        self._cached_op_pool = []
+        self._graph_cache_file = None
 
     def register_child(self, block, name=None):
         if not isinstance(block, HybridBlock):
@@ -890,7 +1211,16 @@ class HybridBlock(Block):
 
     def hybridize(self, active=True, **kwargs):
         self._active = active
-        self._flags = list(kwargs.items())
+        flags = dict(kwargs)
+        self._cached_op_cache_size = flags.pop('cache_size', None)
+        self._shape_buckets = flags.pop('shape_buckets', None)
+        self._graph_cache_dir = flags.pop('graph_cache_dir', None)
+        self._thread_safe = flags.pop('thread_safe', False)
+        if self._thread_safe and self._cached_op_cache_size:
+            raise ValueError("thread_safe cannot be combined with cache_size in hybridize "
+                             "of %s." % self.name)
+        self._cached_op_lock = threading.Lock() if self._thread_safe else None
+        self._flags = list(flags.items())
         self._clear_cached_op()
         if active and self._forward_hooks or self._forward_pre_hooks:
             warnings.warn('"{block}" is being hybridized while still having forward hook/pre-hook. '
@@ -0,0 +1,328 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+# coding: utf-8
+"""Asynchronous checkpointing of parameters and trainer states."""
+from __future__ import absolute_import
+
+__all__ = ['Checkpointer']
+
+import os
+import json
+import pickle
+import hashlib
+import threading
+
+from .. import ndarray
+from ..context import cpu, cpu_pinned
+from ..util import is_np_array
+from .. import numpy_extension as _mx_npx  # pylint: disable=reimported
+from .block import Block
+from .utils import _brief_print_list
+
+
+class Checkpointer(object):
+    """Saves parameters and trainer states without stalling training.
+
+    :py:meth:`save` only enqueues copies of the parameters and the optimizer
+    states into host memory. The copies are ordered by the engine after the
+    computation that produces them and before any later update, so the
+    snapshot is consistent while training continues. The copies are then
+    written to disk by a background thread.
+
+    With ``shard=False``, a checkpoint is written as ``prefix.params`` and
+    ``prefix.states``, the same files produced by :py:meth:`Block.save_parameters`
+    (or :py:meth:`ParameterDict.save`) and :py:meth:`Trainer.save_states`.
+
+    With ``shard=True``, every parameter and every optimizer state is written
+    to its own file in the ``checkpoint-shards`` directory next to the
+    checkpoint, and ``prefix.manifest`` lists the shards of the checkpoint.
+    Shards are addressed by their content, so tensors that did not change since
+    an earlier checkpoint (e.g. frozen layers) are not written again.
+
+    Parameters
+    ----------
+    params : Block or ParameterDict
+        The parameters to save. Parameters of a :py:class:`Block` are named
+        as in :py:meth:`Block.save_parameters`.
+    trainer : Trainer, optional
+        The trainer whose optimizer states are saved along with the parameters.
+    shard : bool, default False
+        Whether to write one file per tensor and skip unchanged tensors.
+    """
+    def __init__(self, params, trainer=None, shard=False):
+        self._params = params
+        self._trainer = trainer
+        self._shard = shard
+        self._buffers = {}
+        self._thread = None
+        self._error = None
+
+    def _named_params(self):
+        if isinstance(self._params, Block):
+            return self._params._collect_params_with_prefix()
+        return self._params
+
+    def _snapshot_params(self):
+        """Enqueues copies of all parameters into host buffers."""
+        arrays = {}
+        for name, param in self._named_params().items():
+            data = param.list_data()
+            if len(data) > 1 or param._stype != 'default':
+                arrays[name] = param._reduce()
+                continue
+            data = data[0].as_nd_ndarray()
+            # host buffers are reused across checkpoints, which is safe because
+            # the previous checkpoint has been written when a new one starts
+            buf = self._buffers.get(name)
+            if buf is None or buf.shape != data.shape or buf.dtype != data.dtype:
+                host = cpu_pinned() if data.context.device_type == 'gpu' else cpu()
+                buf = ndarray.empty(data.shape, ctx=host, dtype=data.dtype)
+                self._buffers[name] = buf
+            data.copyto(buf)
+            arrays[name] = buf.as_np_ndarray() if is_np_array() else buf
+        return arrays
+
+    def save(self, prefix):
+        """Saves a checkpoint in the background.
+
+        Waits for the previous checkpoint to be written first.
+
+        Parameters
+        ----------
+        prefix : str
+            Path prefix of the checkpoint files.
+        """
+        self.wait()
+        arrays = self._snapshot_params()
+        states = None
+        if self._trainer is not None:
+            states = self._trainer._snapshot_states()
+            if states is None:
+                # the states live in kvstore and can only be saved from there
+                self._trainer.save_states(prefix + '.states')
+        self._submit(self._write, prefix, arrays, states, is_np_array())
+
+    def wait(self):
+        """Waits for the pending checkpoint to be written.
+
+        Raises the error of the background writer, if any.
+        """
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _submit(self, fn, *args):
+        """Runs `fn` in a background thread after the pending work."""
+        pending = self._thread
+
+        def _run():
+            if pending is not None:
+                pending.join()
+            try:
+                fn(*args)
+            except Exception as e: # pylint: disable=broad-except
+                self._error = e
+        self._thread = threading.Thread(target=_run)
+        self._thread.start()
+
+    def _write(self, prefix, arrays, states, np_array):
+        if self._shard:
+            self._write_shards(prefix, arrays, states)
+            return
+        save_fn = _mx_npx.save if np_array else ndarray.save
+        _atomic_write(prefix + '.params', lambda fname: save_fn(fname, arrays))
+        if states is not None:
+            data = pickle.dumps(states)
+            _atomic_write(prefix + '.states', lambda fname: _write_bytes(fname, data))
+
+    def _write_shards(self, prefix, arrays, states):
+        shard_dir = _shard_dir(prefix)
+        if not os.path.exists(shard_dir):
+            os.makedirs(shard_dir)
+        manifest = {'params': {}, 'states': None, 'optimizer': None}
+        for name, arr in arrays.items():
+            arr = arr.as_nd_ndarray()
+            value = arr.asnumpy()
+            digest = hashlib.sha1(str((value.shape, value.dtype.str, arr.stype)).encode('utf-8'))
+            digest.update(value.tobytes())
+            shard = digest.hexdigest() + '.params'
+            path = os.path.join(shard_dir, shard)
+            if not os.path.exists(path):
+                _atomic_write(path, lambda fname, arr=arr: ndarray.save(fname, [arr]))
+            manifest['params'][name] = shard
+        if states is not None:
+            states, optimizer = states
+            manifest['states'] = {}
+            for index, state in states.items():
+                manifest['states'][str(index)] = _write_bytes_shard(
+                    shard_dir, pickle.dumps(state), '.states')
+            manifest['optimizer'] = _write_bytes_shard(
+                shard_dir, pickle.dumps(optimizer), '.optimizer')
+        manifest_file = prefix + '.manifest'
+        # shards of the checkpoint replaced by this one, e.g. of a `-best` checkpoint
+        old_shards = _manifest_shards(manifest_file) if os.path.exists(manifest_file) \
+                     else set()
+        data = json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+        _atomic_write(manifest_file, lambda fname: _write_bytes(fname, data))
+        # removed only once the new manifest is written, which may still use some of them
+        _remove_unreferenced_shards(prefix, old_shards)
+
+    def load(self, prefix, ctx=None, allow_missing=False, ignore_extra=False):
+        """Loads a checkpoint saved by :py:meth:`save`.
+
+        Parameters
+        ----------
+        prefix : str
+            Path prefix of the checkpoint files.
+        ctx : Context or list of Context
+            Context(s) initialize loaded parameters on.
+        allow_missing : bool, default False
+            Whether to silently skip loading parameters not represented in the checkpoint.
+        ignore_extra : bool, default False
+            Whether to silently ignore parameters from the checkpoint that are not
+            present in the parameters.
+        """
+        self.wait()
+        manifest_file = prefix + '.manifest'
+        if not os.path.exists(manifest_file):
+            if isinstance(self._params, Block):
+                self._params.load_parameters(prefix + '.params', ctx, allow_missing, ignore_extra)
+            else:
+                self._params.load(prefix + '.params', ctx, allow_missing, ignore_extra)
+            if self._trainer is not None:
+                self._trainer.load_states(prefix + '.states')
+            return
+
+        with open(manifest_file, 'r') as fin:
+            manifest = json.load(fin)
+        shard_dir = _shard_dir(prefix)
+        loaded = {}
+        for name, shard in manifest['params'].items():
+            arr = ndarray.load(os.path.join(shard_dir, shard))[0]
+            loaded[name] = arr.as_np_ndarray() if is_np_array() else arr
+        self._load_arrays(loaded, manifest_file, ctx, allow_missing, ignore_extra)
+
+        if self._trainer is None:
+            return
+        if manifest['states'] is None:
+            self._trainer.load_states(prefix + '.states')
+            return
+        states = {}
+        for index, shard in manifest['states'].items():
+            with open(os.path.join(shard_dir, shard), 'rb') as fin:
+                states[int(index)] = pickle.loads(fin.read())
+        with open(os.path.join(shard_dir, manifest['optimizer']), 'rb') as fin:
+            optimizer = pickle.loads(fin.read())
+        self._trainer._load_snapshot(states, optimizer)
+
+    def _load_arrays(self, loaded, filename, ctx, allow_missing, ignore_extra):
+        if not isinstance(self._params, Block):
+            self._params.load_dict(loaded, ctx, allow_missing, ignore_extra, filename=filename)
+            return
+        params = self._named_params()
+        if not allow_missing:
+            for name in params.keys():
+                assert name in loaded, \
+                    "Parameter '%s' is missing in file '%s', which contains parameters: %s. " \
+                    "Set allow_missing=True to ignore missing parameters."%(
+                        name, filename, _brief_print_list(loaded.keys()))
+        for name in loaded:
+            if not ignore_extra and name not in params:
+                raise ValueError(
+                    "Parameter '%s' loaded from file '%s' is not present in ParameterDict, " \
+                    "which contains parameters %s. Set ignore_extra=True to ignore. "%(
+                        name, filename, _brief_print_list(params.keys())))
+            if name in params:
+                params[name]._load_init(loaded[name], ctx)
+
+    def remove(self, prefix):
+        """Removes a checkpoint saved by :py:meth:`save` in the background,
+        after the pending checkpoint is written.
+
+        Shards still referenced by other checkpoints in the same directory are kept.
+
+        Parameters
+        ----------
+        prefix : str
+            Path prefix of the checkpoint files.
+        """
+        self._submit(self._remove, prefix)
+
+    def _remove(self, prefix):
+        manifest_file = prefix + '.manifest'
+        if not os.path.exists(manifest_file):
+            for ext in ('.params', '.states'):
+                if os.path.exists(prefix + ext):
+                    os.remove(prefix + ext)
+            return
+        shards = _manifest_shards(manifest_file)
+        os.remove(manifest_file)
+        if os.path.exists(prefix + '.states'):
+            os.remove(prefix + '.states')
+        _remove_unreferenced_shards(prefix, shards)
+
+
+def _shard_dir(prefix):
+    return os.path.join(os.path.dirname(prefix), 'checkpoint-shards')
+
+
+def _remove_unreferenced_shards(prefix, shards):
+    """Removes the `shards` that no manifest next to `prefix` references."""
+    directory = os.path.dirname(prefix + '.manifest') or '.'
+    for fname in os.listdir(directory):
+        if fname.endswith('.manifest'):
+            shards = shards - _manifest_shards(os.path.join(directory, fname))
+    shard_dir = _shard_dir(prefix)
+    for shard in shards:
+        path = os.path.join(shard_dir, shard)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _manifest_shards(manifest_file):
+    with open(manifest_file, 'r') as fin:
+        manifest = json.load(fin)
+    shards = set(manifest['params'].values())
+    if manifest['states'] is not None:
+        shards.update(manifest['states'].values())
+        shards.add(manifest['optimizer'])
+    return shards
+
+
+def _write_bytes(fname, data):
+    with open(fname, 'wb') as fout:
+        fout.write(data)
+
+
+def _write_bytes_shard(shard_dir, data, ext):
+    shard = hashlib.sha1(data).hexdigest() + ext
+    path = os.path.join(shard_dir, shard)
+    if not os.path.exists(path):
+        _atomic_write(path, lambda fname: _write_bytes(fname, data))
+    return shard
+
+
+def _atomic_write(fname, write_fn):
+    """Writes to a temporary file first so that an interrupted write never
+    leaves a truncated checkpoint behind."""
+    tmp_fname = '%s.tmp%d' % (fname, threading.current_thread().ident)
+    write_fn(tmp_fname)
+    os.rename(tmp_fname, fname)
@@ -27,3 +27,5 @@ from . import cnn
 from . import data
 
 from . import estimator
+
+from . import serving
@@ -28,7 +28,7 @@ from ...data import DataLoader
 from ...loss import SoftmaxCrossEntropyLoss
 from ...loss import Loss as gluon_loss
 from ...trainer import Trainer
-from ...utils import split_and_load
+from ...utils import split_and_load, split_data
 from .... import autograd
 from ....context import Context, cpu, gpu, num_gpus
 from ....metric import EvalMetric, Accuracy
@@ -175,6 +175,17 @@ class Estimator(object):
         label = split_and_load(label, ctx_list=ctx, batch_axis=batch_axis)
         return data, label
 
+    def _split_micro_batches(self, batch, micro_batches, batch_axis=0):
+        if micro_batches == 1:
+            return [batch]
+        if batch[0].shape[batch_axis] < micro_batches:
+            raise ValueError("Batch of size %d cannot be split into %d micro-batches, "
+                             "use a larger batch size or drop the last batch." %
+                             (batch[0].shape[batch_axis], micro_batches))
+        data = split_data(batch[0], micro_batches, batch_axis, even_split=False)
+        label = split_data(batch[1], micro_batches, batch_axis, even_split=False)
+        return list(zip(data, label))
+
     def prepare_loss_and_metrics(self):
         """
         Based on loss functions and training metrics in estimator
@@ -238,7 +249,8 @@ class Estimator(object):
             epochs=None,
             event_handlers=None,
             batches=None,
-            batch_axis=0):
+            batch_axis=0,
+            micro_batches=None):
         """Trains the model with a given :py:class:`DataLoader` for a specified
         number of epochs or batches. The batch size is inferred from the
         data loader's batch_size.
@@ -259,12 +271,24 @@ class Estimator(object):
             You can only specify one and only one type of iteration(epochs or batches).
         batch_axis : int, default 0
             Batch axis to split the training data into devices.
+        micro_batches : int, default None
+            Number of micro-batches each batch is split into along `batch_axis`.
+            Gradients of the micro-batches are accumulated and the parameters are
+            updated once per batch. Must match the trainer's `accumulate_steps`;
+            defaults to it if not specified.
         """
         if not isinstance(train_data, DataLoader):
             raise ValueError("Estimator only support input as Gluon DataLoader. Alternatively, you "
                              "can transform your DataIter or any NDArray into Gluon DataLoader. "
                              "Refer to gluon.data.dataloader")
 
+        accumulate_steps = self.trainer._accumulate_steps
+        micro_batches = micro_batches or accumulate_steps
+        if micro_batches != accumulate_steps:
+            raise ValueError("micro_batches (%d) must match the accumulate_steps (%d) of "
+                             "the trainer, create the Trainer with accumulate_steps=%d." %
+                             (micro_batches, accumulate_steps, micro_batches))
+
         # must specify one and only one of epochs or batches
         if (not epochs) == (not batches):
             raise ValueError(
@@ -274,6 +298,7 @@ class Estimator(object):
 
         self.max_epoch = epochs
         self.max_batch = batches
+        self.train_data = train_data
 
         # provide default handlers
         event_handlers = self._prepare_default_handlers(val_data, event_handlers)
@@ -293,22 +318,29 @@ class Estimator(object):
                 handler.epoch_begin(estimator_ref)
 
             for i, batch in enumerate(train_data):
-                data, label = self._get_data_and_label(batch, self.context, batch_axis)
-
-                batch_size = batch[0].shape[0]
-
                 # batch begin
                 for handler in batch_begin:
                     handler.batch_begin(estimator_ref, batch=batch)
 
-                with autograd.record():
-                    pred = [self.net(x) for x in data]
-                    loss = [self.loss[0](y_hat, y) for y_hat, y in zip(pred, label)]
-
-                for l in loss:
-                    l.backward()
-
-                self.trainer.step(batch_size)
+                pred, label, loss = [], [], []
+                # the trainer only reduces and updates on the last micro-batch
+                for micro_batch in self._split_micro_batches(batch, micro_batches, batch_axis):
+                    data, micro_label = self._get_data_and_label(micro_batch, self.context,
+                                                                 batch_axis)
+                    batch_size = micro_batch[0].shape[0]
+
+                    with autograd.record():
+                        micro_pred = [self.net(x) for x in data]
+                        micro_loss = [self.loss[0](y_hat, y)
+                                      for y_hat, y in zip(micro_pred, micro_label)]
+
+                    for l in micro_loss:
+                        l.backward()
+
+                    self.trainer.step(batch_size)
+                    pred.extend(micro_pred)
+                    label.extend(micro_label)
+                    loss.extend(micro_loss)
                 # batch end
 
                 batch_end_result = []
@@ -21,6 +21,7 @@
 
 import logging
 import os
+import pickle
 import time
 import warnings
 
@@ -28,6 +29,7 @@ import numpy as np
 
 from ....metric import EvalMetric
 from ....metric import Loss as metric_loss
+from ...checkpoint import Checkpointer
 
 __all__ = ['TrainBegin', 'TrainEnd', 'EpochBegin', 'EpochEnd', 'BatchBegin', 'BatchEnd',
            'StoppingHandler', 'MetricHandler', 'ValidationHandler',
@@ -332,12 +334,12 @@ class LoggingHandler(TrainBegin, TrainEnd, EpochBegin, EpochEnd, BatchBegin, Bat
         self.batch_index = 0
 
 
-class CheckpointHandler(TrainBegin, BatchEnd, EpochEnd):
+class CheckpointHandler(TrainBegin, BatchEnd, EpochEnd, TrainEnd):
     """Save the model after user define period
 
     :py:class:`CheckpointHandler` saves the network architecture after first batch if the model
-    can be fully hybridized, saves model parameters and trainer states after user defined period,
-    default saves every epoch.
+    can be fully hybridized, saves model parameters, trainer states and the state of the
+    training data loader after user defined period, default saves every epoch.
 
     Parameters
     ----------
@@ -369,8 +371,17 @@ class CheckpointHandler(TrainBegin, BatchEnd, EpochEnd):
         will be removed. Best checkpoint file is not counted.
     resume_from_checkpoint : bool, default False
         Whether to resume training from checkpoint in model_dir. If True and checkpoints
-        found, :py:class:`CheckpointHandler` will load net parameters and trainer states,
-        and train the remaining of epochs and batches.
+        found, :py:class:`CheckpointHandler` will load net parameters, trainer states and
+        the data loader state, and train the remaining of epochs and batches. With the data
+        loader state, training resumes right after the last batch seen before the checkpoint.
+    async_save : bool, default True
+        Whether to write checkpoints in a background thread while training continues,
+        see :py:class:`mxnet.gluon.Checkpointer`. Training ends once all checkpoints
+        are written.
+    shard : bool, default False
+        Whether to write every parameter and optimizer state to its own file and skip
+        the tensors unchanged since an earlier checkpoint. The checkpoint is then
+        described by a ``.manifest`` file instead of the ``.params`` and ``.states`` files.
     """
 
     def __init__(self,
@@ -383,7 +394,9 @@ class CheckpointHandler(TrainBegin, BatchEnd, EpochEnd):
                  epoch_period=1,
                  batch_period=None,
                  max_checkpoints=5,
-                 resume_from_checkpoint=False):
+                 resume_from_checkpoint=False,
+                 async_save=True,
+                 shard=False):
         self.monitor = monitor
         self.verbose = verbose
         if not os.path.exists(model_dir):
@@ -401,6 +414,10 @@ class CheckpointHandler(TrainBegin, BatchEnd, EpochEnd):
         self.max_checkpoints = max_checkpoints
         self.resume_from_checkpoint = resume_from_checkpoint
         self.saved_checkpoints = []
+        self.async_save = async_save
+        self.shard = shard
+        self._param_ext = '.manifest' if shard else '.params'
+        self._checkpointer = None
         self.logger = logging.getLogger(__name__)
         if self.save_best:
             if mode not in ['auto', 'min', 'max']:
@@ -434,6 +451,7 @@ class CheckpointHandler(TrainBegin, BatchEnd, EpochEnd):
         # reset all counters
         self.current_epoch = 0
         self.current_batch = 0
+        self._checkpointer = Checkpointer(estimator.net, estimator.trainer, shard=self.shard)
         if self.save_best:
             self.best = np.Inf if self.monitor_op == np.less else -np.Inf  # pylint: disable=comparison-with-callable
         if self.resume_from_checkpoint:
@@ -463,6 +481,9 @@ class CheckpointHandler(TrainBegin, BatchEnd, EpochEnd):
             self._save_checkpoint(estimator)
         self.current_epoch += 1
 
+    def train_end(self, estimator, *args, **kwargs):
+        self._checkpointer.wait()
+
     def _save_checkpoint(self, estimator):
         # if resumed from checkpoint, increment checkpoint number
         if self.resume_from_checkpoint:
@@ -520,10 +541,10 @@ class CheckpointHandler(TrainBegin, BatchEnd, EpochEnd):
                              "Estimator in order to save model architecture as %s.", symbol_file)
 
     def _save_params_and_trainer(self, estimator, file_prefix):
-        param_file = os.path.join(self.model_dir, file_prefix + '.params')
-        trainer_file = os.path.join(self.model_dir, file_prefix + '.states')
-        estimator.net.save_parameters(param_file)
-        estimator.trainer.save_states(trainer_file)
+        self._checkpointer.save(os.path.join(self.model_dir, file_prefix))
+        if not self.async_save:
+            self._checkpointer.wait()
+        self._save_data_loader(estimator, file_prefix)
 
         # only count checkpoints with epoch or batch number in file name
         if 'best' not in file_prefix:
@@ -531,9 +552,28 @@ class CheckpointHandler(TrainBegin, BatchEnd, EpochEnd):
         # remove old checkpoint when max number of checkpoints reached
         if len(self.saved_checkpoints) > self.max_checkpoints:
             prefix = self.saved_checkpoints.pop(0)
-            for fname in os.listdir(self.model_dir):
-                if fname.startswith(prefix):
-                    os.remove(os.path.join(self.model_dir, fname))
+            self._checkpointer.remove(os.path.join(self.model_dir, prefix))
+            loader_file = os.path.join(self.model_dir, prefix + '.loader')
+            if os.path.exists(loader_file):
+                os.remove(loader_file)
+
+    def _save_data_loader(self, estimator, file_prefix):
+        try:
+            state = estimator.train_data.state_dict()
+        except NotImplementedError:
+            return
+        loader_file = os.path.join(self.model_dir, file_prefix + '.loader')
+        with open(loader_file, 'wb') as fout:
+            pickle.dump(state, fout, pickle.HIGHEST_PROTOCOL)
+
+    def _load_data_loader(self, estimator, file_prefix):
+        loader_file = os.path.join(self.model_dir, file_prefix + '.loader')
+        if not os.path.exists(loader_file):
+            self.logger.info("CheckpointHandler: %s does not exist, data loader starts from "
+                             "the beginning of an epoch", loader_file)
+            return
+        with open(loader_file, 'rb') as fin:
+            estimator.train_data.load_state_dict(pickle.load(fin))
 
     def _resume_from_checkpoint(self, estimator):
         prefix = self.model_prefix + '-epoch'
@@ -548,7 +588,7 @@ class CheckpointHandler(TrainBegin, BatchEnd, EpochEnd):
             dir=self.model_dir,
             prefix=prefix,
             start='batch',
-            end='.params')
+            end=self._param_ext)
 
         if self.trained_epoch == -1:
             msg = "CheckpointHandler: No checkpoint found, training from scratch for "
@@ -576,14 +616,15 @@ class CheckpointHandler(TrainBegin, BatchEnd, EpochEnd):
                 estimator.max_batch = estimator.max_batch - self.trained_batch - 1
                 msg += "%d batches " % estimator.max_batch
             # load checkpoint
-            param_file = "%s-epoch%dbatch%d.params" % (self.model_prefix, self.trained_epoch, self.trained_batch)
-            param_file = os.path.join(self.model_dir, param_file)
-            trainer_file = "%s-epoch%dbatch%d.states" % (self.model_prefix, self.trained_epoch, self.trained_batch)
-            trainer_file = os.path.join(self.model_dir, trainer_file)
-            assert os.path.exists(param_file), "Failed to load checkpoint, %s does not exist" % param_file
-            assert os.path.exists(trainer_file), "Failed to load checkpoint, %s does not exist" % trainer_file
-            estimator.net.load_parameters(param_file, ctx=estimator.context)
-            estimator.trainer.load_states(trainer_file)
+            file_prefix = "%s-epoch%dbatch%d" % (self.model_prefix, self.trained_epoch, self.trained_batch)
+            files = [file_prefix + self._param_ext]
+            if not self.shard:
+                files.append(file_prefix + '.states')
+            for fname in files:
+                fname = os.path.join(self.model_dir, fname)
+                assert os.path.exists(fname), "Failed to load checkpoint, %s does not exist" % fname
+            self._checkpointer.load(os.path.join(self.model_dir, file_prefix), ctx=estimator.context)
+            self._load_data_loader(estimator, file_prefix)
             self.logger.warning(msg)
 
     def _find_max_iteration(self, dir, prefix, start, end, saved_checkpoints=None):
@@ -593,10 +634,10 @@ class CheckpointHandler(TrainBegin, BatchEnd, EpochEnd):
                     "there should also be a .states file for each .params file "
         max_iter = -1
         for fname in os.listdir(dir):
-            if fname.startswith(prefix) and '.params' in fname:
+            if fname.startswith(prefix) and fname.endswith(self._param_ext):
                 if saved_checkpoints:
                     # save prefix of existing checkpoints
-                    saved_checkpoints.append(fname[:fname.find('.params')])
+                    saved_checkpoints.append(fname[:fname.find(self._param_ext)])
                 try:
                     # find trained number of epoch
                     iter = int(fname[fname.find(start) + len(start): fname.find(end)])
@@ -0,0 +1,329 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+# coding: utf-8
+"""In-process inference server batching concurrent requests."""
+
+__all__ = ['BatchingServer']
+
+import collections
+import threading
+import time
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+import numpy as np
+
+from .... import ndarray as nd
+from ....context import cpu
+from ...block import HybridBlock
+
+
+def _pad_to_buckets(inputs, shape_buckets):
+    """Zero pads the sample `inputs` to the shape buckets. Returns the padded inputs
+    and, for every bucketed axis, the original size of every padded size."""
+    sizes = {}
+    padded_inputs = []
+    for data in inputs:
+        shape = list(data.shape)
+        for axis, multiple in shape_buckets.items():
+            if axis < len(shape) and shape[axis] % multiple:
+                size = shape[axis]
+                shape[axis] = (size // multiple + 1) * multiple
+                sizes.setdefault(axis, {}).setdefault(shape[axis], size)
+        if tuple(shape) != data.shape:
+            padded = np.zeros(shape, dtype=data.dtype)
+            padded[tuple(slice(0, i) for i in data.shape)] = data
+            data = padded
+        padded_inputs.append(data)
+    return padded_inputs, sizes
+
+
+def _slice_from_buckets(out, sizes):
+    """Slices the axes of the sample output `out` padded by `_pad_to_buckets`
+    back to the original size."""
+    index = [slice(None)] * out.ndim
+    for axis, axis_sizes in sizes.items():
+        if axis < out.ndim and out.shape[axis] in axis_sizes:
+            index[axis] = slice(0, axis_sizes[out.shape[axis]])
+    return out[tuple(index)]
+
+
+class _Request(object):
+    """A request submitted to :py:class:`BatchingServer`, resolved with its outputs."""
+    def __init__(self, inputs, sizes=None):
+        self.inputs = inputs
+        self.sizes = sizes
+        self.signature = tuple((i.shape, i.dtype) for i in inputs)
+        self.submitted = time.time()
+        self._event = threading.Event()
+        self._outputs = None
+        self._error = None
+
+    def _set(self, outputs=None, error=None):
+        self._outputs = outputs
+        self._error = error
+        self._event.set()
+
+    def done(self):
+        """Returns whether the request has been served."""
+        return self._event.is_set()
+
+    def result(self, timeout=None):
+        """Waits for the request to be served and returns its outputs.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum number of seconds to wait.
+        """
+        if not self._event.wait(timeout):
+            raise RuntimeError("Inference request timed out after %s seconds" % timeout)
+        if self._error is not None:
+            raise self._error
+        return self._outputs
+
+
+class BatchingServer(object):
+    """Serves single requests with a model by batching concurrent requests.
+
+    Requests submitted from any number of threads are queued. A worker thread
+    coalesces them into a batch until the batch holds `max_batch_size` requests
+    or the first request of the batch has waited `max_wait` seconds. The batch
+    is zero padded to the smallest of `batch_sizes` it fits in, so that the
+    hybridized model only sees the shapes of its cached graphs, and the outputs
+    are scattered back to the requests.
+
+    Only requests whose inputs have the same shapes and dtypes are batched
+    together. Every such input signature has a batch of its own, which is served
+    when it is full or its first request has waited `max_wait` seconds, so that
+    requests of different shapes are batched independently. With `shape_buckets`,
+    the inputs of every request are zero padded along the given axes first, so
+    that requests of similar shapes share a signature.
+
+    Parameters
+    ----------
+    block : HybridBlock
+        The model, e.g. loaded with :py:meth:`SymbolBlock.imports`, taking batches
+        along the first axis of every input and output. If it is not hybridized yet,
+        it is hybridized with static memory and one cached graph per batch size and
+        input signature.
+    max_batch_size : int, default 32
+        Maximum number of requests in a batch.
+    max_wait : float, default 0.005
+        Maximum number of seconds a request waits for other requests to be batched with.
+    batch_sizes : list of int, default None
+        Batch sizes a batch is padded to. By default, the powers of two up to
+        `max_batch_size` and `max_batch_size` itself.
+    ctx : Context, default cpu()
+        Context the model runs on.
+    shape_buckets : dict of int to int, default None
+        Maps an axis of the sample inputs, i.e. without the batch axis, to a multiple
+        to which their size along that axis is rounded up by zero padding. Output axes
+        padded this way are sliced back to the original size of each request. Only use
+        it when the padded positions do not affect the results of the others.
+    num_signatures : int, default 4
+        Number of input signatures for which the model keeps cached graphs of all
+        batch sizes, if it is hybridized by the server.
+
+    Examples
+    --------
+    >>> with BatchingServer(net, max_batch_size=16) as server:
+    ...     out = server.predict(np.ones((3, 224, 224), dtype='float32'))
+    """
+    def __init__(self, block, max_batch_size=32, max_wait=0.005, batch_sizes=None, ctx=None,
+                 shape_buckets=None, num_signatures=4):
+        if batch_sizes is None:
+            batch_sizes = [2 ** i for i in range(max_batch_size.bit_length())
+                           if 2 ** i < max_batch_size] + [max_batch_size]
+        batch_sizes = sorted(batch_sizes)
+        if batch_sizes[-1] < max_batch_size:
+            raise ValueError("The largest of batch_sizes %s is smaller than max_batch_size %d"
+                             % (batch_sizes, max_batch_size))
+        self._block = block
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._batch_sizes = batch_sizes
+        self._ctx = ctx if ctx is not None else cpu()
+        self._shape_buckets = shape_buckets
+        if isinstance(block, HybridBlock) and not block._active:
+            block.hybridize(static_alloc=True, static_shape=True,
+                            cache_size=len(batch_sizes) * num_signatures)
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._latencies = collections.deque(maxlen=10000)
+        self._num_requests = 0
+        self._num_batches = 0
+        self._num_padded = 0
+        self._worker = None
+
+    def start(self):
+        """Starts the worker thread serving the requests."""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._serve)
+            self._worker.daemon = True
+            self._worker.start()
+        return self
+
+    def stop(self):
+        """Serves the queued requests and stops the worker thread."""
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def submit(self, *inputs):
+        """Submits a request.
+
+        Parameters
+        ----------
+        *inputs : NDArray or numpy.ndarray
+            Inputs of a single sample, without the batch axis.
+
+        Returns
+        -------
+        Request
+            Object whose `result(timeout=None)` method waits for the request to be
+            served and returns its outputs as numpy arrays, a tuple if the model
+            has multiple outputs, and whose `done()` method tells if it was served.
+        """
+        if self._worker is None:
+            raise RuntimeError("BatchingServer is not started. Call start() first.")
+        inputs = [i.asnumpy() if isinstance(i, nd.NDArray) else np.asarray(i) for i in inputs]
+        sizes = None
+        if self._shape_buckets:
+            inputs, sizes = _pad_to_buckets(inputs, self._shape_buckets)
+        request = _Request(inputs, sizes)
+        self._queue.put(request)
+        return request
+
+    def predict(self, *inputs):
+        """Submits a request and waits for its outputs, see :py:meth:`submit`."""
+        return self.submit(*inputs).result()
+
+    def warmup(self, *inputs):
+        """Runs the model with every batch size, so that the cached graphs are
+        built before serving. Must be called before :py:meth:`start`.
+
+        Parameters
+        ----------
+        *inputs : NDArray or numpy.ndarray
+            Inputs of a single sample, without the batch axis.
+        """
+        if self._worker is not None:
+            raise RuntimeError("BatchingServer.warmup must be called before start().")
+        inputs = [i.asnumpy() if isinstance(i, nd.NDArray) else np.asarray(i) for i in inputs]
+        if self._shape_buckets:
+            inputs, _ = _pad_to_buckets(inputs, self._shape_buckets)
+        for batch_size in self._batch_sizes:
+            batch = [nd.array(np.repeat(i[np.newaxis], batch_size, axis=0),
+                              ctx=self._ctx, dtype=i.dtype) for i in inputs]
+            with self._ctx:
+                self._block(*batch)
+        nd.waitall()
+
+    def stats(self):
+        """Returns the serving statistics.
+
+        Returns
+        -------
+        dict
+            `requests` and `batches` served, `latency_p50` and `latency_p99` in
+            seconds from submission to result over the last 10000 requests,
+            `mean_batch_size`, and `batch_fill`, the ratio of requests to padded
+            batch slots.
+        """
+        with self._lock:
+            latencies = np.array(self._latencies)
+            num_requests, num_batches, num_padded = \
+                self._num_requests, self._num_batches, self._num_padded
+        return {
+            'requests': num_requests,
+            'batches': num_batches,
+            'latency_p50': float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+            'latency_p99': float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+            'mean_batch_size': float(num_requests) / num_batches if num_batches else 0.0,
+            'batch_fill': float(num_requests) / num_padded if num_padded else 0.0,
+        }
+
+    def _serve(self):
+        # open batches by input signature, each with the deadline of its first request
+        batches = collections.OrderedDict()
+        while True:
+            try:
+                if batches:
+                    deadline = min(d for d, _ in batches.values())
+                    request = self._queue.get(timeout=max(deadline - time.time(), 0))
+                else:
+                    request = self._queue.get()
+            except queue.Empty:
+                pass
+            else:
+                if request is None:
+                    for _, batch in batches.values():
+                        self._run(batch)
+                    return
+                if request.signature not in batches:
+                    batches[request.signature] = (request.submitted + self._max_wait, [])
+                batch = batches[request.signature][1]
+                batch.append(request)
+                if len(batch) >= self._max_batch_size:
+                    del batches[request.signature]
+                    self._run(batch)
+            now = time.time()
+            for signature in [k for k, (d, _) in batches.items() if d <= now]:
+                self._run(batches.pop(signature)[1])
+
+    def _run(self, batch):
+        num = len(batch)
+        batch_size = next(i for i in self._batch_sizes if i >= num)
+        try:
+            inputs = []
+            for j in range(len(batch[0].inputs)):
+                data = np.zeros((batch_size,) + batch[0].inputs[j].shape,
+                                dtype=batch[0].inputs[j].dtype)
+                for i, request in enumerate(batch):
+                    data[i] = request.inputs[j]
+                inputs.append(nd.array(data, ctx=self._ctx, dtype=data.dtype))
+            with self._ctx:
+                outputs = self._block(*inputs)
+            multiple = isinstance(outputs, (list, tuple))
+            outputs = [o.asnumpy() for o in outputs] if multiple else [outputs.asnumpy()]
+        except Exception as e: # pylint: disable=broad-except
+            for request in batch:
+                request._set(error=e)
+            return
+        for i, request in enumerate(batch):
+            results = tuple(o[i] for o in outputs)
+            if request.sizes:
+                results = tuple(_slice_from_buckets(o, request.sizes) for o in results)
+            request._set(outputs=results if multiple else results[0])
+        now = time.time()
+        with self._lock:
+            self._latencies.extend(now - request.submitted for request in batch)
+            self._num_requests += num
+            self._num_batches += 1
+            self._num_padded += batch_size
@@ -25,11 +25,19 @@ import pickle
 import io
 import sys
 import signal
+import ctypes
+import collections
 import multiprocessing
 import multiprocessing.queues
 from multiprocessing.reduction import ForkingPickler
 from multiprocessing.pool import ThreadPool
 import threading
+import traceback
+import weakref
+try:
+    import queue
+except ImportError:
+    import Queue as queue
 import numpy as np
 
 try:
@@ -38,7 +46,9 @@ except ImportError:
     pass
 
 from . import sampler as _sampler
-from ... import nd, context
+from .dataset import IterableDataset, _get_batch
+from ... import nd, context, profiler
+from ...base import _LIB, check_call
 from ...util import is_np_shape, is_np_array, set_np
 from ... import numpy as _mx_np  # pylint: disable=reimported
 
@@ -162,6 +172,114 @@ def default_mp_batchify_fn(data):
                         ctx=context.Context('cpu_shared', 0))
 
 
+class _PinnedMemoryPool(object):
+    """Pool of reusable pinned memory staging buffers keyed by shape and dtype.
+
+    A buffer is reused once the pool holds the only reference to it. Pending
+    asynchronous reads of a released buffer, e.g. copies to GPU, are ordered
+    before the next write by the engine.
+
+    Parameters
+    ----------
+    device_id : int
+        The device id of the pinned memory.
+    max_buffers : int
+        The maximum number of buffers kept for each shape and dtype.
+    """
+    def __init__(self, device_id, max_buffers):
+        self._ctx = context.cpu_pinned(device_id)
+        self._max_buffers = max_buffers
+        self._buffers = collections.defaultdict(list)
+        self._lock = threading.Lock()
+        self.num_allocations = 0
+        self.copied_bytes = 0
+        domain = profiler.Domain('DataLoader')
+        self._alloc_counter = domain.new_counter('pinned_allocations', 0)
+        self._copy_counter = domain.new_counter('pinned_copy_bytes', 0)
+
+    def empty(self, shape, dtype, is_np=False):
+        """Returns a free pinned buffer with the given shape and dtype."""
+        key = (tuple(shape), np.dtype(dtype).name, is_np)
+        with self._lock:
+            buffers = self._buffers[key]
+            for i in range(len(buffers)):
+                # referenced only by the list and the getrefcount argument
+                if sys.getrefcount(buffers[i]) <= 2:
+                    return buffers[i]
+            empty_fn = _mx_np.empty if is_np else nd.empty
+            buf = empty_fn(shape, dtype=dtype, ctx=self._ctx)
+            self.num_allocations += 1
+            self._alloc_counter.increment()
+            if len(buffers) < self._max_buffers:
+                buffers.append(buf)
+            return buf
+
+    def count_copy(self, data):
+        """Records a copy of data into the pool."""
+        nbytes = int(np.prod(data.shape)) * np.dtype(data.dtype).itemsize
+        with self._lock:
+            self.copied_bytes += nbytes
+        self._copy_counter.increment(nbytes)
+
+    def stage(self, data):
+        """Copies data into pinned buffers of the pool."""
+        if isinstance(data, nd.NDArray):
+            if data.context == self._ctx:
+                return data
+            if data.stype != 'default':
+                return data.as_in_context(self._ctx)
+            buf = self.empty(data.shape, data.dtype, isinstance(data, _mx_np.ndarray))
+            data.copyto(buf)
+            self.count_copy(data)
+            return buf
+        elif isinstance(data, (list, tuple)):
+            return [self.stage(d) for d in data]
+        return data
+
+
+class _PinnedBatchify(object):
+    """Collate data into batch. Stack directly into pinned buffers of the pool."""
+    def __init__(self, pool):
+        self._pool = pool
+
+    def __call__(self, data):
+        if isinstance(data[0], nd.NDArray):
+            out = self._pool.empty((len(data),) + data[0].shape, data[0].dtype,
+                                   is_np_array())
+            self._pool.count_copy(out)
+            if is_np_array():
+                return _mx_np.stack(data, out=out)
+            return nd.stack(*data, out=out)
+        elif isinstance(data[0], tuple):
+            data = zip(*data)
+            return [self(i) for i in data]
+        else:
+            data = np.asarray(data)
+            array_fn = _mx_np.array if is_np_array() else nd.array
+            return self._pool.stage(array_fn(data, dtype=data.dtype))
+
+
+def _pin_batch(batch, pin_device_id, pin_pool=None):
+    """Move batch into pinned memory, reusing the buffers of the pool if given."""
+    if pin_pool is not None:
+        return pin_pool.stage(batch)
+    return _as_in_context(batch, context.cpu_pinned(pin_device_id))
+
+
+class _BatchTransformBatchify(object):
+    """Batchify function that transforms the data of each collated batch.
+    Use callable object instead of nested function, it can be pickled."""
+    def __init__(self, batchify_fn, transform):
+        self._batchify_fn = batchify_fn
+        self._transform = transform
+
+    def __call__(self, data):
+        batch = self._batchify_fn(data)
+        if isinstance(batch, (list, tuple)):
+            return [self._transform(batch[0])] + list(batch[1:])
+        return self._transform(batch)
+
+
 def _as_in_context(data, ctx):
     """Move data into new context."""
     if isinstance(data, nd.NDArray):
@@ -394,19 +512,150 @@ class DataLoaderV1(object):
         return len(self._batch_sampler)
 
 
+class _SharedMemoryRing(object):
+    """Pool of preallocated shared memory slots for transferring batches.
+
+    Worker processes write batchified arrays directly into a slot assigned by
+    the main process, which maps the slot without a copy. A slot is returned to
+    the pool once every array built on top of it has been released.
+
+    Parameters
+    ----------
+    num_slots : int
+        Number of slots.
+    slot_size : int
+        Size of each slot in bytes.
+    """
+    def __init__(self, num_slots, slot_size):
+        assert num_slots > 0, "num_slots must be positive, given {}".format(num_slots)
+        assert slot_size > 0, "slot_size must be positive, given {}".format(slot_size)
+        self.slot_size = slot_size
+        self.buffers = [multiprocessing.RawArray(ctypes.c_uint8, slot_size)
+                        for _ in range(num_slots)]
+        # deque append/popleft are atomic, slots may be released from any thread
+        self._free = collections.deque(range(num_slots))
+        self._deferred = []
+
+    def acquire(self):
+        """Returns the id of a free slot, or None if all slots are in use."""
+        if self._deferred:
+            pending = []
+            for async_ret, slot in self._deferred:
+                if async_ret.ready():
+                    self._free.append(slot)
+                else:
+                    pending.append((async_ret, slot))
+            self._deferred = pending
+        try:
+            return self._free.popleft()
+        except IndexError:
+            return None
+
+    def release(self, slot):
+        """Returns a slot to the pool."""
+        self._free.append(slot)
+
+    def defer(self, async_ret, slot):
+        """Releases a slot once the worker writing into it has finished."""
+        self._deferred.append((async_ret, slot))
+
+    @property
+    def num_free(self):
+        """Number of slots currently available."""
+        return len(self._free)
+
+
+class _SharedMemorySlotGuard(object):
+    """Releases a ring slot when all arrays mapping it are destroyed."""
+    def __init__(self, ring, slot):
+        self._ring = ring
+        self._slot = slot
+
+    def __del__(self):
+        self._ring.release(self._slot)
+
+
+class _SharedMemorySlotView(np.ndarray):
+    """Numpy view on a ring slot which keeps the slot guard alive."""
+
+
+class _SharedMemoryArray(object):
+    """Location of an array written into a ring slot."""
+    def __init__(self, offset, shape, dtype, is_np):
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+        self.is_np = is_np
+
+
+_SHM_ALIGNMENT = 64
+# dtypes which `nd.from_numpy` can map without copying, see DLDataTypeTransform
+_SHM_DTYPES = frozenset(['float16', 'float32', 'float64', 'uint8', 'int8', 'int32', 'int64'])
+
+def _shm_write_batch(batch, buf, offset=0):
+    """Write the arrays of a batch into a slot buffer.
+
+    Returns the layout of the batch and the end offset, or None if the batch
+    does not fit into the slot or contains arrays that cannot be mapped.
+    """
+    if isinstance(batch, nd.NDArray):
+        dtype = np.dtype(batch.dtype)
+        if batch.stype != 'default' or batch.size == 0 or \
+                dtype.name not in _SHM_DTYPES:
+            return None
+        offset = (offset + _SHM_ALIGNMENT - 1) // _SHM_ALIGNMENT * _SHM_ALIGNMENT
+        end = offset + batch.size * dtype.itemsize
+        if end > len(buf):
+            return None
+        dst = np.frombuffer(buf, dtype=dtype, count=batch.size, offset=offset)
+        check_call(_LIB.MXNDArraySyncCopyToCPU(
+            batch.handle,
+            dst.ctypes.data_as(ctypes.c_void_p),
+            ctypes.c_size_t(batch.size)))
+        return _SharedMemoryArray(offset, batch.shape, dtype.name,
+                                  isinstance(batch, _mx_np.ndarray)), end
+    elif isinstance(batch, (list, tuple)):
+        layout = []
+        for data in batch:
+            ret = _shm_write_batch(data, buf, offset)
+            if ret is None:
+                return None
+            data, offset = ret
+            layout.append(data)
+        return layout, offset
+    return batch, offset
+
+
+def _shm_read_batch(layout, buf, guard):
+    """Map a batch written by `_shm_write_batch` without copying."""
+    if isinstance(layout, _SharedMemoryArray):
+        view = np.frombuffer(buf, dtype=layout.dtype, count=int(np.prod(layout.shape)),
+                             offset=layout.offset).reshape(layout.shape)
+        view = view.view(_SharedMemorySlotView)
+        view.guard = guard
+        ret = nd.from_numpy(view, zero_copy=True)
+        return ret.as_np_ndarray() if layout.is_np else ret
+    elif isinstance(layout, list):
+        return [_shm_read_batch(i, buf, guard) for i in layout]
+    return layout
+
+
 def _thread_worker_initializer(active_shape, active_array):
     """Initializer for ThreadPool."""
     set_np(shape=active_shape, array=active_array)
 
 
 _worker_dataset = None
-def _worker_initializer(dataset, active_shape, active_array):
+_worker_shm_buffers = None
+def _worker_initializer(dataset, active_shape, active_array, shm_buffers=None):
     """Initialier for processing pool."""
     # global dataset is per-process based and only available in worker processes
     # this is only necessary to handle MXIndexedRecordIO because otherwise dataset
     # can be passed as argument
     global _worker_dataset
+    global _worker_shm_buffers
     _worker_dataset = dataset
+    _worker_shm_buffers = shm_buffers
     set_np(shape=active_shape, array=active_array)
 
 def _worker_fn(samples, batchify_fn, dataset=None):
@@ -415,33 +664,66 @@ def _worker_fn(samples, batchify_fn, dataset=None):
     # it is required that each worker process has to fork a new MXIndexedRecordIO handle
     # preserving dataset as global variable can save tons of overhead and is safe in new process
     global _worker_dataset
-    batch = batchify_fn([_worker_dataset[i] for i in samples])
+    batch = batchify_fn(_get_batch(_worker_dataset, samples))
     buf = io.BytesIO()
     ForkingPickler(buf, pickle.HIGHEST_PROTOCOL).dump(batch)
     return buf.getvalue()
 
+def _shm_worker_fn(samples, batchify_fn, dataset=None, slot=None):
+    """Function for processing data in worker process with shared memory ring transport.
+
+    The batch is written into the assigned slot and only its layout is sent back.
+    Falls back to pickling if no slot is assigned or the batch does not fit."""
+    # pylint: disable=unused-argument
+    global _worker_dataset
+    batch = batchify_fn(_get_batch(_worker_dataset, samples))
+    if slot is not None:
+        ret = _shm_write_batch(batch, _worker_shm_buffers[slot])
+        if ret is not None:
+            return slot, ret[0]
+    buf = io.BytesIO()
+    ForkingPickler(buf, pickle.HIGHEST_PROTOCOL).dump(batch)
+    return None, buf.getvalue()
+
 def _thread_worker_fn(samples, batchify_fn, dataset):
     """Threadpool worker function for processing data."""
-    return batchify_fn([dataset[i] for i in samples])
+    return batchify_fn(_get_batch(dataset, samples))
+
+def _pending_then_sampled(pending, batch_sampler):
+    """Yields batches left in flight by a saved iteration, then batches from the sampler."""
+    while pending:
+        yield pending.popleft()
+    for batch in batch_sampler:
+        yield batch
+
+def _batches_state(batch_sampler, inflight):
+    """Returns the picklable state of a DataLoader iteration."""
+    return {'batch_sampler': batch_sampler.state_dict(),
+            'inflight': [[int(i) for i in batch] for batch in inflight]}
 
 class _MultiWorkerIter(object):
     """Internal multi-worker iterator for DataLoader."""
     def __init__(self, worker_pool, batchify_fn, batch_sampler, pin_memory=False,
                  pin_device_id=0, worker_fn=_worker_fn, prefetch=0, dataset=None,
-                 data_loader=None, timeout=120):
+                 data_loader=None, timeout=120, shm_ring=None, pending=None, pin_pool=None):
         self._worker_pool = worker_pool
         self._batchify_fn = batchify_fn
         self._batch_sampler = batch_sampler
         self._data_buffer = {}
+        self._sent_batches = {}
         self._rcvd_idx = 0
         self._sent_idx = 0
-        self._iter = iter(self._batch_sampler)
+        self._pending = pending if pending is not None else collections.deque()
+        self._iter = _pending_then_sampled(self._pending, self._batch_sampler)
         self._worker_fn = worker_fn
         self._pin_memory = pin_memory
         self._pin_device_id = pin_device_id
+        self._pin_pool = pin_pool
         self._dataset = dataset
         self._data_loader = data_loader
         self._timeout = timeout
+        self._shm_ring = shm_ring
+        self._shm_slots = {}
         # pre-fetch
         for _ in range(prefetch):
             self._push_next()
@@ -449,32 +731,73 @@ class _MultiWorkerIter(object):
     def __len__(self):
         return len(self._batch_sampler)
 
+    def __del__(self):
+        if self._shm_ring is not None:
+            # slots of batches that are still in flight can only be reused
+            # once the workers have finished writing into them
+            for idx, slot in self._shm_slots.items():
+                self._shm_ring.defer(self._data_buffer[idx], slot)
+            self._shm_slots = {}
+
     def _push_next(self):
         """Assign next batch workload to workers."""
         r = next(self._iter, None)
         if r is None:
             return
-        async_ret = self._worker_pool.apply_async(
-            self._worker_fn, (r, self._batchify_fn, self._dataset))
+        if self._shm_ring is not None:
+            slot = self._shm_ring.acquire()
+            async_ret = self._worker_pool.apply_async(
+                self._worker_fn, (r, self._batchify_fn, self._dataset, slot))
+            if slot is not None:
+                self._shm_slots[self._sent_idx] = slot
+        else:
+            async_ret = self._worker_pool.apply_async(
+                self._worker_fn, (r, self._batchify_fn, self._dataset))
         self._data_buffer[self._sent_idx] = async_ret
+        self._sent_batches[self._sent_idx] = r
         self._sent_idx += 1
 
+    def _get_shm_batch(self, ret):
+        """Fetch a batch sent through the shared memory ring."""
+        slot = self._shm_slots.pop(self._rcvd_idx, None)
+        try:
+            written, data = ret.get(self._timeout)
+        except multiprocessing.context.TimeoutError:
+            if slot is not None:
+                self._shm_ring.defer(ret, slot)
+            raise
+        except Exception:
+            if slot is not None:
+                self._shm_ring.release(slot)
+            raise
+        if written is None:
+            if slot is not None:
+                self._shm_ring.release(slot)
+            return pickle.loads(data)
+        guard = _SharedMemorySlotGuard(self._shm_ring, slot)
+        return _shm_read_batch(data, self._shm_ring.buffers[slot], guard)
+
     def __next__(self):
         self._push_next()
         if self._rcvd_idx == self._sent_idx:
             assert not self._data_buffer, "Data buffer should be empty at this moment"
+            if self._data_loader is not None:
+                self._data_loader._finished = True
             raise StopIteration
 
         assert self._rcvd_idx < self._sent_idx, "rcvd_idx must be smaller than sent_idx"
         assert self._rcvd_idx in self._data_buffer, "fatal error with _push_next, rcvd_idx missing"
         ret = self._data_buffer.pop(self._rcvd_idx)
+        self._sent_batches.pop(self._rcvd_idx)
         try:
-            if self._dataset is None:
+            if self._shm_ring is not None:
+                batch = self._get_shm_batch(ret)
+            elif self._dataset is None:
                 batch = pickle.loads(ret.get(self._timeout))
             else:
                 batch = ret.get(self._timeout)
             if self._pin_memory:
-                batch = _as_in_context(batch, context.cpu_pinned(self._pin_device_id))
+                batch = _pin_batch(batch, self._pin_device_id, self._pin_pool)
             batch = batch[0] if len(batch) == 1 else batch
             self._rcvd_idx += 1
             return batch
@@ -498,21 +821,163 @@ class _MultiWorkerIter(object):
     def __iter__(self):
         return self
 
+    def state_dict(self):
+        """Returns the state of the batch sampler and the batches that are sent to
+        workers but not yet returned, so that the iteration can be resumed with
+        `DataLoader.load_state_dict` without re-reading consumed batches."""
+        inflight = [self._sent_batches[i] for i in sorted(self._sent_batches)]
+        return _batches_state(self._batch_sampler, inflight + list(self._pending))
+
+
+def _iterable_worker_loop(dataset, worker_id, num_workers, batch_size, last_batch,
+                          batchify_fn, data_queue, active_shape, active_array,
+                          stop_event=None):
+    """Worker loop assembling batches from a shard of an IterableDataset.
+
+    Worker processes are terminated by the main process, while worker threads
+    return once `stop_event` is set."""
+    set_np(shape=active_shape, array=active_array)
+
+    def put(item):
+        """Put item into the bounded queue, returns False if the worker is stopped."""
+        if stop_event is None:
+            data_queue.put(item)
+            return True
+        while not stop_event.is_set():
+            try:
+                data_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        batch = []
+        for sample in dataset.shard(num_workers, worker_id):
+            batch.append(sample)
+            if len(batch) == batch_size:
+                if not put((batchify_fn(batch), None)):
+                    return
+                batch = []
+        if batch and last_batch == 'keep':
+            if not put((batchify_fn(batch), None)):
+                return
+    except Exception:  # pylint: disable=broad-except
+        put((None, traceback.format_exc()))
+        return
+    put((None, None))
+
+
+class _IterableMultiWorkerIter(object):
+    """Internal multi-worker iterator for DataLoader over an IterableDataset.
+
+    Each worker assembles batches from a disjoint shard of the stream and puts them
+    into its own bounded queue, which are read in round-robin order."""
+    def __init__(self, dataset, num_workers, batch_size, last_batch, batchify_fn,
+                 pin_memory=False, pin_device_id=0, prefetch=0, thread_pool=False,
+                 timeout=120, pin_pool=None):
+        self._num_workers = num_workers
+        self._pin_memory = pin_memory
+        self._pin_device_id = pin_device_id
+        self._pin_pool = pin_pool
+        self._thread_pool = thread_pool
+        self._timeout = timeout
+        self._shutdown = False
+        maxsize = max(1, prefetch // num_workers)
+        if thread_pool:
+            self._stop_event = threading.Event()
+            self._queues = [queue.Queue(maxsize) for _ in range(num_workers)]
+        else:
+            self._stop_event = None
+            self._queues = [Queue(maxsize) for _ in range(num_workers)]
+        self._workers = []
+        for worker_id in range(num_workers):
+            args = (dataset, worker_id, num_workers, batch_size, last_batch, batchify_fn,
+                    self._queues[worker_id], is_np_shape(), is_np_array())
+            if thread_pool:
+                worker = threading.Thread(target=_iterable_worker_loop,
+                                          args=args + (self._stop_event,))
+            else:
+                worker = multiprocessing.Process(target=_iterable_worker_loop, args=args)
+            worker.daemon = True
+            self._workers.append(worker)
+        if not thread_pool:
+            # set ignore keyboard interupt signal before forking processes
+            original_sigint_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+        for worker in self._workers:
+            worker.start()
+        if not thread_pool:
+            # resume keyboard interupt signal in main process
+            signal.signal(signal.SIGINT, original_sigint_handler)
+        self._active = list(range(num_workers))
+        self._next_worker = 0
+
+    def __del__(self):
+        self.shutdown()
+
+    def __next__(self):
+        while self._active:
+            pos = self._next_worker % len(self._active)
+            worker_id = self._active[pos]
+            try:
+                batch, err = self._queues[worker_id].get(timeout=self._timeout)
+            except queue.Empty:
+                self.shutdown()
+                raise RuntimeError('Worker timed out after {} seconds. This might be caused by '
+                                   'slow reading or transform of the stream.'.format(self._timeout))
+            if err is not None:
+                self.shutdown()
+                raise RuntimeError('Worker {} failed with:\n{}'.format(worker_id, err))
+            if batch is None:
+                # this shard is exhausted
+                self._active.pop(pos)
+                self._next_worker = pos
+                continue
+            self._next_worker = pos + 1
+            if self._pin_memory:
+                batch = _pin_batch(batch, self._pin_device_id, self._pin_pool)
+            return batch
+        self.shutdown()
+        raise StopIteration
+
+    def next(self):
+        return self.__next__()
+
+    def __iter__(self):
+        return self
+
+    def shutdown(self):
+        """Shutdown internal workers."""
+        if self._shutdown:
+            return
+        self._shutdown = True
+        self._active = []
+        if self._thread_pool:
+            self._stop_event.set()
+        else:
+            for w in self._workers:
+                if w.is_alive():
+                    w.terminate()
+
 
 class DataLoader(object):
     """Loads data from a dataset and returns mini-batches of data.
 
     Parameters
     ----------
-    dataset : Dataset
+    dataset : Dataset or IterableDataset
         Source dataset. Note that numpy and mxnet arrays can be directly used
-        as a Dataset.
+        as a Dataset. If an `IterableDataset` is given, batches are assembled
+        incrementally from the stream and each worker reads a disjoint shard
+        ``dataset.shard(num_workers, worker_id)``. Batches of the workers are
+        returned in round-robin order.
     batch_size : int
         Size of mini-batch.
     shuffle : bool
-        Whether to shuffle the samples.
+        Whether to shuffle the samples. Not supported for `IterableDataset`.
     sampler : Sampler
         The sampler to use. Either specify sampler or shuffle, not both.
+        Not supported for `IterableDataset`.
     last_batch : {'keep', 'discard', 'rollover'}
         How to handle the last batch if batch_size does not evenly divide
         `len(dataset)`.
@@ -520,9 +985,13 @@ class DataLoader(object):
         keep - A batch with less samples than previous batches is returned.
         discard - The last batch is discarded if its incomplete.
         rollover - The remaining samples are rolled over to the next epoch.
+
+        For `IterableDataset`, only 'keep' and 'discard' are supported and they
+        apply to the last batch of each worker's shard.
     batch_sampler : Sampler
         A sampler that returns mini-batches. Do not specify batch_size,
         shuffle, sampler, and last_batch if batch_sampler is specified.
+        Not supported for `IterableDataset`.
     batchify_fn : callable
         Callback function to allow users to specify how to merge samples
         into a batch. Defaults to `default_batchify_fn`::
@@ -553,6 +1022,7 @@ class DataLoader(object):
         but will consume more shared_memory. Using smaller number may forfeit the purpose of using
         multiple worker processes, try reduce `num_workers` in this case.
         By default it defaults to `num_workers * 2`.
+        For `IterableDataset`, it bounds the total number of batches queued by workers.
     thread_pool : bool, default False
         If ``True``, use threading pool instead of multiprocessing pool. Using threadpool
         can avoid shared memory usage. If `DataLoader` is more IO bounded or GIL is not a killing
@@ -562,19 +1032,63 @@ class DataLoader(object):
         unless you are experiencing timeout and you know it's due to slow data loading.
         Sometimes full `shared_memory` will cause all workers to hang and causes timeout. In these
         cases please reduce `num_workers` or increase system `shared_memory` size instead.
+    shm_slots : int, default 0
+        The number of preallocated shared memory slots used to transfer batches from
+        worker processes. If `shm_slots` > 0, workers write batchified NDArrays directly
+        into a free slot and the main process maps it without unpickling or copying.
+        A slot is recycled once all arrays of the batch are released. Batches that do
+        not fit into a slot, or that are produced while all slots are in use, fall back
+        to the pickle transport. It should be larger than `prefetch`.
+        Only effective if `num_workers` > 0 and `thread_pool` is ``False``.
+    shm_slot_size : int, default 64 * 1024 * 1024
+        The size in bytes of each shared memory slot if `shm_slots` > 0.
+    pin_buffers : int, default 0
+        The number of reusable pinned staging buffers kept for each batch shape and
+        dtype if `pin_memory` is ``True``. If 0, new pinned memory is allocated for
+        every batch. Otherwise, a buffer is reused once the returned batch is released,
+        so arrays sliced from a batch must not be used after the batch is released.
+        Without worker processes, batches are stacked directly into the buffers.
+        The numbers of allocations and copied bytes are reported by the
+        ``pinned_allocations`` and ``pinned_copy_bytes`` profiler counters.
+    batch_transform : callable, default None
+        A transform applied to the data of each batch after `batchify_fn`, e.g. a
+        `Compose` of batch transforms from `gluon.data.vision.transforms`. If the
+        batch is a list, such as data and label, only the first element is
+        transformed. Collating fixed-size raw samples first and transforming the
+        whole batch at once is much faster than transforming samples one by one.
     """
     def __init__(self, dataset, batch_size=None, shuffle=False, sampler=None,
                  last_batch=None, batch_sampler=None, batchify_fn=None,
                  num_workers=0, pin_memory=False, pin_device_id=0,
-                 prefetch=None, thread_pool=False, timeout=120):
+                 prefetch=None, thread_pool=False, timeout=120,
+                 shm_slots=0, shm_slot_size=64 * 1024 * 1024, pin_buffers=0,
+                 batch_transform=None):
         self._dataset = dataset
         self._pin_memory = pin_memory
         self._pin_device_id = pin_device_id
+        assert pin_buffers >= 0, "pin_buffers must be non-negative, given {}".format(pin_buffers)
+        self._pin_pool = None
+        if pin_memory and pin_buffers > 0:
+            self._pin_pool = _PinnedMemoryPool(pin_device_id, pin_buffers)
         self._thread_pool = thread_pool
         self._timeout = timeout
         assert timeout > 0, "timeout must be positive, given {}".format(timeout)
+        assert shm_slots >= 0, "shm_slots must be non-negative, given {}".format(shm_slots)
+        self._iterable = isinstance(dataset, IterableDataset)
 
-        if batch_sampler is None:
+        if self._iterable:
+            if batch_size is None:
+                raise ValueError("batch_size must be specified for IterableDataset")
+            if shuffle or sampler is not None or batch_sampler is not None:
+                raise ValueError("shuffle, sampler and batch_sampler must not be " \
+                                 "specified for IterableDataset")
+            last_batch = last_batch if last_batch else 'keep'
+            if last_batch not in ('keep', 'discard'):
+                raise ValueError("last_batch must be one of 'keep' or 'discard' for " \
+                                 "IterableDataset, but got %s"%last_batch)
+            self._batch_size = batch_size
+            self._last_batch = last_batch
+        elif batch_sampler is None:
             if batch_size is None:
                 raise ValueError("batch_size must be specified unless " \
                                  "batch_sampler is specified")
@@ -596,49 +1110,161 @@ class DataLoader(object):
         self._batch_sampler = batch_sampler
         self._num_workers = num_workers if num_workers >= 0 else 0
         self._worker_pool = None
+        self._shm_ring = None
+        # batches in flight restored by load_state_dict, consumed by the next iteration
+        self._pending = collections.deque()
+        self._active_iter = None
+        # whether the last iteration returned all of its batches
+        self._finished = False
         self._prefetch = max(0, int(prefetch) if prefetch is not None else 2 * self._num_workers)
-        if self._num_workers > 0:
+        if self._num_workers > 0 and not self._iterable:
+            # workers of an IterableDataset are started for each epoch instead
             if self._thread_pool:
                 self._worker_pool = ThreadPool(self._num_workers,
                                                initializer=_thread_worker_initializer,
                                                initargs=(is_np_shape(), is_np_array()))
             else:
+                if shm_slots > 0:
+                    self._shm_ring = _SharedMemoryRing(shm_slots, shm_slot_size)
                 # set ignore keyboard interupt signal before forking processes
                 original_sigint_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
                 self._worker_pool = multiprocessing.Pool(
                     self._num_workers, initializer=_worker_initializer,
-                    initargs=[self._dataset, is_np_shape(), is_np_array()])
+                    initargs=[self._dataset, is_np_shape(), is_np_array(),
+                              self._shm_ring.buffers if self._shm_ring else None])
                 # resume keyboard interupt signal in main process
                 signal.signal(signal.SIGINT, original_sigint_handler)
         if batchify_fn is None:
-            if num_workers > 0:
+            if self._pin_pool is not None and batch_transform is None and \
+                    (self._num_workers == 0 or self._thread_pool):
+                # batches stay in process and are stacked into pinned memory
+                self._batchify_fn = _PinnedBatchify(self._pin_pool)
+            elif self._shm_ring is not None or (self._thread_pool and self._iterable) or \
+                    batch_transform is not None:
+                # batches are copied into the ring, stay in process or are transformed
+                # into new arrays, no need to stack into shared memory
+                self._batchify_fn = default_batchify_fn
+            elif num_workers > 0:
                 self._batchify_fn = default_mp_batchify_fn
             else:
                 self._batchify_fn = default_batchify_fn
         else:
             self._batchify_fn = batchify_fn
+        if batch_transform is not None:
+            self._batchify_fn = _BatchTransformBatchify(self._batchify_fn, batch_transform)
 
     def __iter__(self):
+        if self._iterable:
+            return self._iterable_iter()
+
+        self._active_iter = None
+        self._finished = False
         if self._num_workers == 0:
             def same_process_iter():
-                for batch in self._batch_sampler:
-                    ret = self._batchify_fn([self._dataset[idx] for idx in batch])
+                for batch in _pending_then_sampled(self._pending, self._batch_sampler):
+                    ret = self._batchify_fn(_get_batch(self._dataset, batch))
                     if self._pin_memory:
-                        ret = _as_in_context(ret, context.cpu_pinned(self._pin_device_id))
+                        ret = _pin_batch(ret, self._pin_device_id, self._pin_pool)
                     yield ret
+                self._finished = True
             return same_process_iter()
 
         # multi-worker
-        return _MultiWorkerIter(self._worker_pool, self._batchify_fn, self._batch_sampler,
-                                pin_memory=self._pin_memory, pin_device_id=self._pin_device_id,
-                                worker_fn=_thread_worker_fn if self._thread_pool else _worker_fn,
-                                prefetch=self._prefetch,
-                                dataset=self._dataset if self._thread_pool else None,
-                                data_loader=self, timeout=self._timeout)
+        if self._thread_pool:
+            worker_fn = _thread_worker_fn
+        elif self._shm_ring is not None:
+            worker_fn = _shm_worker_fn
+        else:
+            worker_fn = _worker_fn
+        it = _MultiWorkerIter(self._worker_pool, self._batchify_fn, self._batch_sampler,
+                              pin_memory=self._pin_memory, pin_device_id=self._pin_device_id,
+                              worker_fn=worker_fn, prefetch=self._prefetch,
+                              dataset=self._dataset if self._thread_pool else None,
+                              data_loader=self, timeout=self._timeout,
+                              shm_ring=self._shm_ring, pending=self._pending,
+                              pin_pool=self._pin_pool)
+        self._active_iter = weakref.ref(it)
+        return it
+
+    def _iterable_iter(self):
+        """Returns an iterator assembling batches incrementally from an IterableDataset."""
+        if self._num_workers > 0:
+            return _IterableMultiWorkerIter(self._dataset, self._num_workers, self._batch_size,
+                                            self._last_batch, self._batchify_fn,
+                                            pin_memory=self._pin_memory,
+                                            pin_device_id=self._pin_device_id,
+                                            prefetch=self._prefetch,
+                                            thread_pool=self._thread_pool,
+                                            timeout=self._timeout, pin_pool=self._pin_pool)
+
+        def same_process_iter():
+            batch = []
+            for sample in self._dataset:
+                batch.append(sample)
+                if len(batch) == self._batch_size:
+                    ret = self._batchify_fn(batch)
+                    batch = []
+                    if self._pin_memory:
+                        ret = _pin_batch(ret, self._pin_device_id, self._pin_pool)
+                    yield ret
+            if batch and self._last_batch == 'keep':
+                ret = self._batchify_fn(batch)
+                if self._pin_memory:
+                    ret = _pin_batch(ret, self._pin_device_id, self._pin_pool)
+                yield ret
+        return same_process_iter()
 
     def __len__(self):
+        if self._iterable:
+            raise TypeError("DataLoader over an IterableDataset has no length")
         return len(self._batch_sampler)
 
+    def state_dict(self):
+        """Returns the state of the current iteration as a picklable dict.
+
+        The state contains the batch sampler state, i.e. the seed, epoch and cursor
+        of the built-in samplers, and the batches that were sampled but not yet
+        returned because they are prefetched by workers. Restoring it with
+        `load_state_dict` makes the next iteration continue exactly after the last
+        returned batch, or start a new epoch if the saved iteration had returned all
+        of its batches. Samplers without state restart from the beginning.
+
+        Returns
+        -------
+        dict
+            The state of the DataLoader.
+        """
+        if self._iterable:
+            raise NotImplementedError("state_dict is not supported for IterableDataset")
+        it = self._active_iter() if self._active_iter is not None else None
+        if it is not None:
+            state = it.state_dict()
+        else:
+            state = _batches_state(self._batch_sampler, self._pending)
+        state['finished'] = self._finished
+        return state
+
+    def load_state_dict(self, state):
+        """Restores the state returned by `state_dict`. The next iteration over
+        the DataLoader resumes where the saved iteration stopped.
+
+        Parameters
+        ----------
+        state : dict
+            The state of the DataLoader.
+        """
+        if self._iterable:
+            raise NotImplementedError("load_state_dict is not supported for IterableDataset")
+        self._batch_sampler.load_state_dict(state['batch_sampler'])
+        self._pending.clear()
+        self._pending.extend(state['inflight'])
+        self._finished = False
+        if state.get('finished', False):
+            # the saved iteration returned all of its batches: the restored sampler
+            # has nothing left of its epoch, and the next iteration starts a new one
+            for _ in self._batch_sampler:
+                pass
+
     def __del__(self):
         if self._worker_pool:
             # manually terminate due to a bug that pool is not automatically terminated
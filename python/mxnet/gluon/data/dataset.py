@@ -19,9 +19,18 @@
 # pylint: disable=
 """Dataset container."""
 __all__ = ['Dataset', 'SimpleDataset', 'ArrayDataset',
-           'RecordFileDataset']
+           'RecordFileDataset', 'IterableDataset', 'CachedDataset']
 
 import os
+import itertools
+import threading
+import collections
+import ctypes
+import mmap
+import multiprocessing
+import pickle
+
+import numpy as np
 
 from ... import recordio, ndarray
 
@@ -40,6 +49,14 @@ class Dataset(object):
     def __len__(self):
         raise NotImplementedError
 
+    def _getitems(self, indices):
+        """Returns the samples at a batch of indices.
+
+        `DataLoader` calls this when a whole batch of indices is known. Datasets
+        that can read multiple samples more efficiently than one at a time
+        override it."""
+        return [self[idx] for idx in indices]
+
     def filter(self, fn):
         """Returns a new dataset with samples filtered by the
         filter function `fn`.
@@ -185,6 +202,139 @@ class Dataset(object):
         """
         return self.transform(_TransformFirstClosure(fn), lazy)
 
+    def cache(self, max_items=1024, spill_dir=None):
+        """Returns a new dataset that caches the samples of this dataset.
+
+        Only deterministic transformations should be cached. Apply random
+        augmentations after caching, e.g.::
+
+            dataset.transform_first(decode).cache().transform_first(random_crop)
+
+        Parameters
+        ----------
+        max_items : int, default 1024
+            The maximum number of samples kept in memory.
+        spill_dir : str, default None
+            If specified, samples are also stored in a memory-mapped store in
+            this directory, which is shared by all `DataLoader` workers.
+
+        Returns
+        -------
+        CachedDataset
+            The cached dataset.
+        """
+        return CachedDataset(self, max_items, spill_dir)
+
+
+class IterableDataset(object):
+    """Abstract class for datasets that are read as a stream.
+
+    Subclasses need to override `__iter__`, which yields the samples in order.
+    Unlike `Dataset`, random access with `__getitem__` and `__len__` is not required,
+    which makes it suitable for sources without random access such as sharded logs.
+
+    When used with a multi-worker `DataLoader`, each worker iterates over
+    ``dataset.shard(num_workers, worker_id)``. The default `shard` strides over the
+    stream; override it if the source can be partitioned more efficiently,
+    e.g. by assigning whole files to each shard.
+    """
+    def __iter__(self):
+        raise NotImplementedError
+
+    def shard(self, num_shards, index):
+        """Returns a new dataset that yields only 1/num_shards of this dataset.
+
+        Shards with different `index` are disjoint and together cover the whole stream.
+
+        Parameters
+        ----------
+        num_shards : int
+            A integer representing the number of data shards.
+        index : int
+            A integer representing the index of the current shard.
+
+        Returns
+        -------
+        IterableDataset
+            The result dataset.
+        """
+        assert index < num_shards, 'Shard index of out bound: %d out of %d'%(index, num_shards)
+        assert num_shards > 0, 'Number of shards must be greater than 0'
+        assert index >= 0, 'Index must be non-negative'
+        if num_shards == 1:
+            return self
+        return _ShardedIterableDataset(self, num_shards, index)
+
+    def transform(self, fn):
+        """Returns a new dataset with each sample transformed by the
+        transformer function `fn`. Samples are transformed on demand.
+
+        Parameters
+        ----------
+        fn : callable
+            A transformer function that takes a sample as input and
+            returns the transformed sample.
+
+        Returns
+        -------
+        IterableDataset
+            The transformed dataset.
+        """
+        return _LazyTransformIterableDataset(self, fn)
+
+    def transform_first(self, fn):
+        """Returns a new dataset with the first element of each sample
+        transformed by the transformer function `fn`.
+
+        Parameters
+        ----------
+        fn : callable
+            A transformer function that takes the first elemtn of a sample
+            as input and returns the transformed element.
+
+        Returns
+        -------
+        IterableDataset
+            The transformed dataset.
+        """
+        return self.transform(_TransformFirstClosure(fn))
+
+
+class _ShardedIterableDataset(IterableDataset):
+    """Iterable dataset striding over every num_shards-th sample."""
+    def __init__(self, dataset, num_shards, index):
+        self._dataset = dataset
+        self._num_shards = num_shards
+        self._index = index
+
+    def __iter__(self):
+        return itertools.islice(iter(self._dataset), self._index, None, self._num_shards)
+
+
+class _LazyTransformIterableDataset(IterableDataset):
+    """Lazily transformed iterable dataset."""
+    def __init__(self, data, fn):
+        self._data = data
+        self._fn = fn
+
+    def shard(self, num_shards, index):
+        # shard the source so that custom sharding of the source is preserved
+        return _LazyTransformIterableDataset(self._data.shard(num_shards, index), self._fn)
+
+    def __iter__(self):
+        for item in self._data:
+            if isinstance(item, tuple):
+                yield self._fn(*item)
+            else:
+                yield self._fn(item)
+
+
+def _get_batch(dataset, indices):
+    """Returns the samples at a batch of indices of any dataset-like object."""
+    if isinstance(dataset, Dataset):
+        return dataset._getitems(indices)
+    return [dataset[idx] for idx in indices]
+
 
 class SimpleDataset(Dataset):
     """Simple Dataset wrapper for lists and arrays.
@@ -214,7 +364,12 @@ class _LazyTransformDataset(Dataset):
         return len(self._data)
 
     def __getitem__(self, idx):
-        item = self._data[idx]
+        return self._apply(self._data[idx])
+
+    def _getitems(self, indices):
+        return [self._apply(item) for item in _get_batch(self._data, indices)]
+
+    def _apply(self, item):
         if isinstance(item, tuple):
             return self._fn(*item)
         return self._fn(item)
@@ -255,6 +410,9 @@ class _SampledDataset(Dataset):
     def __getitem__(self, idx):
         return self._dataset[self._indices[idx]]
 
+    def _getitems(self, indices):
+        return _get_batch(self._dataset, [self._indices[idx] for idx in indices])
+
 class ArrayDataset(Dataset):
     """A dataset that combines multiple dataset-like objects, e.g.
     Datasets, lists, arrays, etc.
@@ -288,6 +446,201 @@ class ArrayDataset(Dataset):
         return self._length
 
 
+class CachedDataset(Dataset):
+    """A dataset that caches the samples of another dataset, e.g. decoded images.
+
+    Samples are kept in an in-memory LRU cache of at most `max_items` samples.
+    If `spill_dir` is specified, every sample is also written to an on-disk store
+    that is memory-mapped for reading, so samples evicted from memory are not
+    recomputed. With a multi-worker `DataLoader`, each worker has its own
+    in-memory cache while the on-disk store is shared by all workers.
+
+    Only deterministic samples should be cached. Apply random augmentations to
+    the cached dataset with `transform` instead, see `Dataset.cache`.
+
+    The hit counters and the lock of the on-disk store are shared with worker
+    processes when the processes are created, as `DataLoader` does with both the
+    fork and the spawn start methods. A `CachedDataset` cannot be pickled otherwise.
+
+    Parameters
+    ----------
+    dataset : Dataset
+        The dataset to cache.
+    max_items : int, default 1024
+        The maximum number of samples kept in memory. 0 disables the in-memory cache.
+    spill_dir : str, default None
+        Directory of the on-disk store. It is created if it does not exist, and
+        any store already in it is overwritten.
+    """
+    _HITS, _SPILL_HITS, _MISSES = range(3)
+
+    def __init__(self, dataset, max_items=1024, spill_dir=None):
+        assert max_items >= 0, "max_items must be non-negative, given {}".format(max_items)
+        self._dataset = dataset
+        self._max_items = max_items
+        self._spill_dir = spill_dir
+        # shared with worker processes so that counters cover all workers
+        self._counters = multiprocessing.Array(ctypes.c_int64, 3)
+        if spill_dir is not None:
+            spill_dir = os.path.expanduser(spill_dir)
+            if not os.path.isdir(spill_dir):
+                os.makedirs(spill_dir)
+            for fname in os.listdir(spill_dir):
+                if fname.startswith('data-') and fname.endswith('.bin'):
+                    os.remove(os.path.join(spill_dir, fname))
+            self._spill_dir = spill_dir
+            # serializes the publication of entries by all worker processes
+            self._spill_lock = multiprocessing.Lock()
+            # each entry is (writer pid, offset, length), pid 0 marks a missing entry
+            index = np.memmap(self._index_file, dtype=np.int64, mode='w+',
+                              shape=(max(len(dataset), 1), 3))
+            index.flush()
+            del index
+        self._reset()
+
+    def _reset(self):
+        """Initializes the per-process state."""
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._items = collections.OrderedDict()
+        self._index = None
+        self._writer = None
+        self._readers = {}
+
+    @property
+    def _index_file(self):
+        return os.path.join(self._spill_dir, 'index.bin')
+
+    def _data_file(self, pid):
+        return os.path.join(self._spill_dir, 'data-%d.bin'%pid)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in ('_lock', '_items', '_index', '_writer', '_readers'):
+            del state[key]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+
+    def __len__(self):
+        return len(self._dataset)
+
+    def __getitem__(self, idx):
+        item = self._lookup(idx)
+        if item is not None:
+            return item[0]
+        self._count(self._MISSES)
+        item = self._dataset[idx]
+        self._insert(idx, item)
+        return item
+
+    def _getitems(self, indices):
+        items = [self._lookup(idx) for idx in indices]
+        missing = [i for i, item in enumerate(items) if item is None]
+        if missing:
+            self._count(self._MISSES, len(missing))
+            for i, item in zip(missing, _get_batch(self._dataset, [indices[i] for i in missing])):
+                self._insert(indices[i], item)
+                items[i] = (item,)
+        return [item[0] for item in items]
+
+    def _count(self, counter, num=1):
+        with self._counters.get_lock():
+            self._counters[counter] += num
+
+    def _lookup(self, idx):
+        """Returns a 1-tuple with the cached sample, or None if it is not cached."""
+        if os.getpid() != self._pid:
+            self._reset()
+        with self._lock:
+            if idx in self._items:
+                self._items[idx] = self._items.pop(idx)
+                self._count(self._HITS)
+                return (self._items[idx],)
+        if self._spill_dir is None:
+            return None
+        data = self._read_spill(idx)
+        if data is None:
+            return None
+        self._count(self._SPILL_HITS)
+        item = pickle.loads(data)
+        self._insert(idx, item, spill=False)
+        return (item,)
+
+    def _insert(self, idx, item, spill=True):
+        if self._max_items > 0:
+            with self._lock:
+                self._items[idx] = item
+                while len(self._items) > self._max_items:
+                    self._items.popitem(last=False)
+        if spill and self._spill_dir is not None:
+            self._write_spill(idx, pickle.dumps(item, pickle.HIGHEST_PROTOCOL))
+
+    def _open_index(self):
+        if self._index is None:
+            self._index = np.memmap(self._index_file, dtype=np.int64, mode='r+',
+                                    shape=(max(len(self._dataset), 1), 3))
+        return self._index
+
+    def _read_spill(self, idx):
+        pid, offset, length = self._open_index()[idx]
+        if pid == 0:
+            return None
+        with self._lock:
+            reader = self._readers.get(pid)
+            if reader is None or len(reader) < offset + length:
+                if reader is not None:
+                    reader.close()
+                with open(self._data_file(pid), 'rb') as fin:
+                    reader = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+                self._readers[pid] = reader
+            return reader[offset:offset + length]
+
+    def _write_spill(self, idx, data):
+        index = self._open_index()
+        with self._lock:
+            if index[idx, 0] != 0:
+                # already stored by another worker
+                return
+            if self._writer is None:
+                self._writer = open(self._data_file(self._pid), 'ab')
+            self._writer.seek(0, os.SEEK_END)
+            offset = self._writer.tell()
+            self._writer.write(data)
+            self._writer.flush()
+            with self._spill_lock:
+                if index[idx, 0] != 0:
+                    # another worker stored it in the meantime
+                    return
+                # publish the location before the pid, which marks the entry as valid
+                index[idx, 1] = offset
+                index[idx, 2] = len(data)
+                index[idx, 0] = self._pid
+
+    @property
+    def hits(self):
+        """Number of samples returned from the in-memory cache."""
+        return self._counters[self._HITS]
+
+    @property
+    def spill_hits(self):
+        """Number of samples returned from the on-disk store."""
+        return self._counters[self._SPILL_HITS]
+
+    @property
+    def misses(self):
+        """Number of samples read from the underlying dataset."""
+        return self._counters[self._MISSES]
+
+    def reset_stats(self):
+        """Resets the hit and miss counters."""
+        with self._counters.get_lock():
+            for i in range(len(self._counters)):
+                self._counters[i] = 0
+
+
 class RecordFileDataset(Dataset):
     """A dataset wrapping over a RecordIO (.rec) file.
 
@@ -306,6 +659,9 @@ class RecordFileDataset(Dataset):
     def __getitem__(self, idx):
         return self._record.read_idx(self._record.keys[idx])
 
+    def _getitems(self, indices):
+        return self._record.read_batch([self._record.keys[idx] for idx in indices])
+
     def __len__(self):
         return len(self._record.keys)
 
@@ -18,7 +18,8 @@
 # coding: utf-8
 # pylint: disable=
 """Dataset sampler."""
-__all__ = ['Sampler', 'SequentialSampler', 'RandomSampler', 'FilterSampler', 'BatchSampler']
+__all__ = ['Sampler', 'SequentialSampler', 'RandomSampler', 'FilterSampler', 'BatchSampler',
+           'BucketBatchSampler']
 
 import numpy as np
 
@@ -26,7 +27,8 @@ class Sampler(object):
     """Base class for samplers.
 
     All samplers should subclass `Sampler` and define `__iter__` and `__len__`
-    methods.
+    methods. Samplers that support resuming an epoch also override
+    `state_dict` and `load_state_dict`.
     """
     def __iter__(self):
         raise NotImplementedError
@@ -34,8 +36,75 @@ class Sampler(object):
     def __len__(self):
         raise NotImplementedError
 
+    def state_dict(self):
+        """Returns the state of the sampler as a picklable dict.
 
-class SequentialSampler(Sampler):
+        Stateless samplers return an empty dict and restart from the
+        beginning when iterated again."""
+        return {}
+
+    def load_state_dict(self, state):
+        """Restores the state returned by `state_dict`. The next iteration
+        continues from where the saved iteration stopped.
+
+        Parameters
+        ----------
+        state : dict
+            The state of the sampler.
+        """
+
+
+class _CursorSampler(Sampler):
+    """Base class for samplers that iterate over a per-epoch index order
+    and keep a cursor for resuming an epoch.
+
+    Every iterator keeps its own position, so that several iterators can be
+    alive at the same time. The cursor only records the position of the
+    iterator that advanced last, for `state_dict`."""
+    def __init__(self, length):
+        self._length = length
+        self._epoch = 0
+        self._cursor = 0
+        self._fresh = True
+        self._resume = False
+
+    def _indices(self):
+        """Returns the index order of the current epoch."""
+        raise NotImplementedError
+
+    def __iter__(self):
+        if self._resume:
+            # the saved iteration continues, which is empty if it sampled the whole epoch
+            self._resume = False
+        else:
+            if not self._fresh:
+                self._epoch += 1
+            self._fresh = False
+            self._cursor = 0
+        indices = self._indices() if self._cursor < self._length else None
+        return self._iter_from_cursor(indices, self._cursor)
+
+    def _iter_from_cursor(self, indices, cursor):
+        while cursor < self._length:
+            idx = indices[cursor]
+            cursor += 1
+            self._cursor = cursor
+            yield idx
+
+    def __len__(self):
+        return self._length
+
+    def state_dict(self):
+        return {'epoch': self._epoch, 'cursor': self._cursor}
+
+    def load_state_dict(self, state):
+        self._epoch = state['epoch']
+        self._cursor = state['cursor']
+        self._fresh = False
+        self._resume = True
+
+
+class SequentialSampler(_CursorSampler):
     """Samples elements from [start, start+length) sequentially.
 
     Parameters
@@ -46,33 +115,43 @@ class SequentialSampler(Sampler):
         The start of the sequence index.
     """
     def __init__(self, length, start=0):
-        self._length = length
+        super(SequentialSampler, self).__init__(length)
         self._start = start
 
-    def __iter__(self):
-        return iter(range(self._start, self._start + self._length))
+    def _indices(self):
+        return range(self._start, self._start + self._length)
 
-    def __len__(self):
-        return self._length
 
-class RandomSampler(Sampler):
+class RandomSampler(_CursorSampler):
     """Samples elements from [0, length) randomly without replacement.
 
+    The permutation of each epoch is determined by `seed` and the epoch number,
+    so that an epoch can be resumed exactly with `load_state_dict`.
+
     Parameters
     ----------
     length : int
         Length of the sequence.
+    seed : int, default None
+        The random seed. If None, it is drawn from `numpy.random`.
     """
-    def __init__(self, length):
-        self._length = length
+    def __init__(self, length, seed=None):
+        super(RandomSampler, self).__init__(length)
+        if seed is None:
+            seed = np.random.randint(0, 2**31 - 1)
+        self._seed = seed
 
-    def __iter__(self):
-        indices = np.arange(self._length)
-        np.random.shuffle(indices)
-        return iter(indices)
+    def _indices(self):
+        return np.random.RandomState([self._seed, self._epoch]).permutation(self._length)
 
-    def __len__(self):
-        return self._length
+    def state_dict(self):
+        state = super(RandomSampler, self).state_dict()
+        state['seed'] = self._seed
+        return state
+
+    def load_state_dict(self, state):
+        super(RandomSampler, self).load_state_dict(state)
+        self._seed = state['seed']
 
 class FilterSampler(Sampler):
     """Samples elements from a Dataset for which `fn` returns True.
@@ -149,6 +228,14 @@ class BatchSampler(Sampler):
                     "last_batch must be one of 'keep', 'discard', or 'rollover', " \
                     "but got %s"%self._last_batch)
 
+    def state_dict(self):
+        return {'sampler': self._sampler.state_dict(),
+                'prev': [int(i) for i in self._prev]}
+
+    def load_state_dict(self, state):
+        self._sampler.load_state_dict(state['sampler'])
+        self._prev = list(state['prev'])
+
     def __len__(self):
         if self._last_batch == 'keep':
             return (len(self._sampler) + self._batch_size - 1) // self._batch_size
@@ -159,3 +246,119 @@ class BatchSampler(Sampler):
         raise ValueError(
             "last_batch must be one of 'keep', 'discard', or 'rollover', " \
             "but got %s"%self._last_batch)
+
+
+class BucketBatchSampler(_CursorSampler):
+    """Groups samples of similar length into buckets and returns mini-batches
+    sampled within a bucket, which reduces padding of variable-length sequences.
+
+    Samples are assigned to the smallest bucket whose key is not smaller than their
+    length. Every epoch, samples are shuffled within each bucket and the batches
+    of all buckets are shuffled together. The order of an epoch is determined by
+    `seed` and the epoch number, and can be resumed with `load_state_dict`.
+    It can be passed to `DataLoader` as `batch_sampler`.
+
+    Parameters
+    ----------
+    lengths : list of int
+        The length of each sample in the dataset.
+    batch_size : int, default None
+        Maximum number of samples in a mini-batch.
+    max_tokens : int, default None
+        Maximum number of tokens in a mini-batch, counting the padded length, i.e.
+        the bucket key, for each sample. At least one of `batch_size` and `max_tokens`
+        must be specified. If both are given, both limits apply.
+    num_buckets : int, default 10
+        The number of buckets with evenly spaced keys between the minimum and
+        maximum length. Ignored if `bucket_keys` is given.
+    bucket_keys : list of int, default None
+        The upper bounds of the sample lengths in each bucket. Samples longer than
+        the largest key are assigned to a bucket keyed by the maximum length.
+    shuffle : bool, default True
+        Whether to shuffle samples within buckets and batches across buckets.
+    last_batch : {'keep', 'discard'}
+        Specifies how the last batch of each bucket is handled if it is incomplete.
+        If 'keep', it is returned with fewer samples. If 'discard', it is dropped.
+    seed : int, default None
+        The random seed. If None, it is drawn from `numpy.random`.
+
+    Examples
+    --------
+    >>> lengths = [3, 9, 4, 8, 2, 10]
+    >>> sampler = gluon.data.BucketBatchSampler(lengths, batch_size=2, bucket_keys=[5, 10],
+    ...                                         shuffle=False)
+    >>> list(sampler)
+    [[0, 2], [4], [1, 3], [5]]
+    """
+    def __init__(self, lengths, batch_size=None, max_tokens=None, num_buckets=10,
+                 bucket_keys=None, shuffle=True, last_batch='keep', seed=None):
+        if batch_size is None and max_tokens is None:
+            raise ValueError("At least one of batch_size and max_tokens must be specified")
+        if last_batch not in ('keep', 'discard'):
+            raise ValueError("last_batch must be one of 'keep' or 'discard', "
+                             "but got %s"%last_batch)
+        lengths = np.asarray(lengths, dtype=np.int64).reshape(-1)
+        if bucket_keys is None:
+            assert num_buckets > 0, "num_buckets must be positive, given {}".format(num_buckets)
+            if lengths.size == 0:
+                bucket_keys = [0]
+            else:
+                bucket_keys = np.ceil(np.linspace(lengths.min(), lengths.max(),
+                                                  num_buckets + 1)[1:]).astype(np.int64)
+        bucket_keys = sorted(set(int(k) for k in bucket_keys))
+        if lengths.size and lengths.max() > bucket_keys[-1]:
+            bucket_keys.append(int(lengths.max()))
+        bucket_ids = np.searchsorted(bucket_keys, lengths, side='left')
+        self._bucket_keys = bucket_keys
+        self._buckets = [np.nonzero(bucket_ids == i)[0] for i in range(len(bucket_keys))]
+        self._batch_sizes = []
+        for key in bucket_keys:
+            size = batch_size if batch_size is not None else np.iinfo(np.int64).max
+            if max_tokens is not None:
+                size = min(size, max(1, max_tokens // max(key, 1)))
+            self._batch_sizes.append(int(size))
+        self._shuffle = shuffle
+        self._last_batch = last_batch
+        if seed is None:
+            seed = np.random.randint(0, 2**31 - 1)
+        self._seed = seed
+        if last_batch == 'keep':
+            length = sum((len(b) + s - 1) // s for b, s in zip(self._buckets, self._batch_sizes))
+        else:
+            length = sum(len(b) // s for b, s in zip(self._buckets, self._batch_sizes))
+        super(BucketBatchSampler, self).__init__(length)
+
+    @property
+    def bucket_keys(self):
+        """The upper bound of sample lengths of each bucket."""
+        return list(self._bucket_keys)
+
+    @property
+    def bucket_batch_sizes(self):
+        """The maximum number of samples in a batch of each bucket."""
+        return list(self._batch_sizes)
+
+    def _indices(self):
+        """Returns the batches of the current epoch."""
+        rng = np.random.RandomState([self._seed, self._epoch])
+        batches = []
+        for bucket, size in zip(self._buckets, self._batch_sizes):
+            if self._shuffle:
+                bucket = rng.permutation(bucket)
+            for start in range(0, len(bucket), size):
+                batch = bucket[start:start + size]
+                if len(batch) < size and self._last_batch == 'discard':
+                    continue
+                batches.append([int(i) for i in batch])
+        if self._shuffle:
+            batches = [batches[i] for i in rng.permutation(len(batches))]
+        return batches
+
+    def state_dict(self):
+        state = super(BucketBatchSampler, self).state_dict()
+        state['seed'] = self._seed
+        return state
+
+    def load_state_dict(self, state):
+        super(BucketBatchSampler, self).load_state_dict(state)
+        self._seed = state['seed']
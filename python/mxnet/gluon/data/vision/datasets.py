@@ -254,7 +254,13 @@ class ImageRecordDataset(dataset.RecordFileDataset):
         self._transform = transform
 
     def __getitem__(self, idx):
-        record = super(ImageRecordDataset, self).__getitem__(idx)
+        return self._decode(super(ImageRecordDataset, self).__getitem__(idx))
+
+    def _getitems(self, indices):
+        records = super(ImageRecordDataset, self)._getitems(indices)
+        return [self._decode(record) for record in records]
+
+    def _decode(self, record):
         header, img = recordio.unpack(record)
         if self._transform is not None:
             return self._transform(image.imdecode(img, self._flag), header.label)
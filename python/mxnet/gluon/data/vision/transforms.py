@@ -19,9 +19,12 @@
 # pylint: disable= arguments-differ
 "Image transforms."
 
+import numpy as np
+
 from ...block import Block, HybridBlock
 from ...nn import Sequential, HybridSequential
 from .... import image
+from .... import ndarray as nd
 from ....base import numeric_types
 from ....util import is_np_array
 
@@ -585,3 +588,176 @@ class RandomLighting(HybridBlock):
         if is_np_array():
             F = F.npx
         return F.image.random_lighting(x, self._alpha)
+
+
+class BatchRandomResizedCrop(Block):
+    """Crop each image of a batch with random scale and aspect ratio, then
+    resize it to the specified size.
+
+    Crop parameters are drawn independently for each image, like
+    `RandomResizedCrop`, and the whole batch is cropped and resized with a
+    single bilinear sampling op. If no valid crop is found for an image after
+    10 attempts, the whole image is used.
+
+    Parameters
+    ----------
+    size : int or tuple of (W, H)
+        Size of the final output.
+    scale : tuple of two floats
+        If scale is `(min_area, max_area)`, the cropped image's area will
+        range from min_area to max_area of the original image's area
+    ratio : tuple of two floats
+        Range of aspect ratio of the cropped image before resizing.
+
+
+    Inputs:
+        - **data**: input tensor with (N x C x Hi x Wi) shape and float dtype.
+
+    Outputs:
+        - **out**: output tensor with (N x C x H x W) shape.
+    """
+    def __init__(self, size, scale=(0.08, 1.0), ratio=(3.0/4.0, 4.0/3.0)):
+        super(BatchRandomResizedCrop, self).__init__()
+        if isinstance(size, numeric_types):
+            size = (size, size)
+        self._size = size
+        self._scale = scale
+        self._ratio = ratio
+
+    def forward(self, x):
+        n, _, h, w = x.shape
+        attempts = 10
+        area = np.random.uniform(self._scale[0], self._scale[1], (n, attempts)) * h * w
+        log_ratio = np.random.uniform(np.log(self._ratio[0]), np.log(self._ratio[1]),
+                                      (n, attempts))
+        new_w = np.round(np.sqrt(area * np.exp(log_ratio)))
+        new_h = np.round(np.sqrt(area / np.exp(log_ratio)))
+        valid = (new_w <= w) & (new_h <= h) & (new_w > 0) & (new_h > 0)
+        first = np.argmax(valid, axis=1)
+        found = valid[np.arange(n), first]
+        new_w = np.where(found, new_w[np.arange(n), first], w)
+        new_h = np.where(found, new_h[np.arange(n), first], h)
+        x0 = np.floor(np.random.uniform(0, 1, n) * (w - new_w + 1))
+        y0 = np.floor(np.random.uniform(0, 1, n) * (h - new_h + 1))
+        # affine transforms from output to input normalized coordinates
+        theta = np.zeros((n, 6), dtype=np.float32)
+        theta[:, 0] = (new_w - 1) / max(w - 1, 1)
+        theta[:, 2] = (2 * x0 + new_w - 1) / max(w - 1, 1) - 1
+        theta[:, 4] = (new_h - 1) / max(h - 1, 1)
+        theta[:, 5] = (2 * y0 + new_h - 1) / max(h - 1, 1) - 1
+        theta = nd.array(theta, ctx=x.context, dtype=x.dtype)
+        grid = nd.GridGenerator(theta, transform_type='affine',
+                                target_shape=(self._size[1], self._size[0]))
+        return nd.BilinearSampler(x, grid)
+
+
+class BatchRandomFlipLeftRight(Block):
+    """Randomly flip each image of a batch left to right with a probability of 0.5.
+
+
+    Inputs:
+        - **data**: input tensor with (N x C x H x W) shape.
+
+    Outputs:
+        - **out**: output tensor with same shape as `data`.
+    """
+    def forward(self, x):
+        flip = nd.random.uniform(shape=(x.shape[0],), ctx=x.context) < 0.5
+        return nd.where(flip, nd.flip(x, axis=3), x)
+
+
+class BatchRandomFlipTopBottom(Block):
+    """Randomly flip each image of a batch top to bottom with a probability of 0.5.
+
+
+    Inputs:
+        - **data**: input tensor with (N x C x H x W) shape.
+
+    Outputs:
+        - **out**: output tensor with same shape as `data`.
+    """
+    def forward(self, x):
+        flip = nd.random.uniform(shape=(x.shape[0],), ctx=x.context) < 0.5
+        return nd.where(flip, nd.flip(x, axis=2), x)
+
+
+_GRAY_COEF = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+# RGB to YIQ color space, in which hue is a rotation of the IQ plane
+_YIQ = np.array([[0.299, 0.587, 0.114],
+                 [0.596, -0.274, -0.322],
+                 [0.211, -0.523, 0.312]], dtype=np.float32)
+_IYIQ = np.linalg.inv(_YIQ).astype(np.float32)
+
+
+class BatchRandomColorJitter(Block):
+    """Randomly jitters the brightness, contrast, saturation, and hue
+    of each image of a batch.
+
+    The factors are drawn independently for each image and each adjustment is
+    applied to the whole batch with broadcast ops. Unlike `RandomColorJitter`,
+    the adjustments are applied in a fixed order: brightness, contrast,
+    saturation and hue.
+
+    Parameters
+    ----------
+    brightness : float
+        How much to jitter brightness. brightness factor is randomly
+        chosen from `[max(0, 1 - brightness), 1 + brightness]`.
+    contrast : float
+        How much to jitter contrast. contrast factor is randomly
+        chosen from `[max(0, 1 - contrast), 1 + contrast]`.
+    saturation : float
+        How much to jitter saturation. saturation factor is randomly
+        chosen from `[max(0, 1 - saturation), 1 + saturation]`.
+    hue : float
+        How much to jitter hue. The hue is rotated by a fraction of a full
+        turn randomly chosen from `[-hue, hue]`.
+
+
+    Inputs:
+        - **data**: input tensor with (N x 3 x H x W) shape and float dtype.
+
+    Outputs:
+        - **out**: output tensor with same shape as `data`.
+    """
+    def __init__(self, brightness=0, contrast=0, saturation=0, hue=0):
+        super(BatchRandomColorJitter, self).__init__()
+        self._brightness = brightness
+        self._contrast = contrast
+        self._saturation = saturation
+        self._hue = hue
+
+    def _factor(self, x, jitter):
+        return nd.random.uniform(max(0, 1 - jitter), 1 + jitter, shape=(x.shape[0], 1, 1, 1),
+                                 ctx=x.context, dtype=x.dtype)
+
+    def _gray(self, x):
+        coef = nd.array(_GRAY_COEF.reshape(1, 3, 1, 1), ctx=x.context, dtype=x.dtype)
+        return nd.sum(nd.broadcast_mul(x, coef), axis=1, keepdims=True)
+
+    def forward(self, x):
+        if self._brightness > 0:
+            x = nd.broadcast_mul(x, self._factor(x, self._brightness))
+        if self._contrast > 0:
+            alpha = self._factor(x, self._contrast)
+            mean = nd.mean(self._gray(x), axis=(1, 2, 3), keepdims=True)
+            x = nd.broadcast_add(nd.broadcast_mul(x, alpha), mean * (1 - alpha))
+        if self._saturation > 0:
+            alpha = self._factor(x, self._saturation)
+            x = nd.broadcast_add(nd.broadcast_mul(x, alpha),
+                                 nd.broadcast_mul(self._gray(x), 1 - alpha))
+        if self._hue > 0:
+            n = x.shape[0]
+            theta = nd.random.uniform(-self._hue, self._hue, shape=(n, 1, 1),
+                                      ctx=x.context, dtype=x.dtype) * (2 * np.pi)
+            # rotation of the IQ plane expanded as constant + cos * b + sin * c
+            const = np.outer(_IYIQ[:, 0], _YIQ[0])
+            cos_coef = np.outer(_IYIQ[:, 1], _YIQ[1]) + np.outer(_IYIQ[:, 2], _YIQ[2])
+            sin_coef = np.outer(_IYIQ[:, 2], _YIQ[1]) - np.outer(_IYIQ[:, 1], _YIQ[2])
+            coefs = [nd.array(c.reshape(1, 3, 3), ctx=x.context, dtype=x.dtype)
+                     for c in (const, cos_coef, sin_coef)]
+            mat = nd.broadcast_add(coefs[0], nd.broadcast_add(
+                nd.broadcast_mul(nd.cos(theta), coefs[1]),
+                nd.broadcast_mul(nd.sin(theta), coefs[2])))
+            x = nd.batch_dot(mat, x.reshape((n, 3, -1))).reshape(x.shape)
+        return x
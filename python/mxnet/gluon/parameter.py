@@ -103,6 +103,11 @@ class Parameter(object):
     wd_mult : float
         Local weight decay multiplier for this Parameter.
     """
+    # Incremented whenever the arrays of any Parameter are replaced, e.g. by
+    # (re)initialization, reset_ctx or cast, so that the arrays can be cached
+    # by the callers (see HybridBlock._call_cached_op).
+    _data_version = 0
+
     def __init__(self, name, grad_req='write', shape=None, dtype=mx_real_t,
                  lr_mult=1.0, wd_mult=1.0, init=None, allow_deferred_init=False,
                  differentiable=True, stype='default', grad_stype='default'):
@@ -154,6 +159,7 @@ class Parameter(object):
         if req == 'null' and self._grad is not None:
             self._grad = None
             self._data = [i.detach() for i in self._data]
+            Parameter._data_version += 1
         elif self._data is not None:
             self._init_grad()
 
@@ -357,6 +363,7 @@ class Parameter(object):
             dev_list[ctx.device_id] = i
 
         self._data = [data.copyto(ctx) for ctx in self._ctx_list]
+        Parameter._data_version += 1
         self._init_grad()
 
     def _init_grad(self):
@@ -445,6 +452,7 @@ class Parameter(object):
                           stacklevel=2)
             return
         self._data = self._grad = None
+        Parameter._data_version += 1
 
         if ctx is None:
             ctx = [context.current_context()]
@@ -641,6 +649,7 @@ class Parameter(object):
             return
         with autograd.pause():
             self._data = [i.astype(dtype) for i in self._data]
+            Parameter._data_version += 1
             if self._grad is None:
                 return
             self._grad = [i.astype(dtype) for i in self._grad]
@@ -20,9 +20,88 @@
 """Parameter optimizer."""
 __all__ = ['Trainer']
 
+import functools
+import pickle
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+import numpy as np
+
+from .. import engine
 from .. import optimizer as opt
+from .. import ndarray as nd
+from ..context import cpu
 from ..model import _create_kvstore, _create_sparse_kvstore
 from .parameter import ParameterDict, Parameter
+from .utils import _global_norm, _scale_by_global_norm
+
+
+# number of kvstore calls the reductions of one batch are split into by priority
+_NUM_PRIORITY_TIERS = 4
+
+
+def _flatten_states(state):
+    """Returns the NDArrays of an optimizer state in a flat list."""
+    if isinstance(state, nd.NDArray):
+        return [state]
+    if isinstance(state, (list, tuple)):
+        return [arr for s in state for arr in _flatten_states(s)]
+    return []
+
+
+def _master_weight(optimizer, state):
+    """Returns the float32 master copy in the optimizer state of a float16 weight
+    updated with `multi_precision`."""
+    # SGD and NAG keep the master copy last, the generic Optimizer wrapper first
+    return state[-1] if isinstance(optimizer, (opt.SGD, opt.NAG)) else state[0]
+
+
+class _GradBucket(object):
+    """Flat gradient buffers of a group of Parameters with the same dtype,
+    which are reduced with a single kvstore key."""
+    def __init__(self, key, dtype):
+        self.key = key
+        self.dtype = dtype
+        self.indices = []
+        self.shapes = []
+        self.offsets = []
+        self.size = 0
+        self.buffers = []
+        self.views = []
+
+    @property
+    def nbytes(self):
+        return self.size * np.dtype(self.dtype).itemsize
+
+    @property
+    def priority(self):
+        # parameters used first in the next forward pass are reduced first
+        return -min(self.indices)
+
+    def add(self, idx, shape, size):
+        self.indices.append(idx)
+        self.shapes.append(shape)
+        self.offsets.append(self.size)
+        self.size += size
+
+    def allocate(self, contexts):
+        self.buffers = [nd.zeros((self.size,), ctx=ctx, dtype=self.dtype) for ctx in contexts]
+        self.views = [[buf[offset:offset + int(np.prod(shape))].reshape(shape)
+                       for offset, shape in zip(self.offsets, self.shapes)]
+                      for buf in self.buffers]
+
+    def pack(self, params):
+        for c, buf in enumerate(self.buffers):
+            grads = [params[i].list_grad()[c].as_nd_ndarray().reshape((-1,))
+                     for i in self.indices]
+            nd.concat(*grads, dim=0, out=buf)
+
+    def unpack(self, params):
+        for c, views in enumerate(self.views):
+            for i, view in zip(self.indices, views):
+                view.copyto(params[i].list_grad()[c].as_nd_ndarray())
 
 class Trainer(object):
     """Applies an `Optimizer` on a set of Parameters. Trainer should
@@ -62,6 +141,56 @@ class Trainer(object):
         Whether to perform parameter updates on kvstore. If None, then trainer will choose the more
         suitable option depending on the type of kvstore. If the `update_on_kvstore` argument is
         provided, environment variable `MXNET_UPDATE_ON_KVSTORE` will be ignored.
+    grad_bucket_size : int, default 0
+        If positive, dense gradients are packed into contiguous buckets of at most
+        `grad_bucket_size` bytes, which are reduced with one kvstore key each and
+        unpacked afterwards. This reduces the per-key overhead for models with many
+        small parameters. Buckets are filled in the order gradients are computed by
+        backward, i.e. from the last parameter to the first. Only effective if
+        parameters are updated locally, which becomes the default if
+        `update_on_kvstore` is not specified.
+    clip_global_norm : float, default None
+        If set, the reduced gradients are rescaled so that their global 2-norm is at
+        most `clip_global_norm` before each update, like calling
+        :func:`mxnet.gluon.utils.clip_global_norm` between `allreduce_grads()` and
+        `update()`. The norm is computed with fused operators on every device and is
+        never copied to the host. Requires parameters to be updated locally, which
+        becomes the default if `update_on_kvstore` is not specified.
+    shard_optimizer_state : bool, default False
+        If True, every Parameter is assigned to one of the contexts, balanced by size.
+        Only that context receives the reduced gradient, keeps the optimizer state of the
+        Parameter and applies its update; the updated weight is then copied to the other
+        contexts. This divides the optimizer state memory by the number of contexts.
+        Only supported on a single machine with parameters updated locally, which
+        becomes the default if `update_on_kvstore` is not specified.
+    accumulate_steps : int, default 1
+        Number of `step()` calls whose gradients are accumulated before one update.
+        If larger than 1, dense Parameters with ``grad_req='write'`` are switched to
+        ``grad_req='add'``; the first ``accumulate_steps - 1`` calls to `step()` only
+        record the batch size, and the last one reduces the accumulated gradients,
+        normalizes them by the sum of the batch sizes, updates the Parameters and
+        zeroes the gradients. Calling `allreduce_grads()` and `update()` once per
+        micro-batch instead of `step()` behaves the same way.
+    overlap_grad_comm : bool, default False
+        If True, `step()` and `allreduce_grads()` register a completion callback on
+        the gradients of every bucket and Parameter with :func:`mxnet.engine.on_complete`
+        and start the kvstore push of each one as soon as backward has written its
+        gradients, instead of in Parameter order. Gradients of the last layers are
+        then in flight while backward is still computing the first ones. The calling
+        thread waits until all gradients have been written.
+    local_sgd_steps : int, default None
+        If set, enables local SGD: gradients are not reduced, every context updates
+        its own copy of the Parameters with its own gradient, normalized by its share
+        ``batch_size / len(contexts)`` of the batch, and the copies of all contexts and
+        workers are averaged through the kvstore every `local_sgd_steps` updates. This
+        reduces the communication by a factor of `local_sgd_steps`. The period can be
+        changed during training with the `local_sgd_steps` property. Requires a
+        synchronous kvstore and parameters updated locally, which becomes the default
+        if `update_on_kvstore` is not specified.
+    local_sgd_average_states : bool, default False
+        If True, local SGD also averages the optimizer states, e.g. momentum, together
+        with the Parameters. The float32 master copy of float16 weights updated with
+        `multi_precision` is always averaged.
 
     Properties
     ----------
@@ -70,7 +199,9 @@ class Trainer(object):
         optimizer, its learning rate can be accessed as optimizer.learning_rate.
     """
     def __init__(self, params, optimizer, optimizer_params=None, kvstore='device',
-                 compression_params=None, update_on_kvstore=None):
+                 compression_params=None, update_on_kvstore=None, grad_bucket_size=0,
+                 clip_global_norm=None, shard_optimizer_state=False, accumulate_steps=1,
+                 overlap_grad_comm=False, local_sgd_steps=None, local_sgd_average_states=False):
         if isinstance(params, (dict, ParameterDict)):
             params = list(params.values())
         if not isinstance(params, (list, tuple)):
@@ -95,6 +226,42 @@ class Trainer(object):
             if param._grad_stype != 'default':
                 self._contains_sparse_grad = True
         self._compression_params = compression_params
+        assert grad_bucket_size >= 0, \
+            "grad_bucket_size must be non-negative, given {}".format(grad_bucket_size)
+        self._grad_bucket_size = grad_bucket_size
+        self._grad_buckets = None
+        assert clip_global_norm is None or clip_global_norm > 0, \
+            "clip_global_norm must be positive, given {}".format(clip_global_norm)
+        self._clip_global_norm = clip_global_norm
+        self._shard_optimizer_state = shard_optimizer_state
+        self._shard_owners = None
+        self._overlap_grad_comm = overlap_grad_comm
+        self._num_priority_tiers = _NUM_PRIORITY_TIERS
+        if local_sgd_steps is not None:
+            if self._contains_sparse_weight or self._contains_sparse_grad:
+                raise ValueError("local_sgd_steps is not supported for Parameters "
+                                 "with sparse weights or gradients.")
+            if shard_optimizer_state:
+                raise ValueError("local_sgd_steps cannot be combined with "
+                                 "shard_optimizer_state.")
+        assert local_sgd_steps is None or local_sgd_steps >= 1, \
+            "local_sgd_steps must be at least 1, given {}".format(local_sgd_steps)
+        self._local_sgd_steps = local_sgd_steps
+        self._local_sgd_average_states = local_sgd_average_states
+        self._local_steps = 0
+        self._local_sgd_state_keys = set()
+        assert accumulate_steps >= 1, \
+            "accumulate_steps must be at least 1, given {}".format(accumulate_steps)
+        self._accumulate_steps = accumulate_steps
+        self._accumulated_steps = 0
+        self._accumulated_batch_size = 0
+        if accumulate_steps > 1:
+            if self._contains_sparse_grad:
+                raise ValueError("accumulate_steps is not supported for Parameters "
+                                 "with sparse gradients.")
+            for param in self._params:
+                if param.grad_req == 'write':
+                    param.grad_req = 'add'
         self._contexts = self._check_contexts()
         optimizer_params = optimizer_params if optimizer_params else {}
         self._init_optimizer(optimizer, optimizer_params)
@@ -164,6 +331,8 @@ class Trainer(object):
         self._kvstore = None
         self._distributed = None
         self._update_on_kvstore = None
+        self._grad_buckets = None
+        self._local_sgd_state_keys = set()
         self._params_to_init = [param for param in self._params]
 
     def _init_kvstore(self):
@@ -229,9 +398,36 @@ class Trainer(object):
                 if config['update_on_kvstore'] is False:
                     raise ValueError("Please set update_on_kvstore=True "
                                      "when training in async mode.")
+            elif self._grad_bucket_size > 0 or self._clip_global_norm is not None or \
+                    self._shard_optimizer_state or self._local_sgd_steps is not None:
+                # buckets are reduced on kvstore and parameters are updated locally,
+                # clipping and sharding need the reduced gradients before the update,
+                # local SGD only averages the locally updated parameters
+                update_on_kvstore = False
             if config['update_on_kvstore'] is not None:
                 update_on_kvstore = config['update_on_kvstore']
 
+        if kvstore and update_on_kvstore and self._clip_global_norm is not None:
+            raise ValueError("clip_global_norm requires parameters to be updated locally. "
+                             "Please set update_on_kvstore=False.")
+        if self._shard_optimizer_state:
+            if self._distributed:
+                raise ValueError("shard_optimizer_state is not supported with "
+                                 "distributed kvstore.")
+            if kvstore and update_on_kvstore:
+                raise ValueError("shard_optimizer_state requires parameters to be updated "
+                                 "locally. Please set update_on_kvstore=False.")
+            if not kvstore and len(self._contexts) > 1:
+                raise ValueError("shard_optimizer_state requires a kvstore to reduce the "
+                                 "gradients of multiple contexts.")
+        if self._local_sgd_steps is not None and kvstore:
+            if 'async' in kvstore.type:
+                raise ValueError("local_sgd_steps is not supported with asynchronous "
+                                 "kvstore.")
+            if update_on_kvstore:
+                raise ValueError("local_sgd_steps requires parameters to be updated "
+                                 "locally. Please set update_on_kvstore=False.")
+
         # set grad compression and optimizers
         if kvstore:
             if self._compression_params:
@@ -255,6 +451,20 @@ class Trainer(object):
 
         return self._optimizer.learning_rate
 
+    @property
+    def local_sgd_steps(self):
+        """Number of local updates between two averagings of the Parameters, or None
+        if local SGD is disabled."""
+        return self._local_sgd_steps
+
+    @local_sgd_steps.setter
+    def local_sgd_steps(self, steps):
+        if self._local_sgd_steps is None:
+            raise ValueError("local SGD has to be enabled with the local_sgd_steps "
+                             "argument of Trainer.")
+        assert steps >= 1, "local_sgd_steps must be at least 1, given {}".format(steps)
+        self._local_sgd_steps = steps
+
     @property
     def optimizer(self):
         if isinstance(self._optimizer, opt.Optimizer):
@@ -320,16 +530,52 @@ class Trainer(object):
             If true, ignores Parameters with stale gradient (gradient that has not
             been updated by `backward` after last step) and skip update.
         """
-        rescale_grad = self._scale / batch_size
-        self._check_and_rescale_grad(rescale_grad)
+        batch_size = self._accumulate(batch_size)
+        if batch_size is None:
+            return
+        self._rescale_grad(batch_size)
 
         if not self._kv_initialized:
             self._init_kvstore()
         if self._params_to_init:
             self._init_params()
 
-        self._allreduce_grads()
+        if self._local_sgd_steps is None:
+            self._allreduce_grads()
+        self._apply_update(ignore_stale_grad)
+
+    def _accumulate(self, batch_size):
+        """Counts one micro-step of gradient accumulation. Returns the total batch size
+        of the accumulated micro-steps if the Parameters are to be updated now, and
+        None otherwise."""
+        if self._accumulate_steps == 1:
+            return batch_size
+        self._accumulated_steps += 1
+        self._accumulated_batch_size += batch_size
+        if self._accumulated_steps < self._accumulate_steps:
+            return None
+        batch_size = self._accumulated_batch_size
+        self._accumulated_steps = 0
+        self._accumulated_batch_size = 0
+        return batch_size
+
+    def _rescale_grad(self, batch_size):
+        rescale_grad = self._scale / batch_size
+        if self._local_sgd_steps is not None:
+            # every context only normalizes by its own share of the batch
+            rescale_grad *= len(self._contexts)
+        self._check_and_rescale_grad(rescale_grad)
+
+    def _apply_update(self, ignore_stale_grad):
+        """Updates the Parameters and zeroes the accumulated gradients."""
         self._update(ignore_stale_grad)
+        if self._local_sgd_steps is not None:
+            self._local_sgd_step()
+
+        if self._accumulate_steps > 1:
+            for param in self._params:
+                if param.grad_req != 'null':
+                    param.zero_grad()
 
     def allreduce_grads(self):
         """For each parameter, reduce the gradients from different contexts.
@@ -341,6 +587,11 @@ class Trainer(object):
         `allreduce_grads()` and then `update()`. However, if you need to get the reduced
         gradients to perform certain transformation, such as in gradient clipping, then
         you may want to manually call `allreduce_grads()` and `update()` separately.
+
+        Gradients are not reduced when local SGD is enabled with `local_sgd_steps`.
+        With `accumulate_steps` larger than 1, gradients are only reduced before the
+        last micro-step, i.e. when the next call to `update()` applies them; earlier
+        calls do nothing.
         """
         if not self._kv_initialized:
             self._init_kvstore()
@@ -351,17 +602,140 @@ class Trainer(object):
                 'is not supported. Try setting `update_on_kvstore` ' \
                 'to False when creating trainer.'
 
+        if self._accumulated_steps < self._accumulate_steps - 1:
+            return
         self._allreduce_grads()
 
-    def _allreduce_grads(self):
-        if self._kvstore:
-            for i, param in enumerate(self._params):
-                if param.grad_req != 'null':
+    def _init_grad_buckets(self):
+        """Groups dense gradients into buckets of at most `grad_bucket_size` bytes."""
+        buckets = []
+        open_buckets = {}
+        # backward computes the gradients of the last parameters first
+        for i in reversed(range(len(self._params))):
+            param = self._params[i]
+            if param.grad_req == 'null' or param._grad_stype != 'default':
+                continue
+            grad = param.list_grad()[0]
+            if grad.size == 0:
+                continue
+            dtype = np.dtype(grad.dtype).name
+            bucket = open_buckets.get(dtype)
+            nbytes = grad.size * np.dtype(dtype).itemsize
+            if bucket is None or bucket.nbytes + nbytes > self._grad_bucket_size:
+                bucket = _GradBucket(len(self._params) + len(buckets), dtype)
+                buckets.append(bucket)
+                open_buckets[dtype] = bucket
+            bucket.add(i, grad.shape, grad.size)
+        for bucket in buckets:
+            bucket.allocate(self._contexts)
+            self._kvstore.init(bucket.key, bucket.buffers[0])
+        self._grad_buckets = buckets
+
+    def _init_shards(self):
+        """Assigns every Parameter to the least loaded context, largest Parameters first."""
+        sizes = [(int(np.prod(param.shape)), i) for i, param in enumerate(self._params)
+                 if param.grad_req != 'null']
+        loads = [0] * len(self._contexts)
+        owners = {}
+        for size, i in sorted(sizes, key=lambda x: (-x[0], x[1])):
+            owner = loads.index(min(loads))
+            owners[i] = owner
+            loads[owner] += size
+        self._shard_owners = owners
 
-                    self._kvstore.push(i, param.list_grad(), priority=-i)
-                    if not self._update_on_kvstore:
-                        self._kvstore.pull(i, param.list_grad(), priority=-i,
-                                           ignore_sparse=self._distributed)
+    def _allreduce_grads(self):
+        if self._kvstore and self._local_sgd_steps is None:
+            buckets = []
+            if self._grad_bucket_size > 0 and not self._update_on_kvstore:
+                if self._grad_buckets is None:
+                    self._init_grad_buckets()
+                buckets = self._grad_buckets
+            bucketed = set(i for bucket in buckets for i in bucket.indices)
+            # every reduction is either a bucket or the index of a single parameter
+            reductions = buckets + [i for i, param in enumerate(self._params)
+                                    if param.grad_req != 'null' and i not in bucketed]
+            batches = self._iter_ready(reductions) if self._overlap_grad_comm \
+                      else [reductions]
+            for batch in batches:
+                self._reduce(batch)
+
+    def _iter_ready(self, reductions):
+        """Yields lists of `reductions` in the order their gradients are written by
+        backward. Every list holds all reductions which became ready since the last one."""
+        ready = queue.Queue()
+        for k, reduction in enumerate(reductions):
+            indices = reduction.indices if isinstance(reduction, _GradBucket) else [reduction]
+            grads = [grad for i in indices for grad in self._params[i].list_grad()]
+            engine.on_complete(grads, functools.partial(ready.put, k))
+        remaining = len(reductions)
+        while remaining:
+            batch = [ready.get()]
+            while len(batch) < remaining:
+                try:
+                    batch.append(ready.get_nowait())
+                except queue.Empty:
+                    break
+            remaining -= len(batch)
+            yield [reductions[k] for k in batch]
+
+    def _reduce(self, reductions):
+        """Reduces buckets and dense gradients with a few batched kvstore calls.
+
+        The reductions are sorted by priority and split into at most
+        `_num_priority_tiers` calls, each scheduled with the priority of its most
+        urgent key, so that the gradients of the first layers are still reduced first."""
+        keys, values, outs, priorities = [], [], [], []
+        buckets = []
+        for reduction in reductions:
+            if isinstance(reduction, _GradBucket):
+                reduction.pack(self._params)
+                buckets.append(reduction)
+                keys.append(reduction.key)
+                values.append(reduction.buffers)
+                outs.append(reduction.buffers)
+                priorities.append(reduction.priority)
+            elif self._params[reduction]._grad_stype != 'default':
+                self._reduce_param(reduction)
+            else:
+                i = reduction
+                grads = self._params[i].list_grad()
+                keys.append(i)
+                values.append(grads)
+                if self._shard_optimizer_state:
+                    # only the owner needs the reduced gradient
+                    if self._shard_owners is None:
+                        self._init_shards()
+                    outs.append(grads[self._shard_owners[i]])
+                else:
+                    outs.append(grads)
+                priorities.append(-i)
+        order = sorted(range(len(keys)), key=lambda k: -priorities[k])
+        num_tiers = min(self._num_priority_tiers, len(order))
+        for t in range(num_tiers):
+            tier = order[t * len(order) // num_tiers:(t + 1) * len(order) // num_tiers]
+            tier_keys = [keys[k] for k in tier]
+            tier_values = [values[k] for k in tier]
+            priority = priorities[tier[0]]
+            if self._update_on_kvstore:
+                self._kvstore.push(tier_keys, tier_values, priority=priority)
+            else:
+                self._kvstore.pushpull(tier_keys, tier_values, out=[outs[k] for k in tier],
+                                       priority=priority)
+        for bucket in buckets:
+            bucket.unpack(self._params)
+
+    def _reduce_param(self, i):
+        """Reduces the sparse gradient of a single Parameter."""
+        param = self._params[i]
+        self._kvstore.push(i, param.list_grad(), priority=-i)
+        if not self._update_on_kvstore:
+            grads = param.list_grad()
+            if self._shard_optimizer_state:
+                if self._shard_owners is None:
+                    self._init_shards()
+                grads = grads[self._shard_owners[i]]
+            self._kvstore.pull(i, grads, priority=-i,
+                               ignore_sparse=self._distributed)
 
     def update(self, batch_size, ignore_stale_grad=False):
         """Makes one step of parameter update.
@@ -393,8 +767,11 @@ class Trainer(object):
                 'is not supported. Try setting `update_on_kvstore` ' \
                 'to False when creating trainer.'
 
-        self._check_and_rescale_grad(self._scale / batch_size)
-        self._update(ignore_stale_grad)
+        batch_size = self._accumulate(batch_size)
+        if batch_size is None:
+            return
+        self._rescale_grad(batch_size)
+        self._apply_update(ignore_stale_grad)
 
     def _update(self, ignore_stale_grad=False):
         updates = [[] for _ in self._updaters]
@@ -422,16 +799,85 @@ class Trainer(object):
                     self._kvstore.pull(i, param.list_data(), priority=-i)
                 continue
 
+            if self._shard_optimizer_state:
+                # only the owner context updates the parameter and keeps its state
+                if self._shard_owners is None:
+                    self._init_shards()
+                owner = self._shard_owners[i]
+                arrays = param.list_data()
+                if not ignore_stale_grad or arrays[owner]._fresh_grad:
+                    updates[owner].append((i, param.list_grad()[owner], arrays[owner]))
+                for arr in arrays:
+                    arr._fresh_grad = False
+                continue
+
             for upd, arr, grad in zip(updates, param.list_data(), param.list_grad()):
                 if not ignore_stale_grad or arr._fresh_grad:
                     upd.append((i, grad, arr))
                     arr._fresh_grad = False
 
         if not (self._kvstore and self._update_on_kvstore):
+            if self._clip_global_norm is not None and self._shard_optimizer_state:
+                # every context only holds the gradients of its own shard
+                grads = [g for upd in updates for _, g, _ in upd]
+                if grads:
+                    total_norm = _global_norm(grads, grads[0].context)
+                    _scale_by_global_norm(grads, total_norm, self._clip_global_norm)
             for updater, upd in zip(self._updaters, updates):
                 if upd:
                     i, w, g = zip(*upd)
+                    if self._clip_global_norm is not None and not self._shard_optimizer_state:
+                        # gradients are identical across devices after allreduce,
+                        # so every device computes the norm of its own copy
+                        total_norm = _global_norm(w, w[0].context)
+                        _scale_by_global_norm(w, total_norm, self._clip_global_norm)
                     updater(i, w, g)
+            if self._shard_optimizer_state:
+                # broadcast the updated weights from their owners
+                for upd in updates:
+                    for i, _, arr in upd:
+                        for other in self._params[i].list_data():
+                            if other is not arr:
+                                arr.copyto(other)
+
+    def _local_sgd_step(self):
+        """Counts a local update and averages the Parameters every `local_sgd_steps`."""
+        self._local_steps += 1
+        if self._local_steps < self._local_sgd_steps:
+            return
+        self._local_steps = 0
+        if not self._kvstore:
+            return
+        num_replicas = len(self._contexts) * self._kvstore.num_workers
+        num_params = len(self._params)
+        for i, param in enumerate(self._params):
+            if param.grad_req == 'null':
+                continue
+            arrays = param.list_data()
+            self._kvstore.pushpull(i, arrays, out=arrays, priority=-i)
+            for arr in arrays:
+                arr /= num_replicas
+            if self._local_sgd_average_states:
+                states = [_flatten_states(updater.states.get(i))
+                          for updater in self._updaters]
+            elif self._optimizer.multi_precision and arrays[0].dtype == np.float16 and \
+                    all(i in updater.states for updater in self._updaters):
+                # the next update recomputes the weight from the float32 master copy,
+                # which therefore has to be averaged as well
+                states = [[_master_weight(self._optimizer, updater.states[i])]
+                          for updater in self._updaters]
+            else:
+                continue
+            # the j-th state array of parameter i is averaged with key (j + 1) * num_params + i
+            for j, state_arrays in enumerate(zip(*states)):
+                key = (j + 1) * num_params + i
+                state_arrays = list(state_arrays)
+                if key not in self._local_sgd_state_keys:
+                    self._kvstore.init(key, state_arrays[0])
+                    self._local_sgd_state_keys.add(key)
+                self._kvstore.pushpull(key, state_arrays, out=state_arrays, priority=-i)
+                for arr in state_arrays:
+                    arr /= num_replicas
 
     def save_states(self, fname):
         """Saves trainer states (e.g. optimizer, momentum) to a file.
@@ -458,6 +904,13 @@ class Trainer(object):
             assert not self._params_to_init, "Cannot save trainer states when some " \
                                              "parameters are not yet initialized in kvstore."
             self._kvstore.save_optimizer_states(fname, dump_optimizer=True)
+        elif self._shard_optimizer_state:
+            # gather the shards of all contexts
+            states = {}
+            for updater in self._updaters:
+                states.update(updater.states)
+            with open(fname, 'wb') as fout:
+                fout.write(pickle.dumps((states, self._optimizer)))
         else:
             with open(fname, 'wb') as fout:
                 fout.write(self._updaters[0].get_states(dump_optimizer=True))
@@ -487,9 +940,69 @@ class Trainer(object):
         else:
             with open(fname, 'rb') as f:
                 states = f.read()
+            self._set_updater_states(states)
+        param_dict = {i: param for i, param in enumerate(self._params)}
+        self._optimizer.param_dict = param_dict
+
+    def _set_updater_states(self, states):
+        """Sets the pickled states of all updaters."""
+        if self._shard_optimizer_state:
+            # every context keeps only the states of the parameters it owns
+            if self._shard_owners is None:
+                self._init_shards()
+            self._updaters[0].set_states(states)
+            all_states = self._updaters[0].states
+            for c, updater in enumerate(self._updaters):
+                updater.optimizer = self._updaters[0].optimizer
+                updater.states = {i: state for i, state in all_states.items()
+                                  if self._shard_owners.get(i) == c}
+                updater.states_synced = dict.fromkeys(updater.states.keys(), False)
+        else:
             for updater in self._updaters:
                 updater.set_states(states)
                 updater.optimizer = self._updaters[0].optimizer
-            self._optimizer = self._updaters[0].optimizer
+        self._optimizer = self._updaters[0].optimizer
+
+    def _snapshot_states(self):
+        """Enqueues copies of the optimizer states into host memory for
+        asynchronous checkpointing.
+
+        Returns a tuple of the copied states and a copy of the optimizer, in the
+        format written by `save_states`, or None if the states are kept by kvstore.
+        """
+        assert self._optimizer is not None
+
+        if not self._kv_initialized:
+            self._init_kvstore()
+        if self._params_to_init:
+            self._init_params()
+
+        if self._update_on_kvstore:
+            return None
+        states = {}
+        for updater in (self._updaters if self._shard_optimizer_state else self._updaters[:1]):
+            states.update(updater.states)
+
+        def _copy(state):
+            if isinstance(state, nd.NDArray):
+                return state.copyto(cpu())
+            if isinstance(state, (tuple, list)):
+                return type(state)(_copy(i) for i in state)
+            return state
+        states = {i: _copy(state) for i, state in states.items()}
+        # the optimizer keeps mutable counters, so snapshot it as well
+        optimizer = pickle.loads(pickle.dumps(self._optimizer))
+        return states, optimizer
+
+    def _load_snapshot(self, states, optimizer):
+        """Loads optimizer states returned by `_snapshot_states`."""
+        if not self._kv_initialized:
+            self._init_kvstore()
+        if self._params_to_init:
+            self._init_params()
+        assert not self._update_on_kvstore, \
+            "Cannot load a states snapshot when states are kept by kvstore."
+
+        self._set_updater_states(pickle.dumps((states, optimizer)))
         param_dict = {i: param for i, param in enumerate(self._params)}
         self._optimizer.param_dict = param_dict
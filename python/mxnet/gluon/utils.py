@@ -127,9 +127,42 @@ def split_and_load(data, ctx_list, batch_axis=0, even_split=True):
     return [i.as_in_context(ctx) for i, ctx in zip(slices, ctx_list)]
 
 
+def _global_norm(arrays, ctx):
+    """Computes the 2-norm of all `arrays` as a float32 NDArray of shape (1,) on `ctx`.
+
+    Dense arrays are reduced with one `multi_sum_sq` call per context and dtype, so that
+    only one partial result per group is copied to `ctx`. No host synchronization happens.
+    """
+    groups = collections.OrderedDict()
+    partials = []
+    for arr in arrays:
+        if arr.stype == 'default':
+            groups.setdefault((arr.context, np.dtype(arr.dtype).name), []).append(arr)
+        else:
+            partials.append(arr.norm().square().astype('float32').as_in_context(ctx))
+    for group in groups.values():
+        sum_sq = ndarray.multi_sum_sq(*group, num_arrays=len(group))
+        partials.append(ndarray.sum(sum_sq).as_in_context(ctx))
+    return ndarray.sqrt(ndarray.add_n(*partials))
+
+
+def _scale_by_global_norm(arrays, total_norm, max_norm):
+    """Rescales `arrays` in place by min(1, max_norm / total_norm) without leaving the device."""
+    scale = ndarray.minimum(max_norm / (total_norm + 1e-8), 1.0)
+    scales = {}
+    for arr in arrays:
+        key = (arr.context, np.dtype(arr.dtype).name)
+        if key not in scales:
+            scales[key] = scale.as_in_context(arr.context).astype(arr.dtype, copy=False)
+        arr *= scales[key]
+
+
 def clip_global_norm(arrays, max_norm, check_isfinite=True):
     """Rescales NDArrays so that the sum of their 2-norm is smaller than `max_norm`.
 
+    The norm is computed and applied on device. Unless `check_isfinite` is True,
+    no call blocks on the result.
+
     Parameters
     ----------
     arrays : list of NDArray
@@ -141,28 +174,18 @@ def clip_global_norm(arrays, max_norm, check_isfinite=True):
     Returns
     -------
     NDArray or float
-      Total norm. Return type is NDArray of shape (1,) if check_isfinite is
+      Total norm. Return type is a float32 NDArray of shape (1,) if check_isfinite is
       False. Otherwise a float is returned.
 
     """
-    def _norm(array):
-        if array.stype == 'default':
-            x = array.reshape((-1,))
-            return ndarray.dot(x, x)
-        return array.norm().square()
     assert len(arrays) > 0
-    ctx = arrays[0].context
-    total_norm = ndarray.add_n(*[_norm(arr).as_in_context(ctx) for arr in arrays])
-    total_norm = ndarray.sqrt(total_norm)
+    total_norm = _global_norm(arrays, arrays[0].context)
     if check_isfinite:
         if not np.isfinite(total_norm.asscalar()):
             warnings.warn(
                 UserWarning('nan or inf is detected. '
                             'Clipping results will be undefined.'), stacklevel=2)
-    scale = max_norm / (total_norm + 1e-8)
-    scale = ndarray.min(ndarray.concat(scale, ndarray.ones(1, ctx=ctx), dim=0))
-    for arr in arrays:
-        arr *= scale.as_in_context(arr.context)
+    _scale_by_global_norm(arrays, total_norm, max_norm)
     if check_isfinite:
         return total_norm.asscalar()
     else:
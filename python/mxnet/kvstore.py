@@ -20,6 +20,7 @@
 from __future__ import absolute_import
 
 from array import array
+from collections import OrderedDict
 import ctypes
 import pickle
 from .ndarray import NDArray
@@ -30,40 +31,55 @@ from .base import NDArrayHandle, KVStoreHandle
 from . import optimizer as opt
 from .profiler import set_kvstore_handle
 
-def _ctype_key_value(keys, vals):
-    """
-    Returns ctype arrays for the key-value args, and the whether string keys are used.
-    For internal use only.
-    """
+# ctype arrays prepared by _ctype_key_value, keyed by the keys and the NDArray handles
+_CTYPE_KEY_VALUE_CACHE = OrderedDict()
+_CTYPE_KEY_VALUE_CACHE_SIZE = 64
+
+def _flatten_key_value(keys, vals, flat_keys, flat_vals):
+    """Appends one key per value to `flat_keys` and the values to `flat_vals`.
+    Returns whether string keys are used."""
     if isinstance(keys, (tuple, list)):
         assert(len(keys) == len(vals))
-        c_keys = []
-        c_vals = []
         use_str_keys = None
         for key, val in zip(keys, vals):
-            c_key_i, c_val_i, str_keys_i = _ctype_key_value(key, val)
-            c_keys += c_key_i
-            c_vals += c_val_i
+            str_keys_i = _flatten_key_value(key, val, flat_keys, flat_vals)
             use_str_keys = str_keys_i if use_str_keys is None else use_str_keys
             assert(use_str_keys == str_keys_i), "inconsistent types of keys detected."
-        c_keys_arr = c_array(ctypes.c_char_p, c_keys) if use_str_keys \
-                     else c_array(ctypes.c_int, c_keys)
-        c_vals_arr = c_array(ctypes.c_void_p, c_vals)
-        return (c_keys_arr, c_vals_arr, use_str_keys)
+        return use_str_keys
 
     assert(isinstance(keys, (int,) + string_types)), \
            "unexpected type for keys: " + str(type(keys))
-    use_str_keys = isinstance(keys, string_types)
     if isinstance(vals, NDArray):
-        c_keys = c_str_array([keys]) if use_str_keys \
-                 else c_array_buf(ctypes.c_int, array('i', [keys]))
-        return (c_keys, c_handle_array([vals]), use_str_keys)
-    else:
-        for value in vals:
-            assert(isinstance(value, NDArray))
-        c_keys = c_str_array([keys] * len(vals)) if use_str_keys \
-                 else c_array_buf(ctypes.c_int, array('i', [keys] * len(vals)))
-        return (c_keys, c_handle_array(vals), use_str_keys)
+        vals = [vals]
+    for value in vals:
+        assert(isinstance(value, NDArray))
+    flat_keys.extend([keys] * len(vals))
+    flat_vals.extend(vals)
+    return isinstance(keys, string_types)
+
+def _ctype_key_value(keys, vals):
+    """
+    Returns ctype arrays for the key-value args, and the whether string keys are used.
+    The arrays are cached, so that repeated calls with the same keys and NDArrays,
+    e.g. by a Trainer in every step, do not rebuild them.
+    For internal use only.
+    """
+    flat_keys = []
+    flat_vals = []
+    use_str_keys = _flatten_key_value(keys, vals, flat_keys, flat_vals)
+    # the arrays only hold the keys and handle addresses, so they can be reused
+    # for any call with equal keys and addresses
+    cache_key = (tuple(flat_keys), tuple(val.handle.value for val in flat_vals))
+    cached = _CTYPE_KEY_VALUE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    c_keys = c_str_array(flat_keys) if use_str_keys \
+             else c_array_buf(ctypes.c_int, array('i', flat_keys))
+    cached = (c_keys, c_handle_array(flat_vals), use_str_keys)
+    _CTYPE_KEY_VALUE_CACHE[cache_key] = cached
+    if len(_CTYPE_KEY_VALUE_CACHE) > _CTYPE_KEY_VALUE_CACHE_SIZE:
+        _CTYPE_KEY_VALUE_CACHE.popitem(last=False)
+    return cached
 
 def _ctype_dict(param_dict):
     """
@@ -488,6 +504,19 @@ class KVStore(object):
         original values is stored at the sender's end as residual and added to the
         gradient in the next iteration.
 
+        1bit Gradient Compression splits the gradient into blocks of 256 values and
+        sends the sign of every value together with the mean absolute value of its
+        block, which is used as the magnitude of all values of the block. This reduces
+        the size of the gradient by a factor of about 28.
+
+        topk Gradient Compression takes a float `ratio` in (0, 0.5). It splits the gradient
+        into blocks of 1024 values and sends only the ``round(ratio * 1024)`` values with
+        the largest magnitude of each block, together with their positions. The size of
+        the gradient is reduced by a factor of ``1 / (2 * ratio)``.
+
+        Both schemes keep a residual like 2bit compression, so that the error made
+        for a key is fed back into its next gradient.
+
         When kvstore is 'local', gradient compression is used to reduce communication
         between multiple devices (gpus). Gradient is quantized on each GPU which
         computed the gradients, then sent to the GPU which merges the gradients. This
@@ -509,6 +538,8 @@ class KVStore(object):
         To completely specify the arguments for 2bit compression, we would need to pass
         a dictionary which includes `threshold` like:
         {'type': '2bit', 'threshold': 0.5}
+        Similarly 1bit compression is selected with {'type': '1bit'} and topk compression
+        with {'type': 'topk', 'ratio': 0.01}.
 
         Parameters
         ----------
@@ -516,7 +547,7 @@ class KVStore(object):
             A dictionary specifying the type and parameters for gradient compression.
             The key `type` in this dictionary is a
             required string argument and specifies the type of gradient compression.
-            Currently `type` can be only `2bit`
+            Currently `type` can be `2bit`, `1bit` or `topk`
             Other keys in this dictionary are optional and specific to the type
             of gradient compression.
         """
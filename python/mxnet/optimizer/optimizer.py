@@ -31,7 +31,8 @@ from ..ndarray import (sgd_update, sgd_mom_update, adam_update, rmsprop_update,
                        mp_sgd_update, mp_sgd_mom_update, square, ftrl_update, ftml_update,
                        signsgd_update, signum_update, nag_mom_update, mp_nag_mom_update,
                        multi_sgd_update, multi_sgd_mom_update, multi_mp_sgd_update,
-                       multi_mp_sgd_mom_update)
+                       multi_mp_sgd_mom_update, multi_adam_update, multi_rmsprop_update,
+                       multi_nag_mom_update, multi_adagrad_update, multi_ftrl_update)
 from ..ndarray import sparse
 from ..random import normal
 from ..util import is_np_array
@@ -45,6 +46,20 @@ __all__ = [
 def _flatten_list(nested_list):
     return [item for sublist in nested_list for item in sublist]
 
+def _as_update_lists(indices, weights, grads, states):
+    """Wraps a single update into lists and checks whether all weights and
+    gradients are dense, i.e. whether a fused multi-tensor update can be used."""
+    if not isinstance(indices, (tuple, list)):
+        indices, weights, grads, states = [indices], [weights], [grads], [states]
+    aggregate = True
+    for weight, grad in zip(weights, grads):
+        assert(isinstance(weight, NDArray))
+        assert(isinstance(grad, NDArray))
+        aggregate = (aggregate and
+                     weight.stype == 'default' and
+                     grad.stype == 'default')
+    return indices, weights, grads, states, aggregate
+
 class Optimizer(object):
     """The base class inherited by all optimizers.
 
@@ -283,6 +298,13 @@ class Optimizer(object):
         state : any obj
             The state returned by `create_state()`.
         """
+        if isinstance(index, (tuple, list)):
+            if self.multi_precision and weight[0].dtype == numpy.float16:
+                for i, w, g, s in zip(index, weight, grad, state):
+                    self.update_multi_precision(i, w, g, s)
+            else:
+                self.update(index, weight, grad, state)
+            return
         if self.multi_precision and weight.dtype == numpy.float16:
             # Wrapper for mixed precision
             weight_master_copy = state[0]
@@ -1053,6 +1075,7 @@ class NAG(Optimizer):
     def __init__(self, momentum=0.0, **kwargs):
         super(NAG, self).__init__(**kwargs)
         self.momentum = momentum
+        self.aggregate_num = int(os.getenv('MXNET_OPTIMIZER_AGGREGATION_SIZE', "4"))
 
     def create_state_multi_precision(self, index, weight):
         weight_master_copy = None
@@ -1072,12 +1095,12 @@ class NAG(Optimizer):
             momentum = zeros(weight.shape, weight.context, dtype=weight.dtype)
         return momentum
 
-    def _update_impl(self, index, weight, grad, state, multi_precision=False):
-        assert(isinstance(weight, NDArray))
-        assert(isinstance(grad, NDArray))
-        self._update_count(index)
-        lr = self._get_lr(index)
-        wd = self._get_wd(index)
+    def _update_impl(self, indices, weights, grads, states, multi_precision=False):
+        indices, weights, grads, states, aggregate = \
+            _as_update_lists(indices, weights, grads, states)
+        self._update_count(indices)
+        lrs = self._get_lrs(indices)
+        wds = self._get_wds(indices)
 
         kwargs = {'rescale_grad': self.rescale_grad}
         if self.momentum > 0:
@@ -1085,25 +1108,38 @@ class NAG(Optimizer):
         if self.clip_gradient:
             kwargs['clip_gradient'] = self.clip_gradient
 
-        if not multi_precision:
-            if state is not None:
-                nag_mom_update(weight, grad, state, out=weight, lr=lr, wd=wd, **kwargs)
+        if aggregate and not multi_precision:
+            if self.momentum > 0:
+                multi_nag_mom_update(*_flatten_list(zip(weights, grads, states)), out=weights,
+                                     num_weights=len(weights), lrs=lrs, wds=wds, **kwargs)
             else:
-                sgd_update(weight, grad, out=weight, lr=lr, wd=wd, **kwargs)
-        else:
-            if state[0] is not None:
-                mp_nag_mom_update(weight, grad, state[0], state[1], out=weight,
-                                  lr=lr, wd=wd, **kwargs)
+                multi_sgd_update(*_flatten_list(zip(weights, grads)), out=weights,
+                                 num_weights=len(weights), lrs=lrs, wds=wds, **kwargs)
+            return
+        for weight, grad, state, lr, wd in zip(weights, grads, states, lrs, wds):
+            if not multi_precision:
+                if state is not None:
+                    nag_mom_update(weight, grad, state, out=weight, lr=lr, wd=wd, **kwargs)
+                else:
+                    sgd_update(weight, grad, out=weight, lr=lr, wd=wd, **kwargs)
             else:
-                mp_sgd_update(weight, grad, state[1], out=weight,
-                              lr=lr, wd=wd, **kwargs)
+                if state[0] is not None:
+                    mp_nag_mom_update(weight, grad, state[0], state[1], out=weight,
+                                      lr=lr, wd=wd, **kwargs)
+                else:
+                    mp_sgd_update(weight, grad, state[1], out=weight,
+                                  lr=lr, wd=wd, **kwargs)
 
     def update(self, index, weight, grad, state):
         self._update_impl(index, weight, grad, state, multi_precision=False)
 
     def update_multi_precision(self, index, weight, grad, state):
-        use_multi_precision = self.multi_precision and weight.dtype == numpy.float16 \
-                                and isinstance(state, (tuple, list))
+        if not isinstance(index, (tuple, list)):
+            use_multi_precision = self.multi_precision and weight.dtype == numpy.float16 \
+                                    and isinstance(state, (tuple, list))
+        else:
+            use_multi_precision = self.multi_precision and weight[0].dtype == numpy.float16 \
+                                    and isinstance(state[0], (tuple, list))
         self._update_impl(index, weight, grad, state,
                           multi_precision=use_multi_precision)
 
@@ -1200,6 +1236,7 @@ class Adam(Optimizer):
         self.beta2 = beta2
         self.epsilon = epsilon
         self.lazy_update = lazy_update
+        self.aggregate_num = int(os.getenv('MXNET_OPTIMIZER_AGGREGATION_SIZE', "4"))
 
     def create_state(self, index, weight):
         stype = weight.stype if self.lazy_update else 'default'
@@ -1209,25 +1246,30 @@ class Adam(Optimizer):
                       stype=stype))  # variance
 
     def update(self, index, weight, grad, state):
-        assert(isinstance(weight, NDArray))
-        assert(isinstance(grad, NDArray))
-        self._update_count(index)
-        lr = self._get_lr(index)
-        wd = self._get_wd(index)
+        indices, weights, grads, states, aggregate = \
+            _as_update_lists(index, weight, grad, state)
+        self._update_count(indices)
+        lrs = self._get_lrs(indices)
+        wds = self._get_wds(indices)
 
-        t = self._index_update_count[index]
-        coef1 = 1. - self.beta1**t
-        coef2 = 1. - self.beta2**t
-        lr *= math.sqrt(coef2)/coef1
+        for i, idx in enumerate(indices):
+            t = self._index_update_count[idx]
+            coef1 = 1. - self.beta1**t
+            coef2 = 1. - self.beta2**t
+            lrs[i] *= math.sqrt(coef2)/coef1
 
         kwargs = {'beta1': self.beta1, 'beta2': self.beta2, 'epsilon': self.epsilon,
                   'rescale_grad': self.rescale_grad}
         if self.clip_gradient:
             kwargs['clip_gradient'] = self.clip_gradient
 
-        mean, var = state
-        adam_update(weight, grad, mean, var, out=weight,
-                    lazy_update=self.lazy_update, lr=lr, wd=wd, **kwargs)
+        if aggregate:
+            multi_adam_update(*_flatten_list(zip(weights, grads, *zip(*states))), out=weights,
+                              num_weights=len(weights), lrs=lrs, wds=wds, **kwargs)
+        else:
+            for weight, grad, (mean, var), lr, wd in zip(weights, grads, states, lrs, wds):
+                adam_update(weight, grad, mean, var, out=weight,
+                            lazy_update=self.lazy_update, lr=lr, wd=wd, **kwargs)
 
 @register
 class AdaGrad(Optimizer):
@@ -1260,33 +1302,37 @@ class AdaGrad(Optimizer):
     def __init__(self, eps=1e-7, **kwargs):
         super(AdaGrad, self).__init__(**kwargs)
         self.float_stable_eps = eps
+        self.aggregate_num = int(os.getenv('MXNET_OPTIMIZER_AGGREGATION_SIZE', "4"))
 
     def create_state(self, index, weight):
         return zeros(weight.shape, weight.context, stype=weight.stype)  # history
 
     def update(self, index, weight, grad, state):
-        assert(isinstance(weight, NDArray))
-        assert(isinstance(grad, NDArray))
-        self._update_count(index)
-        lr = self._get_lr(index)
-        wd = self._get_wd(index)
+        indices, weights, grads, states, aggregate = \
+            _as_update_lists(index, weight, grad, state)
+        self._update_count(indices)
+        lrs = self._get_lrs(indices)
+        wds = self._get_wds(indices)
 
-        is_sparse = grad.stype == 'row_sparse'
-        history = state
+        kwargs = {'epsilon': self.float_stable_eps,
+                  'rescale_grad': self.rescale_grad}
+        if self.clip_gradient:
+            kwargs['clip_gradient'] = self.clip_gradient
 
-        if is_sparse:
-            kwargs = {'epsilon': self.float_stable_eps,
-                      'rescale_grad': self.rescale_grad}
-            if self.clip_gradient:
-                kwargs['clip_gradient'] = self.clip_gradient
-            sparse.adagrad_update(weight, grad, history, out=weight, lr=lr, wd=wd, **kwargs)
-        else:
-            grad = grad * self.rescale_grad
-            if self.clip_gradient is not None:
-                grad = clip(grad, -self.clip_gradient, self.clip_gradient)
-            history[:] += square(grad)
-            div = grad / sqrt(history + self.float_stable_eps)
-            weight[:] += (div + weight * wd) * -lr
+        if aggregate and all(history.stype == 'default' for history in states):
+            multi_adagrad_update(*_flatten_list(zip(weights, grads, states)), out=weights,
+                                 num_weights=len(weights), lrs=lrs, wds=wds, **kwargs)
+            return
+        for weight, grad, history, lr, wd in zip(weights, grads, states, lrs, wds):
+            if grad.stype == 'row_sparse':
+                sparse.adagrad_update(weight, grad, history, out=weight, lr=lr, wd=wd, **kwargs)
+            else:
+                grad = grad * self.rescale_grad
+                if self.clip_gradient is not None:
+                    grad = clip(grad, -self.clip_gradient, self.clip_gradient)
+                history[:] += square(grad)
+                div = grad / sqrt(history + self.float_stable_eps)
+                weight[:] += (div + weight * wd) * -lr
 
 @register
 class RMSProp(Optimizer):
@@ -1331,6 +1377,7 @@ class RMSProp(Optimizer):
         self.centered = centered
         self.epsilon = epsilon
         self.clip_weights = clip_weights
+        self.aggregate_num = int(os.getenv('MXNET_OPTIMIZER_AGGREGATION_SIZE', "4"))
 
     def create_state(self, index, weight):
         if self.centered:
@@ -1342,11 +1389,11 @@ class RMSProp(Optimizer):
             return (zeros(weight.shape, weight.context, stype=weight.stype),)  # n
 
     def update(self, index, weight, grad, state):
-        assert(isinstance(weight, NDArray))
-        assert(isinstance(grad, NDArray))
-        self._update_count(index)
-        lr = self._get_lr(index)
-        wd = self._get_wd(index)
+        indices, weights, grads, states, aggregate = \
+            _as_update_lists(index, weight, grad, state)
+        self._update_count(indices)
+        lrs = self._get_lrs(indices)
+        wds = self._get_wds(indices)
 
         kwargs = {'gamma1': self.gamma1, 'epsilon': self.epsilon,
                   'rescale_grad': self.rescale_grad}
@@ -1357,14 +1404,20 @@ class RMSProp(Optimizer):
         if self.clip_weights:
             kwargs['clip_weights'] = self.clip_weights
 
-        if not self.centered:
-            (n, ) = state
-            rmsprop_update(
-                weight, grad, n, out=weight, lr=lr, wd=wd, **kwargs)
-        else:
-            n, g, delta = state
-            rmspropalex_update(weight, grad, n, g, delta, out=weight,
-                               lr=lr, wd=wd, **kwargs)
+        if aggregate and not self.centered:
+            multi_rmsprop_update(*_flatten_list(zip(weights, grads, *zip(*states))),
+                                 out=weights, num_weights=len(weights),
+                                 lrs=lrs, wds=wds, **kwargs)
+            return
+        for weight, grad, state, lr, wd in zip(weights, grads, states, lrs, wds):
+            if not self.centered:
+                (n, ) = state
+                rmsprop_update(
+                    weight, grad, n, out=weight, lr=lr, wd=wd, **kwargs)
+            else:
+                n, g, delta = state
+                rmspropalex_update(weight, grad, n, g, delta, out=weight,
+                                   lr=lr, wd=wd, **kwargs)
 
 @register
 class AdaDelta(Optimizer):
@@ -1480,26 +1533,30 @@ class Ftrl(Optimizer):
         self.lamda1 = lamda1
         self.beta = beta
         self.lr = learning_rate
+        self.aggregate_num = int(os.getenv('MXNET_OPTIMIZER_AGGREGATION_SIZE', "4"))
 
     def create_state(self, index, weight):
         return (zeros(weight.shape, weight.context, stype=weight.stype),  # z
                 zeros(weight.shape, weight.context, stype=weight.stype))  # n
 
     def update(self, index, weight, grad, state):
-        assert(isinstance(weight, NDArray))
-        assert(isinstance(grad, NDArray))
-        self._update_count(index)
-        wd = self._get_wd(index)
-        lr = self._get_lr(index)
+        indices, weights, grads, states, aggregate = \
+            _as_update_lists(index, weight, grad, state)
+        self._update_count(indices)
+        wds = self._get_wds(indices)
+        lrs = self._get_lrs(indices)
 
         kwargs = {'lamda1': self.lamda1, 'beta': self.beta, 'rescale_grad': self.rescale_grad}
         if self.clip_gradient:
             kwargs['clip_gradient'] = self.clip_gradient
 
-        # accumulated g and delta initialization
-        z, n = state
-        ftrl_update(weight, grad, z, n, out=weight,
-                    lr=lr, wd=wd, **kwargs)
+        if aggregate and all(z.stype == 'default' for z, _ in states):
+            multi_ftrl_update(*_flatten_list(zip(weights, grads, *zip(*states))), out=weights,
+                              num_weights=len(weights), lrs=lrs, wds=wds, **kwargs)
+            return
+        for weight, grad, (z, n), lr, wd in zip(weights, grads, states, lrs, wds):
+            ftrl_update(weight, grad, z, n, out=weight,
+                        lr=lr, wd=wd, **kwargs)
 
 # pylint: enable=line-too-long
 @register
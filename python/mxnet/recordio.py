@@ -213,9 +213,131 @@ class MXRecordIO(object):
         else:
             return None
 
+_BINARY_IDX_MAGIC = b'MXIDXv01'
+_BINARY_IDX_HEADER = struct.Struct('<8sQQ')
+
+
+def _is_binary_idx(idx_path):
+    """Checks whether an index file is in the binary format."""
+    with open(idx_path, 'rb') as fin:
+        return fin.read(len(_BINARY_IDX_MAGIC)) == _BINARY_IDX_MAGIC
+
+
+def _write_binary_idx(idx_path, keys, offsets):
+    """Writes record keys and offsets into a binary index file.
+
+    The file consists of a header with the magic number, the number of keys and the
+    number of unique keys, followed by three little-endian 64-bit arrays: the keys
+    in record order, the unique keys in ascending order and their offsets.
+    For duplicated keys the last record wins, as for the text index.
+    """
+    keys = np.asarray(keys, dtype='<i8').reshape(-1)
+    offsets = np.asarray(offsets, dtype='<u8').reshape(-1)
+    assert keys.shape == offsets.shape, "keys and offsets must have the same length"
+    order = np.argsort(keys, kind='mergesort')
+    sorted_keys = keys[order]
+    sorted_offsets = offsets[order]
+    last = np.append(sorted_keys[1:] != sorted_keys[:-1], True) if keys.size else \
+        np.zeros(0, dtype=bool)
+    sorted_keys = sorted_keys[last]
+    sorted_offsets = sorted_offsets[last]
+    with open(idx_path, 'wb') as fout:
+        fout.write(_BINARY_IDX_HEADER.pack(_BINARY_IDX_MAGIC, keys.size, sorted_keys.size))
+        fout.write(keys.tobytes())
+        fout.write(sorted_keys.tobytes())
+        fout.write(sorted_offsets.tobytes())
+
+
+def convert_idx_to_binary(idx_path, binary_idx_path):
+    """Converts a text index file into the binary index format.
+
+    The binary index is memory-mapped by `MXIndexedRecordIO` instead of parsed,
+    which makes opening large record files fast and lets all processes reading
+    the same file share one copy of the index. Only integer keys are supported.
+    Note that the binary index can only be read by `MXIndexedRecordIO`.
+
+    Examples
+    ---------
+    >>> mx.recordio.convert_idx_to_binary('tmp.idx', 'tmp.bidx')
+    >>> record = mx.recordio.MXIndexedRecordIO('tmp.bidx', 'tmp.rec', 'r')
+    >>> record.read_idx(3)
+    record_3
+
+    Parameters
+    ----------
+    idx_path : str
+        Path to the text index file.
+    binary_idx_path : str
+        Path to the binary index file, that will be created/overwritten.
+    """
+    keys = []
+    offsets = []
+    with open(idx_path, 'r') as fin:
+        for line in iter(fin.readline, ''):
+            line = line.strip().split('\t')
+            keys.append(int(line[0]))
+            offsets.append(int(line[1]))
+    _write_binary_idx(binary_idx_path, keys, offsets)
+
+
+class _BinaryRecordIndex(object):
+    """Read-only mapping from record key to offset backed by a memory-mapped binary index.
+
+    Lookups are direct if keys are the contiguous range starting from 0,
+    and use binary search otherwise.
+
+    Parameters
+    ----------
+    idx_path : str
+        Path to the binary index file.
+    """
+    def __init__(self, idx_path):
+        data = np.memmap(idx_path, dtype=np.uint8, mode='r')
+        magic, num_keys, num_unique = _BINARY_IDX_HEADER.unpack(
+            data[:_BINARY_IDX_HEADER.size].tobytes())
+        if magic != _BINARY_IDX_MAGIC:
+            raise ValueError("%s is not a binary index file"%idx_path)
+        start = _BINARY_IDX_HEADER.size
+        self.keys = data[start:start + 8 * num_keys].view('<i8')
+        start += 8 * num_keys
+        self._sorted_keys = data[start:start + 8 * num_unique].view('<i8')
+        start += 8 * num_unique
+        self._sorted_offsets = data[start:start + 8 * num_unique].view('<u8')
+
+    def _find(self, key):
+        """Returns the position of key in the sorted keys, or -1 if missing."""
+        num_unique = self._sorted_keys.shape[0]
+        if 0 <= key < num_unique and self._sorted_keys[key] == key:
+            return key
+        pos = int(np.searchsorted(self._sorted_keys, key))
+        if pos < num_unique and self._sorted_keys[pos] == key:
+            return pos
+        return -1
+
+    def __getitem__(self, key):
+        pos = self._find(key)
+        if pos < 0:
+            raise KeyError(key)
+        return int(self._sorted_offsets[pos])
+
+    def __contains__(self, key):
+        return self._find(key) >= 0
+
+    def __len__(self):
+        return self._sorted_keys.shape[0]
+
+    def __iter__(self):
+        return iter(self._sorted_keys)
+
+
 class MXIndexedRecordIO(MXRecordIO):
     """Reads/writes `RecordIO` data format, supporting random access.
 
+    The index file is either a text file with one tab separated key and offset
+    per line, or a binary index created by `convert_idx_to_binary`. The format is
+    detected when reading. A binary index is memory-mapped rather than parsed, so
+    `keys` is a read-only numpy array and the index is shared between processes.
+
     Examples
     ---------
     >>> for i in range(5):
@@ -234,7 +356,7 @@ class MXIndexedRecordIO(MXRecordIO):
     flag : str
         'w' for write or 'r' for read.
     key_type : type
-        Data type for keys.
+        Data type for keys. Must be int for a binary index.
     """
     def __init__(self, idx_path, uri, flag, key_type=int):
         self.idx_path = idx_path
@@ -248,6 +370,13 @@ class MXIndexedRecordIO(MXRecordIO):
         super(MXIndexedRecordIO, self).open()
         self.idx = {}
         self.keys = []
+        self.fidx = None
+        if not self.writable and _is_binary_idx(self.idx_path):
+            if self.key_type is not int:
+                raise ValueError("Binary index only supports int keys, got %s"%self.key_type)
+            self.idx = _BinaryRecordIndex(self.idx_path)
+            self.keys = self.idx.keys
+            return
         self.fidx = open(self.idx_path, self.flag)
         if not self.writable:
             for line in iter(self.fidx.readline, ''):
@@ -261,12 +390,17 @@ class MXIndexedRecordIO(MXRecordIO):
         if not self.is_open:
             return
         super(MXIndexedRecordIO, self).close()
-        self.fidx.close()
+        if self.fidx is not None:
+            self.fidx.close()
 
     def __getstate__(self):
         """Override pickling behavior."""
         d = super(MXIndexedRecordIO, self).__getstate__()
         d['fidx'] = None
+        if isinstance(d['idx'], _BinaryRecordIndex):
+            # the memory-mapped index is mapped again when reopened
+            d['idx'] = {}
+            d['keys'] = []
         return d
 
     def seek(self, idx):
@@ -317,6 +451,44 @@ class MXIndexedRecordIO(MXRecordIO):
         self.seek(idx)
         return self.read()
 
+    def read_batch(self, idxs):
+        """Returns the records at given indices.
+
+        The records are read with a single native call. Their offsets are visited
+        in ascending order and adjacent records are read sequentially without
+        seeking, which is much faster than calling `read_idx` for each index,
+        especially on spinning disks and network file systems.
+
+        Examples
+        ---------
+        >>> record = mx.recordio.MXIndexedRecordIO('tmp.idx', 'tmp.rec', 'r')
+        >>> record.read_batch([3, 1])
+        [record_3, record_1]
+
+        Parameters
+        ----------
+        idxs : list
+            Indices of the records to read.
+
+        Returns
+        ----------
+        bufs : list of string
+            Buffers read, in the order of `idxs`.
+        """
+        assert not self.writable
+        self._check_pid(allow_reset=True)
+        num = len(idxs)
+        if num == 0:
+            return []
+        positions = (ctypes.c_size_t * num)(*[self.idx[idx] for idx in idxs])
+        bufs = (ctypes.c_void_p * num)()
+        sizes = (ctypes.c_size_t * num)()
+        check_call(_LIB.MXRecordIOReaderReadRecordBatch(self.handle,
+                                                        ctypes.c_uint32(num),
+                                                        positions, bufs, sizes))
+        return [ctypes.string_at(bufs[i], sizes[i]) if bufs[i] else None
+                for i in range(num)]
+
     def write_idx(self, idx, buf):
         """Inserts input record at given index.
 
@@ -22,6 +22,7 @@
  * \file c_api.cc
  * \brief C API of mxnet
  */
+#include <algorithm>
 #include <vector>
 #include <sstream>
 #include <string>
@@ -1338,6 +1339,7 @@ struct MXRecordIOContext {
   dmlc::RecordIOReader *reader;
   dmlc::Stream *stream;
   std::string *read_buff;
+  std::vector<std::string> *batch_buff;
 };
 
 int MXRecordIOWriterCreate(const char *uri,
@@ -1349,6 +1351,7 @@ int MXRecordIOWriterCreate(const char *uri,
   context->reader = NULL;
   context->stream = stream;
   context->read_buff = NULL;
+  context->batch_buff = NULL;
   *out = reinterpret_cast<RecordIOHandle>(context);
   API_END();
 }
@@ -1389,6 +1392,7 @@ int MXRecordIOReaderCreate(const char *uri,
   context->writer = NULL;
   context->stream = stream;
   context->read_buff = new std::string();
+  context->batch_buff = new std::vector<std::string>();
   *out = reinterpret_cast<RecordIOHandle>(context);
   API_END();
 }
@@ -1400,6 +1404,7 @@ int MXRecordIOReaderFree(RecordIOHandle handle) {
   delete context->reader;
   delete context->stream;
   delete context->read_buff;
+  delete context->batch_buff;
   delete context;
   API_END();
 }
@@ -1419,6 +1424,44 @@ int MXRecordIOReaderReadRecord(RecordIOHandle handle,
   API_END();
 }
 
+int MXRecordIOReaderReadRecordBatch(RecordIOHandle handle,
+                                    uint32_t num,
+                                    const size_t *positions,
+                                    char const **bufs,
+                                    size_t *sizes) {
+  API_BEGIN();
+  MXRecordIOContext *context =
+    reinterpret_cast<MXRecordIOContext*>(handle);
+  std::vector<uint32_t> order(num);
+  for (uint32_t i = 0; i < num; ++i) order[i] = i;
+  std::stable_sort(order.begin(), order.end(), [positions](uint32_t a, uint32_t b) {
+    return positions[a] < positions[b];
+  });
+  std::vector<std::string> &buff = *context->batch_buff;
+  buff.resize(num);
+  for (uint32_t i = 0; i < num; ++i) {
+    const uint32_t k = order[i];
+    if (i > 0 && positions[k] == positions[order[i - 1]]) {
+      // duplicated position, share the buffer of the previous read
+      bufs[k] = bufs[order[i - 1]];
+      sizes[k] = sizes[order[i - 1]];
+      continue;
+    }
+    // adjacent records are read sequentially without seeking
+    if (context->reader->Tell() != positions[k]) {
+      context->reader->Seek(positions[k]);
+    }
+    if (context->reader->NextRecord(&buff[k])) {
+      bufs[k] = buff[k].c_str();
+      sizes[k] = buff[k].size();
+    } else {
+      bufs[k] = NULL;
+      sizes[k] = 0;
+    }
+  }
+  API_END();
+}
+
 int MXRecordIOReaderSeek(RecordIOHandle handle, size_t pos) {
   API_BEGIN();
   MXRecordIOContext *context =
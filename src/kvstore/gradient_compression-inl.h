@@ -26,16 +26,17 @@
 #define MXNET_KVSTORE_GRADIENT_COMPRESSION_INL_H_
 
 #include <vector>
+#include "./gradient_compression.h"
 #include "../operator/mxnet_op.h"
 
 namespace mxnet {
 namespace kvstore {
 
 // these gpu functions are defined in gradient_compression.cu
-void Quantize2BitImpl(mshadow::Stream<mshadow::gpu> *s, const std::vector<mxnet::TBlob> &inputs,
-                      const float threshold);
-void Dequantize2BitImpl(mshadow::Stream<mshadow::gpu> *s, const std::vector<mxnet::TBlob> &inputs,
-                        const float threshold);
+void QuantizeImpl(mshadow::Stream<mshadow::gpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                  const CompressionType type, const float threshold, const int topk);
+void DequantizeImpl(mshadow::Stream<mshadow::gpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                    const CompressionType type, const float threshold, const int topk);
 
 struct quantize_2bit {
   MSHADOW_XINLINE static void Map(int out_block_id,
@@ -138,16 +139,200 @@ void Dequantize2BitKernelLaunch(mshadow::Stream<xpu> *s, const std::vector<mxnet
           threshold);               // positive threshold
 }
 
-inline void Quantize2BitImpl(mshadow::Stream<mshadow::cpu> *s,
-                             const std::vector<mxnet::TBlob> &inputs,
-                             const float threshold) {
-  Quantize2BitKernelLaunch(s, inputs, threshold);
+struct quantize_1bit {
+  MSHADOW_XINLINE static void Map(int out_block_id,
+                                  int original_size,
+                                  float *out,
+                                  float *grad,
+                                  float *residual) {
+    // this block contains the scale followed by the sign bits of
+    // upto kOneBitBlockSize values starting from out_block_id*kOneBitBlockSize
+    float *compr_block = out + out_block_id * (1 + kOneBitBlockSize / 32);
+    uint32_t *sign_bits = reinterpret_cast<uint32_t *>(compr_block + 1);
+    const int start = out_block_id * kOneBitBlockSize;
+    const int end = (start + kOneBitBlockSize <= original_size) ?
+                    start + kOneBitBlockSize : original_size;
+    // the scale is the mean absolute value of the updated grad in this block
+    float abs_sum = 0;
+    for (int i = start; i < end; i++) {
+      residual[i] += grad[i];
+      abs_sum += fabsf(residual[i]);
+    }
+    const float scale = abs_sum / (end - start);
+    compr_block[0] = scale;
+    for (int j = 0; j < kOneBitBlockSize / 32; j++) {
+      sign_bits[j] = 0;
+    }
+    for (int i = start; i < end; i++) {
+      if (residual[i] >= 0) {
+        // set bit for a positive sign
+        sign_bits[(i - start) >> 5] |= 1U << ((i - start) & 31);
+        residual[i] -= scale;
+      } else {
+        residual[i] += scale;
+      }
+    }
+  }
+};
+
+template<typename xpu>
+void Quantize1BitKernelLaunch(mshadow::Stream<xpu> *s, const std::vector<mxnet::TBlob> &inputs) {
+  mxnet::op::mxnet_op::Kernel<quantize_1bit, xpu>
+    ::Launch(s,
+            inputs[2].Size() / (1 + kOneBitBlockSize / 32),  // number of blocks
+            inputs[0].Size(),         // original size
+            inputs[2].dptr<float>(),  // compressed array
+            inputs[0].dptr<float>(),  // original array
+            inputs[1].dptr<float>());  // residual array
+}
+
+struct dequantize_1bit {
+  MSHADOW_XINLINE static void Map(int i,
+                                  float *out,
+                                  float *in) {
+    // gets the block which holds the scale and the sign bit for this position
+    const float *compr_block = in + (i / kOneBitBlockSize) * (1 + kOneBitBlockSize / 32);
+    const uint32_t *sign_bits = reinterpret_cast<const uint32_t *>(compr_block + 1);
+    const int pos = i % kOneBitBlockSize;
+    out[i] = ((sign_bits[pos >> 5] >> (pos & 31)) & 1U) ? compr_block[0] : -compr_block[0];
+  }
+};
+
+template<typename xpu>
+void Dequantize1BitKernelLaunch(mshadow::Stream<xpu> *s, const std::vector<mxnet::TBlob> &inputs) {
+  mxnet::op::mxnet_op::Kernel<dequantize_1bit, xpu>
+  ::Launch(s,
+          inputs[1].Size(),         // original size
+          inputs[1].dptr<float>(),  // out array
+          inputs[0].dptr<float>());  // compressed array
+}
+
+struct quantize_topk {
+  MSHADOW_XINLINE static void Map(int out_block_id,
+                                  int original_size,
+                                  float *out,
+                                  float *grad,
+                                  float *residual,
+                                  const int topk) {
+    // this block contains topk pairs of position and value, selected among
+    // upto kTopKBlockSize values starting from out_block_id*kTopKBlockSize
+    float *compr_block = out + out_block_id * 2 * topk;
+    const int start = out_block_id * kTopKBlockSize;
+    const int end = (start + kTopKBlockSize <= original_size) ?
+                    start + kTopKBlockSize : original_size;
+    for (int i = start; i < end; i++) {
+      residual[i] += grad[i];
+    }
+    for (int j = 0; j < topk; j++) {
+      // a sent value is cleared from the residual, so that
+      // the next pass finds the next largest one
+      int largest = start;
+      float largest_abs = -1;
+      for (int i = start; i < end; i++) {
+        const float abs_val = fabsf(residual[i]);
+        if (abs_val > largest_abs) {
+          largest = i;
+          largest_abs = abs_val;
+        }
+      }
+      compr_block[2 * j] = largest - start;
+      compr_block[2 * j + 1] = residual[largest];
+      residual[largest] = 0;
+    }
+  }
+};
+
+template<typename xpu>
+void QuantizeTopKKernelLaunch(mshadow::Stream<xpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                              const int topk) {
+  mxnet::op::mxnet_op::Kernel<quantize_topk, xpu>
+    ::Launch(s,
+            inputs[2].Size() / (2 * topk),  // number of blocks
+            inputs[0].Size(),         // original size
+            inputs[2].dptr<float>(),  // compressed array
+            inputs[0].dptr<float>(),  // original array
+            inputs[1].dptr<float>(),  // residual array
+            topk);                    // values per block
+}
+
+struct dequantize_topk {
+  MSHADOW_XINLINE static void Map(int in_block_id,
+                                  int original_size,
+                                  float *out,
+                                  float *in,
+                                  const int topk) {
+    const float *compr_block = in + in_block_id * 2 * topk;
+    const int start = in_block_id * kTopKBlockSize;
+    const int end = (start + kTopKBlockSize <= original_size) ?
+                    start + kTopKBlockSize : original_size;
+    for (int i = start; i < end; i++) {
+      out[i] = 0;
+    }
+    // a position can be sent more than once with value 0
+    for (int j = 0; j < topk; j++) {
+      out[start + static_cast<int>(compr_block[2 * j])] += compr_block[2 * j + 1];
+    }
+  }
+};
+
+template<typename xpu>
+void DequantizeTopKKernelLaunch(mshadow::Stream<xpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                                const int topk) {
+  mxnet::op::mxnet_op::Kernel<dequantize_topk, xpu>
+  ::Launch(s,
+          inputs[0].Size() / (2 * topk),  // number of blocks
+          inputs[1].Size(),         // original size
+          inputs[1].dptr<float>(),  // out array
+          inputs[0].dptr<float>(),  // compressed array
+          topk);                    // values per block
+}
+
+template<typename xpu>
+void QuantizeKernelLaunch(mshadow::Stream<xpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                          const CompressionType type, const float threshold, const int topk) {
+  switch (type) {
+    case CompressionType::kTwoBit:
+      Quantize2BitKernelLaunch(s, inputs, threshold);
+      break;
+    case CompressionType::kOneBit:
+      Quantize1BitKernelLaunch(s, inputs);
+      break;
+    case CompressionType::kTopK:
+      QuantizeTopKKernelLaunch(s, inputs, topk);
+      break;
+    default:
+      LOG(FATAL) << "Unsupported quantization of type " << static_cast<int>(type);
+  }
+}
+
+template<typename xpu>
+void DequantizeKernelLaunch(mshadow::Stream<xpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                            const CompressionType type, const float threshold, const int topk) {
+  switch (type) {
+    case CompressionType::kTwoBit:
+      Dequantize2BitKernelLaunch(s, inputs, threshold);
+      break;
+    case CompressionType::kOneBit:
+      Dequantize1BitKernelLaunch(s, inputs);
+      break;
+    case CompressionType::kTopK:
+      DequantizeTopKKernelLaunch(s, inputs, topk);
+      break;
+    default:
+      LOG(FATAL) << "Unsupported dequantization of type " << static_cast<int>(type);
+  }
+}
+
+inline void QuantizeImpl(mshadow::Stream<mshadow::cpu> *s,
+                         const std::vector<mxnet::TBlob> &inputs,
+                         const CompressionType type, const float threshold, const int topk) {
+  QuantizeKernelLaunch(s, inputs, type, threshold, topk);
 }
 
-inline void Dequantize2BitImpl(mshadow::Stream<mshadow::cpu> *s,
-                               const std::vector<mxnet::TBlob> &inputs,
-                               const float threshold) {
-  Dequantize2BitKernelLaunch(s, inputs, threshold);
+inline void DequantizeImpl(mshadow::Stream<mshadow::cpu> *s,
+                           const std::vector<mxnet::TBlob> &inputs,
+                           const CompressionType type, const float threshold, const int topk) {
+  DequantizeKernelLaunch(s, inputs, type, threshold, topk);
 }
 }  // namespace kvstore
 }  // namespace mxnet
@@ -23,6 +23,8 @@
  * \author Rahul Huilgol
  */
 
+#include <algorithm>
+#include <cmath>
 #include <vector>
 #include "kvstore_local.h"
 #include "gradient_compression.h"
@@ -41,9 +43,14 @@ void GradientCompression::SetParams(const std::vector<std::pair<std::string, std
                                     & kwargs) {
   GradientCompressionParam params;
   params.InitAllowUnknown(kwargs);
-  CHECK_GT(params.threshold, 0) << "threshold must be greater than 0";
   if (params.type == "2bit") {
+    CHECK_GT(params.threshold, 0) << "threshold must be greater than 0";
     SetTwoBitCompression(params.threshold);
+  } else if (params.type == "1bit") {
+    SetOneBitCompression();
+  } else if (params.type == "topk") {
+    CHECK(params.ratio > 0 && params.ratio < 0.5) << "ratio must be in (0, 0.5)";
+    SetTopKCompression(params.ratio);
   } else {
     LOG(FATAL) << "Unknown type for gradient compression " << params.type;
   }
@@ -62,11 +69,22 @@ void GradientCompression::SetTwoBitCompression(const float threshold) {
   threshold_ = threshold;
 }
 
+void GradientCompression::SetOneBitCompression() {
+  type_ = CompressionType::kOneBit;
+}
+
+void GradientCompression::SetTopKCompression(const float ratio) {
+  type_ = CompressionType::kTopK;
+  topk_ = std::max(1, static_cast<int>(std::round(ratio * kTopKBlockSize)));
+}
+
 std::string GradientCompression::EncodeParams() {
   using namespace std;  // to reduce length of next line
   string rval = get_type_str();
   if (type_ == CompressionType::kTwoBit) {
     rval += "," + to_string(threshold_);
+  } else if (type_ == CompressionType::kTopK) {
+    rval += ",," + to_string(topk_);
   }
   return rval;
 }
@@ -80,22 +98,47 @@ void GradientCompression::DecodeParams(const std::string &s) {
       threshold_ = stof(elems[1]);
     }
   }
+  if (elems.size() > 2) {
+    topk_ = stoi(elems[2]);
+  }
 }
 
-int GradientCompression::GetCompressionFactor() {
-  if (type_ == CompressionType::kTwoBit) {
-    return 16;
-  } else {
-    LOG(FATAL) << "Unsupported compression type: " << get_type_str();
-    return 0;
+int64_t GradientCompression::GetOriginalBlockSize() {
+  switch (type_) {
+    case CompressionType::kTwoBit:
+      return 16;
+    case CompressionType::kOneBit:
+      return kOneBitBlockSize;
+    case CompressionType::kTopK:
+      return kTopKBlockSize;
+    default:
+      LOG(FATAL) << "Unsupported compression type: " << get_type_str();
+      return 0;
+  }
+}
+
+int64_t GradientCompression::GetCompressedBlockSize() {
+  switch (type_) {
+    case CompressionType::kTwoBit:
+      return 1;
+    case CompressionType::kOneBit:
+      // the scale followed by one bit per value
+      return 1 + kOneBitBlockSize / 32;
+    case CompressionType::kTopK:
+      // pairs of position and value
+      return 2 * topk_;
+    default:
+      LOG(FATAL) << "Unsupported compression type: " << get_type_str();
+      return 0;
   }
 }
 
 int64_t GradientCompression::GetCompressedSize(const int64_t original_size) {
-  const int bits = GetCompressionFactor();
-  return ((original_size % bits == 0) ?
-          original_size / bits :
-          original_size / bits + 1);
+  const int64_t block_size = GetOriginalBlockSize();
+  const int64_t num_blocks = (original_size % block_size == 0) ?
+                             original_size / block_size :
+                             original_size / block_size + 1;
+  return num_blocks * GetCompressedBlockSize();
 }
 
 void GradientCompression::Quantize(const mxnet::NDArray &from, mxnet::NDArray *to,
@@ -105,20 +148,24 @@ void GradientCompression::Quantize(const mxnet::NDArray &from, mxnet::NDArray *t
   CHECK(shape_is_known(residual->shape())) << "residual operand has undefined shape";
   const int a = from.ctx().dev_mask();
   const int b = to->ctx().dev_mask();
+  const CompressionType type = type_;
   const float threshold = threshold_;
-  if (type_ == CompressionType::kTwoBit) {
+  const int topk = topk_;
+  if (type_ != CompressionType::kNone) {
     if (a == mshadow::cpu::kDevMask && b == mshadow::cpu::kDevMask) {
-      mxnet::Engine::Get()->PushSync([from, to, residual, threshold](mxnet::RunContext ctx) {
+      mxnet::Engine::Get()->PushSync([from, to, residual, type, threshold, topk]
+                                     (mxnet::RunContext ctx) {
         std::vector<mxnet::TBlob> inputs = {from.data(), residual->data(), to->data()};
-        Quantize2BitImpl(ctx.get_stream<mshadow::cpu>(), inputs, threshold);
+        QuantizeImpl(ctx.get_stream<mshadow::cpu>(), inputs, type, threshold, topk);
       }, from.ctx(), {from.var()}, {to->var(), residual->var()},
       mxnet::FnProperty::kNormal, priority, "QuantizeCPU");
     } else {
 #if MXNET_USE_CUDA
       if (a == mshadow::gpu::kDevMask && b == mshadow::gpu::kDevMask) {
-        mxnet::Engine::Get()->PushSync([from, to, residual, threshold](mxnet::RunContext ctx) {
+        mxnet::Engine::Get()->PushSync([from, to, residual, type, threshold, topk]
+                                       (mxnet::RunContext ctx) {
           std::vector<mxnet::TBlob> inputs = {from.data(), residual->data(), to->data()};
-          Quantize2BitImpl(ctx.get_stream<mshadow::gpu>(), inputs, threshold);
+          QuantizeImpl(ctx.get_stream<mshadow::gpu>(), inputs, type, threshold, topk);
           // Wait GPU kernel to complete
           ctx.get_stream<mshadow::gpu>()->Wait();
         }, from.ctx(), {from.var()}, {to->var(), residual->var()},
@@ -141,20 +188,22 @@ void GradientCompression::Dequantize(const mxnet::NDArray &from, mxnet::NDArray
   CHECK(shape_is_known(to->shape())) << "destination operand has undefined shape";
   const int a = from.ctx().dev_mask();
   const int b = to->ctx().dev_mask();
+  const CompressionType type = type_;
   const float threshold = threshold_;
-  if (type_ == CompressionType::kTwoBit) {
+  const int topk = topk_;
+  if (type_ != CompressionType::kNone) {
     if (a == mshadow::cpu::kDevMask && b == mshadow::cpu::kDevMask) {
-      mxnet::Engine::Get()->PushSync([from, to, threshold](mxnet::RunContext ctx) {
+      mxnet::Engine::Get()->PushSync([from, to, type, threshold, topk](mxnet::RunContext ctx) {
         std::vector<mxnet::TBlob> inputs = {from.data(), to->data()};
-        Dequantize2BitImpl(ctx.get_stream<mshadow::cpu>(), inputs, threshold);
+        DequantizeImpl(ctx.get_stream<mshadow::cpu>(), inputs, type, threshold, topk);
       }, from.ctx(), {from.var()}, {to->var()},
       mxnet::FnProperty::kNormal, priority, "DequantizeCPU");
     } else {
 #if MXNET_USE_CUDA
       if (a == mshadow::gpu::kDevMask && b == mshadow::gpu::kDevMask) {
-        mxnet::Engine::Get()->PushSync([from, to, threshold](mxnet::RunContext ctx) {
+        mxnet::Engine::Get()->PushSync([from, to, type, threshold, topk](mxnet::RunContext ctx) {
           std::vector<mxnet::TBlob> inputs = {from.data(), to->data()};
-          Dequantize2BitImpl(ctx.get_stream<mshadow::gpu>(), inputs, threshold);
+          DequantizeImpl(ctx.get_stream<mshadow::gpu>(), inputs, type, threshold, topk);
           // Wait GPU kernel to complete
           ctx.get_stream<mshadow::gpu>()->Wait();
         }, from.ctx(), {from.var()}, {to->var()},
@@ -27,14 +27,14 @@
 
 namespace mxnet {
 namespace kvstore {
-void Quantize2BitImpl(mshadow::Stream<gpu>* s, const std::vector<TBlob>& inputs,
-                      const float threshold) {
-  Quantize2BitKernelLaunch(s, inputs, threshold);
+void QuantizeImpl(mshadow::Stream<gpu>* s, const std::vector<TBlob>& inputs,
+                  const CompressionType type, const float threshold, const int topk) {
+  QuantizeKernelLaunch(s, inputs, type, threshold, topk);
 }
 
-void Dequantize2BitImpl(mshadow::Stream<gpu>* s, const std::vector<TBlob>& inputs,
-                        const float threshold) {
-  Dequantize2BitKernelLaunch(s, inputs, threshold);
+void DequantizeImpl(mshadow::Stream<gpu>* s, const std::vector<TBlob>& inputs,
+                    const CompressionType type, const float threshold, const int topk) {
+  DequantizeKernelLaunch(s, inputs, type, threshold, topk);
 }
 }  // namespace kvstore
 }  // namespace mxnet
@@ -35,17 +35,25 @@ namespace mxnet {
 namespace kvstore {
 
 enum class CompressionType {
-  kNone, kTwoBit
+  kNone, kTwoBit, kOneBit, kTopK
 };
 
+/*! \brief number of gradient values encoded by one block of 1bit compression */
+const int64_t kOneBitBlockSize = 256;
+/*! \brief number of gradient values among which top-k compression selects k */
+const int64_t kTopKBlockSize = 1024;
+
 struct GradientCompressionParam : public dmlc::Parameter<GradientCompressionParam> {
   std::string type;
   float threshold;
+  float ratio;
   DMLC_DECLARE_PARAMETER(GradientCompressionParam) {
     DMLC_DECLARE_FIELD(type)
-      .describe("Type of gradient compression to use, like `2bit` for example");
+      .describe("Type of gradient compression to use, like `2bit`, `1bit` or `topk`");
     DMLC_DECLARE_FIELD(threshold).set_default(0.5)
       .describe("Threshold to use for 2bit gradient compression");
+    DMLC_DECLARE_FIELD(ratio).set_default(0.01)
+      .describe("Fraction of the gradient values sent by topk gradient compression");
   }
 };
 
@@ -78,6 +86,19 @@ class GradientCompression {
    */
   void SetTwoBitCompression(const float threshold);
 
+  /*!
+   * \brief sets one bit gradient compression, which sends the sign of every value
+   * and the mean absolute value of each block of kOneBitBlockSize values
+   */
+  void SetOneBitCompression();
+
+  /*!
+   * \brief sets top-k gradient compression, which sends the values with the
+   * largest magnitude and their positions
+   * \param ratio fraction of the values of each block of kTopKBlockSize values to send
+   */
+  void SetTopKCompression(const float ratio);
+
   /*!
    * \brief encodes parameters of gc into a string
    */
@@ -89,10 +110,15 @@ class GradientCompression {
   void DecodeParams(const std::string &s);
 
   /*!
-   * \brief returns compression factor, which is the factor by which size of gradient
-   * reduces when using a particular type of compression
+   * \brief returns the number of gradient values which are compressed together
+   * into one block. Compressed arrays can only be split at block boundaries.
    */
-  int GetCompressionFactor();
+  int64_t GetOriginalBlockSize();
+
+  /*!
+   * \brief returns the number of floats of one compressed block
+   */
+  int64_t GetCompressedBlockSize();
 
   /*!
    * \brief returns the size of compressed gradients given an original sized gradient array
@@ -132,6 +158,11 @@ class GradientCompression {
    * all negative gradients will be thresholded to -1*`threshold_`
    */
   float threshold_ = 0;
+
+  /*!
+   * \brief number of values of each block sent by top-k compression
+   */
+  int topk_ = 0;
 };
 }  // namespace kvstore
 }  // namespace mxnet
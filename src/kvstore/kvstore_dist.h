@@ -701,9 +701,13 @@ class KVStoreDist : public KVStoreLocal {
         push_pskv.size = compr_size;
         pull_pskv.size = original_size;
       } else {
-        // partition it to all servers
+        // partition it to all servers, at block boundaries
+        // so that every server can decompress its part
         push_pskv.size = 0;
         pull_pskv.size = 0;
+        const size_t compr_block = gradient_compression_->GetCompressedBlockSize();
+        const size_t orig_block = gradient_compression_->GetOriginalBlockSize();
+        const size_t num_blocks = compr_num_elem / compr_block;
 
         for (int i = 0; i < num_servers; ++i) {
           size_t part_compr, part_orig;
@@ -711,10 +715,11 @@ class KVStoreDist : public KVStoreLocal {
             part_compr = compr_num_elem - push_pskv.size;
             part_orig = original_num_elem - pull_pskv.size;
           } else {
-            part_compr =
-              static_cast<size_t> (round(static_cast<double>(compr_num_elem)/num_servers*(i+1))) -
-              static_cast<size_t> (round(static_cast<double>(compr_num_elem)/num_servers*(i)));
-            part_orig = part_compr * gradient_compression_->GetCompressionFactor();
+            const size_t part_blocks =
+              static_cast<size_t> (round(static_cast<double>(num_blocks)/num_servers*(i+1))) -
+              static_cast<size_t> (round(static_cast<double>(num_blocks)/num_servers*(i)));
+            part_compr = part_blocks * compr_block;
+            part_orig = part_blocks * orig_block;
           }
 
           // meta info
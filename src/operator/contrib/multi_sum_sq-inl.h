@@ -0,0 +1,135 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*!
+ *  Copyright (c) 2019 by Contributors
+ * \file multi_sum_sq-inl.h
+ * \brief operator computing the sum of squares of each array in a group of arrays
+ */
+
+#ifndef MXNET_OPERATOR_CONTRIB_MULTI_SUM_SQ_INL_H_
+#define MXNET_OPERATOR_CONTRIB_MULTI_SUM_SQ_INL_H_
+#include <dmlc/parameter.h>
+#include <mxnet/operator.h>
+#include <mxnet/operator_util.h>
+#include <mxnet/op_attr_types.h>
+#include <mshadow/base.h>
+#include <nnvm/op.h>
+#include <nnvm/op_attr_types.h>
+#include <vector>
+#include "../operator_common.h"
+#include "../mshadow_op.h"
+#include "../mxnet_op.h"
+
+namespace mxnet {
+namespace op {
+
+struct MultiSumSqParam : public dmlc::Parameter<MultiSumSqParam> {
+  int num_arrays;
+  DMLC_DECLARE_PARAMETER(MultiSumSqParam) {
+    DMLC_DECLARE_FIELD(num_arrays)
+    .set_default(1)
+    .describe("Number of arrays.");
+  }
+};
+
+inline bool MultiSumSqShape(const nnvm::NodeAttrs& attrs,
+                            mxnet::ShapeVector *in_attrs,
+                            mxnet::ShapeVector *out_attrs) {
+  const MultiSumSqParam& param = dmlc::get<MultiSumSqParam>(attrs.parsed);
+  CHECK_EQ(in_attrs->size(), param.num_arrays);
+  CHECK_EQ(out_attrs->size(), 1U);
+  SHAPE_ASSIGN_CHECK(*out_attrs, 0, mxnet::TShape(mshadow::Shape1(param.num_arrays)));
+  for (const auto& shape : *in_attrs) {
+    if (!shape_is_known(shape)) return false;
+  }
+  return true;
+}
+
+inline bool MultiSumSqType(const nnvm::NodeAttrs& attrs,
+                           std::vector<int> *in_attrs,
+                           std::vector<int> *out_attrs) {
+  const MultiSumSqParam& param = dmlc::get<MultiSumSqParam>(attrs.parsed);
+  CHECK_EQ(in_attrs->size(), param.num_arrays);
+  CHECK_EQ(out_attrs->size(), 1U);
+  // all arrays share one dtype, the sums are accumulated in float32
+  int dtype = -1;
+  for (const int type : *in_attrs) {
+    if (type != -1) {
+      dtype = type;
+      break;
+    }
+  }
+  if (dtype != -1) {
+    for (int i = 0; i < param.num_arrays; ++i) {
+      TYPE_ASSIGN_CHECK(*in_attrs, i, dtype);
+    }
+  }
+  TYPE_ASSIGN_CHECK(*out_attrs, 0, mshadow::kFloat32);
+  return dtype != -1;
+}
+
+template<typename DType>
+struct MultiSumSqKernelParam {
+  static const int N = 128;
+  int count;
+  size_t sizes[N];
+  DType *arrays[N];
+  // index of the first block working on each array, used by the GPU kernel
+  int block_offsets[N + 1];
+};
+
+template<typename xpu, typename DType>
+MultiSumSqKernelParam<DType> FillMultiSumSqKernelParam(const OpContext &ctx,
+                                                       const std::vector<TBlob> &inputs,
+                                                       const int start,
+                                                       const int count) {
+  using namespace mxnet_op;
+  MultiSumSqKernelParam<DType> param;
+  Stream<xpu>* s = ctx.get_stream<xpu>();
+  param.count = count;
+  for (int i = 0; i < count; ++i) {
+    param.sizes[i] = inputs[start + i].shape_.Size();
+    param.arrays[i] = inputs[start + i].FlatTo2D<xpu, DType>(s).dptr_;
+  }
+  return param;
+}
+
+template<typename xpu>
+void MultiSumSqCompute(const OpContext &ctx,
+                       const std::vector<TBlob> &inputs,
+                       float *out);
+
+template<typename xpu>
+inline void MultiSumSq(const nnvm::NodeAttrs& attrs,
+                       const OpContext &ctx,
+                       const std::vector<TBlob> &inputs,
+                       const std::vector<OpReqType> &req,
+                       const std::vector<TBlob> &outputs) {
+  using namespace mxnet_op;
+  Stream<xpu>* s = ctx.get_stream<xpu>();
+  Tensor<xpu, 1, float> out = outputs[0].FlatTo1D<xpu, float>(s);
+  out = 0.f;
+  MultiSumSqCompute<xpu>(ctx, inputs, out.dptr_);
+}
+
+}  // namespace op
+}  // namespace mxnet
+
+#endif  // MXNET_OPERATOR_CONTRIB_MULTI_SUM_SQ_INL_H_
@@ -0,0 +1,89 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*!
+ *  Copyright (c) 2019 by Contributors
+ * \file multi_sum_sq.cc
+ * \brief operator computing the sum of squares of each array in a group of arrays
+ */
+#include "./multi_sum_sq-inl.h"
+
+namespace mxnet {
+namespace op {
+
+template<typename DType>
+inline float SumSqCPU(const DType* data, const index_t size, const int omp_threads) {
+  float sum = 0.f;
+  #pragma omp parallel for num_threads(omp_threads) reduction(+:sum) if (size >= 65536)
+  for (index_t i = 0; i < size; ++i) {
+    const float val = static_cast<float>(data[i]);
+    sum += val * val;
+  }
+  return sum;
+}
+
+template<>
+void MultiSumSqCompute<cpu>(const OpContext &ctx,
+                            const std::vector<TBlob> &inputs,
+                            float *out) {
+  const int omp_threads = engine::OpenMP::Get()->GetRecommendedOMPThreadCount();
+  MSHADOW_REAL_TYPE_SWITCH(inputs[0].type_flag_, DType, {
+    for (size_t i = 0; i < inputs.size(); ++i) {
+      out[i] = SumSqCPU(inputs[i].dptr<DType>(), static_cast<index_t>(inputs[i].Size()),
+                        omp_threads);
+    }
+  });
+}
+
+DMLC_REGISTER_PARAMETER(MultiSumSqParam);
+
+NNVM_REGISTER_OP(multi_sum_sq)
+.describe(R"code(Compute the sums of squares of multiple arrays.
+
+The i-th element of the output is the sum of the squared elements of the i-th
+array, accumulated in float32. All arrays are reduced by a single operator call,
+which is used to compute global gradient norms without one reduction per array::
+
+  sum_sq = multi_sum_sq(*grads, num_arrays=len(grads))
+  global_norm = sqrt(sum(sum_sq))
+
+)code" ADD_FILELINE)
+.set_num_inputs([](const nnvm::NodeAttrs& attrs) {
+    const MultiSumSqParam& param = dmlc::get<MultiSumSqParam>(attrs.parsed);
+    return static_cast<uint32_t>(param.num_arrays);
+  })
+.set_num_outputs(1)
+.set_attr_parser(ParamParser<MultiSumSqParam>)
+.set_attr<mxnet::FInferShape>("FInferShape", MultiSumSqShape)
+.set_attr<nnvm::FInferType>("FInferType", MultiSumSqType)
+.set_attr<nnvm::FListInputNames>("FListInputNames",
+  [](const NodeAttrs& attrs) {
+    uint32_t num_args = dmlc::get<MultiSumSqParam>(attrs.parsed).num_arrays;
+    std::vector<std::string> ret;
+    for (uint32_t i = 0; i < num_args; ++i) {
+      ret.push_back(std::string("array_") + std::to_string(i));
+    }
+    return ret;
+  })
+.set_attr<FCompute>("FCompute<cpu>", MultiSumSq<cpu>)
+.add_argument("data", "NDArray-or-Symbol[]", "Arrays")
+.add_arguments(MultiSumSqParam::__FIELDS__());
+
+}  // namespace op
+}  // namespace mxnet
@@ -0,0 +1,97 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*!
+ *  Copyright (c) 2019 by Contributors
+ * \file multi_sum_sq.cu
+ * \brief operator computing the sum of squares of each array in a group of arrays
+ */
+#include <algorithm>
+#include "./multi_sum_sq-inl.h"
+
+namespace mxnet {
+namespace op {
+
+// threads per block and elements reduced by one block
+const int kMultiSumSqBlockSize = 256;
+const int kMultiSumSqChunkSize = 4096;
+
+template <typename DType>
+__global__ void MultiSumSqGPUKernel(const MultiSumSqKernelParam<DType> param, float* out) {
+  __shared__ float partial[kMultiSumSqBlockSize];
+  const int block = blockIdx.x;
+  int index = 0;
+  while (block >= param.block_offsets[index + 1]) {
+    ++index;
+  }
+  const size_t start = static_cast<size_t>(block - param.block_offsets[index]) *
+                       kMultiSumSqChunkSize;
+  const size_t end = start + kMultiSumSqChunkSize < param.sizes[index] ?
+                     start + kMultiSumSqChunkSize : param.sizes[index];
+  float sum = 0.f;
+  for (size_t i = start + threadIdx.x; i < end; i += blockDim.x) {
+    const float val = static_cast<float>(param.arrays[index][i]);
+    sum += val * val;
+  }
+  partial[threadIdx.x] = sum;
+  __syncthreads();
+  for (int stride = blockDim.x / 2; stride > 0; stride >>= 1) {
+    if (threadIdx.x < stride) {
+      partial[threadIdx.x] += partial[threadIdx.x + stride];
+    }
+    __syncthreads();
+  }
+  if (threadIdx.x == 0) {
+    atomicAdd(out + index, partial[0]);
+  }
+}
+
+template<>
+void MultiSumSqCompute<gpu>(const OpContext &ctx,
+                            const std::vector<TBlob> &inputs,
+                            float *out) {
+  using namespace mxnet_op;
+  Stream<gpu>* s = ctx.get_stream<gpu>();
+  const int num_arrays = static_cast<int>(inputs.size());
+  MSHADOW_REAL_TYPE_SWITCH(inputs[0].type_flag_, DType, {
+    const int max_count = MultiSumSqKernelParam<DType>::N;
+    for (int start = 0; start < num_arrays; start += max_count) {
+      const int count = std::min(num_arrays - start, max_count);
+      MultiSumSqKernelParam<DType> param =
+        FillMultiSumSqKernelParam<gpu, DType>(ctx, inputs, start, count);
+      param.block_offsets[0] = 0;
+      for (int i = 0; i < count; ++i) {
+        const int blocks = static_cast<int>((param.sizes[i] + kMultiSumSqChunkSize - 1) /
+                                            kMultiSumSqChunkSize);
+        param.block_offsets[i + 1] = param.block_offsets[i] + blocks;
+      }
+      const int num_blocks = param.block_offsets[count];
+      if (num_blocks == 0) continue;
+      MultiSumSqGPUKernel<DType><<<num_blocks, kMultiSumSqBlockSize, 0,
+                                   mshadow::Stream<gpu>::GetStream(s)>>>(param, out + start);
+      MSHADOW_CUDA_POST_KERNEL_CHECK(MultiSumSqGPUKernel<DType>);
+    }
+  });
+}
+
+NNVM_REGISTER_OP(multi_sum_sq)
+.set_attr<FCompute>("FCompute<gpu>", MultiSumSq<gpu>);
+
+}  // namespace op
+}  // namespace mxnet
@@ -379,6 +379,451 @@ inline void MultiSGDMomUpdate(const nnvm::NodeAttrs& attrs,
   });
 }
 
+struct MultiAdamParam : public dmlc::Parameter<MultiAdamParam> {
+  mxnet::Tuple<float> lrs;
+  mxnet::Tuple<float> wds;
+  float beta1;
+  float beta2;
+  float epsilon;
+  float rescale_grad;
+  float clip_gradient;
+  int num_weights;
+  DMLC_DECLARE_PARAMETER(MultiAdamParam) {
+    DMLC_DECLARE_FIELD(lrs)
+    .describe("Learning rates. Bias correction is expected to be folded in.");
+    DMLC_DECLARE_FIELD(wds)
+    .describe("Weight decay augments the objective function with a "
+              "regularization term that penalizes large weights. "
+              "The penalty scales with the square of the magnitude of each weight.");
+    DMLC_DECLARE_FIELD(beta1)
+    .set_default(0.9f)
+    .describe("The decay rate for the 1st moment estimates.");
+    DMLC_DECLARE_FIELD(beta2)
+    .set_default(0.999f)
+    .describe("The decay rate for the 2nd moment estimates.");
+    DMLC_DECLARE_FIELD(epsilon)
+    .set_default(1e-8f)
+    .describe("A small constant for numerical stability.");
+    DMLC_DECLARE_FIELD(rescale_grad)
+    .set_default(1.0f)
+    .describe("Rescale gradient to grad = rescale_grad*grad.");
+    DMLC_DECLARE_FIELD(clip_gradient)
+    .set_default(-1.0f)
+    .describe("Clip gradient to the range of [-clip_gradient, clip_gradient] "
+              "If clip_gradient <= 0, gradient clipping is turned off. "
+              "grad = max(min(grad, clip_gradient), -clip_gradient).");
+    DMLC_DECLARE_FIELD(num_weights)
+    .set_default(1)
+    .describe("Number of updated weights.");
+  }
+};
+
+struct MultiRMSPropParam : public dmlc::Parameter<MultiRMSPropParam> {
+  mxnet::Tuple<float> lrs;
+  mxnet::Tuple<float> wds;
+  float gamma1;
+  float epsilon;
+  float rescale_grad;
+  float clip_gradient;
+  float clip_weights;
+  int num_weights;
+  DMLC_DECLARE_PARAMETER(MultiRMSPropParam) {
+    DMLC_DECLARE_FIELD(lrs)
+    .describe("Learning rates.");
+    DMLC_DECLARE_FIELD(wds)
+    .describe("Weight decay augments the objective function with a "
+              "regularization term that penalizes large weights. "
+              "The penalty scales with the square of the magnitude of each weight.");
+    DMLC_DECLARE_FIELD(gamma1).set_default(0.95f)
+    .describe("The decay rate of momentum estimates.");
+    DMLC_DECLARE_FIELD(epsilon).set_default(1e-8f)
+    .describe("A small constant for numerical stability.");
+    DMLC_DECLARE_FIELD(rescale_grad)
+    .set_default(1.0f)
+    .describe("Rescale gradient to grad = rescale_grad*grad.");
+    DMLC_DECLARE_FIELD(clip_gradient)
+    .set_default(-1.0f)
+    .describe("Clip gradient to the range of [-clip_gradient, clip_gradient] "
+              "If clip_gradient <= 0, gradient clipping is turned off. "
+              "grad = max(min(grad, clip_gradient), -clip_gradient).");
+    DMLC_DECLARE_FIELD(clip_weights)
+    .set_default(-1.0f)
+    .describe("Clip weights to the range of [-clip_weights, clip_weights] "
+              "If clip_weights <= 0, weight clipping is turned off. "
+              "weights = max(min(weights, clip_weights), -clip_weights).");
+    DMLC_DECLARE_FIELD(num_weights)
+    .set_default(1)
+    .describe("Number of updated weights.");
+  }
+};
+
+struct MultiNAGMomParam : public dmlc::Parameter<MultiNAGMomParam> {
+  mxnet::Tuple<float> lrs;
+  mxnet::Tuple<float> wds;
+  float momentum;
+  float rescale_grad;
+  float clip_gradient;
+  int num_weights;
+  DMLC_DECLARE_PARAMETER(MultiNAGMomParam) {
+    DMLC_DECLARE_FIELD(lrs)
+    .describe("Learning rates.");
+    DMLC_DECLARE_FIELD(wds)
+    .describe("Weight decay augments the objective function with a "
+              "regularization term that penalizes large weights. "
+              "The penalty scales with the square of the magnitude of each weight.");
+    DMLC_DECLARE_FIELD(momentum)
+    .set_default(0.0f)
+    .describe("The decay rate of momentum estimates at each epoch.");
+    DMLC_DECLARE_FIELD(rescale_grad)
+    .set_default(1.0f)
+    .describe("Rescale gradient to grad = rescale_grad*grad.");
+    DMLC_DECLARE_FIELD(clip_gradient)
+    .set_default(-1.0f)
+    .describe("Clip gradient to the range of [-clip_gradient, clip_gradient] "
+              "If clip_gradient <= 0, gradient clipping is turned off. "
+              "grad = max(min(grad, clip_gradient), -clip_gradient).");
+    DMLC_DECLARE_FIELD(num_weights)
+    .set_default(1)
+    .describe("Number of updated weights.");
+  }
+};
+
+struct MultiAdagradParam : public dmlc::Parameter<MultiAdagradParam> {
+  mxnet::Tuple<float> lrs;
+  mxnet::Tuple<float> wds;
+  float epsilon;
+  float rescale_grad;
+  float clip_gradient;
+  int num_weights;
+  DMLC_DECLARE_PARAMETER(MultiAdagradParam) {
+    DMLC_DECLARE_FIELD(lrs)
+    .describe("Learning rates.");
+    DMLC_DECLARE_FIELD(wds)
+    .describe("Weight decay augments the objective function with a "
+              "regularization term that penalizes large weights. "
+              "The penalty scales with the square of the magnitude of each weight.");
+    DMLC_DECLARE_FIELD(epsilon)
+    .set_default(1.0e-7)
+    .describe("A small constant for numerical stability.");
+    DMLC_DECLARE_FIELD(rescale_grad)
+    .set_default(1.0f)
+    .describe("Rescale gradient to grad = rescale_grad*grad.");
+    DMLC_DECLARE_FIELD(clip_gradient)
+    .set_default(-1.0f)
+    .describe("Clip gradient to the range of [-clip_gradient, clip_gradient] "
+              "If clip_gradient <= 0, gradient clipping is turned off. "
+              "grad = max(min(grad, clip_gradient), -clip_gradient).");
+    DMLC_DECLARE_FIELD(num_weights)
+    .set_default(1)
+    .describe("Number of updated weights.");
+  }
+};
+
+struct MultiFtrlParam : public dmlc::Parameter<MultiFtrlParam> {
+  mxnet::Tuple<float> lrs;
+  mxnet::Tuple<float> wds;
+  float lamda1;
+  float beta;
+  float rescale_grad;
+  float clip_gradient;
+  int num_weights;
+  DMLC_DECLARE_PARAMETER(MultiFtrlParam) {
+    DMLC_DECLARE_FIELD(lrs)
+    .describe("Learning rates.");
+    DMLC_DECLARE_FIELD(wds)
+    .describe("Weight decay augments the objective function with a "
+              "regularization term that penalizes large weights. "
+              "The penalty scales with the square of the magnitude of each weight.");
+    DMLC_DECLARE_FIELD(lamda1)
+    .set_default(0.01f)
+    .describe("The L1 regularization coefficient.");
+    DMLC_DECLARE_FIELD(beta)
+    .set_default(1.0f)
+    .describe("Per-Coordinate Learning Rate beta.");
+    DMLC_DECLARE_FIELD(rescale_grad)
+    .set_default(1.0f)
+    .describe("Rescale gradient to grad = rescale_grad*grad.");
+    DMLC_DECLARE_FIELD(clip_gradient)
+    .set_default(-1.0f)
+    .describe("Clip gradient to the range of [-clip_gradient, clip_gradient] "
+              "If clip_gradient <= 0, gradient clipping is turned off. "
+              "grad = max(min(grad, clip_gradient), -clip_gradient).");
+    DMLC_DECLARE_FIELD(num_weights)
+    .set_default(1)
+    .describe("Number of updated weights.");
+  }
+};
+
+/*!
+ * \brief Pointers and per-weight hyperparameters of up to N tensors updated by
+ *        a single kernel launch. Each weight is followed in the input list by its
+ *        gradient and `num_states` optimizer states.
+ */
+template<typename DType, int num_states>
+struct MultiTensorKernelParam {
+  static const int N = 60;
+  int count;
+  size_t max_size;
+  size_t sizes[N];
+  DType * weights[N];
+  DType * grads[N];
+  DType * states[num_states][N];
+  DType * out_data[N];
+  DType lrs[N];
+  DType wds[N];
+};
+
+template<typename xpu, typename DType, typename ParamType, int num_states>
+MultiTensorKernelParam<DType, num_states>
+FillMultiTensorKernelParam(const nnvm::NodeAttrs& attrs,
+                           const OpContext &ctx,
+                           const std::vector<TBlob> &inputs,
+                           const std::vector<TBlob> &outputs) {
+  using namespace mxnet_op;
+  const int input_stride = 2 + num_states;
+  const ParamType& p = nnvm::get<ParamType>(attrs.parsed);
+  Stream<xpu>* s = ctx.get_stream<xpu>();
+  MultiTensorKernelParam<DType, num_states> param;
+  const int max_weights = MultiTensorKernelParam<DType, num_states>::N;
+  CHECK_LE(p.num_weights, max_weights)
+    << "At most " << max_weights << " weights can be updated by a single "
+    << "multi-tensor update, got " << p.num_weights;
+  param.count = p.num_weights;
+  param.max_size = 0;
+  for (int i = 0; i < param.count; ++i) {
+    param.sizes[i] = inputs[i * input_stride].shape_.Size();
+    if (param.max_size < param.sizes[i]) {
+      param.max_size = param.sizes[i];
+    }
+    param.weights[i] = inputs[i * input_stride].FlatTo2D<xpu, DType>(s).dptr_;
+    param.grads[i] = inputs[i * input_stride + 1].FlatTo2D<xpu, DType>(s).dptr_;
+    for (int j = 0; j < num_states; ++j) {
+      param.states[j][i] = inputs[i * input_stride + 2 + j].FlatTo2D<xpu, DType>(s).dptr_;
+    }
+    param.out_data[i] = outputs[i].FlatTo2D<xpu, DType>(s).dptr_;
+    param.lrs[i] = p.lrs[i];
+    param.wds[i] = p.wds[i];
+  }
+  return param;
+}
+
+struct MultiAdamKernel {
+  template<typename DType>
+  MSHADOW_XINLINE static void Map(int i, const MultiTensorKernelParam<DType, 2>& param,
+    const DType clip_gradient, const DType rescale_grad,
+    const DType beta1, const DType beta2, const DType epsilon,
+    const OpReqType req) {
+    using namespace mshadow_op;
+    for (int index = 0; index < param.count; ++index) {
+      if ((size_t)i < param.sizes[index]) {
+        const DType w = param.weights[index][i];
+        DType* mean = param.states[0][index];
+        DType* var = param.states[1][index];
+        DType grad_rescaled = param.grads[index][i] * rescale_grad + w * param.wds[index];
+        if (clip_gradient >= 0.f) {
+          grad_rescaled = clip::Map(grad_rescaled, clip_gradient);
+        }
+        mean[i] = beta1 * mean[i] + (1.f - beta1) * grad_rescaled;
+        var[i] = beta2 * var[i] + (1.f - beta2) * grad_rescaled * grad_rescaled;
+        KERNEL_ASSIGN(param.out_data[index][i], req, w - param.lrs[index] * mean[i] /
+                      (square_root::Map(var[i]) + epsilon));
+      }
+    }
+  }
+};
+
+struct MultiRMSPropKernel {
+  template<typename DType>
+  MSHADOW_XINLINE static void Map(int i, const MultiTensorKernelParam<DType, 1>& param,
+    const DType clip_gradient, const DType rescale_grad,
+    const DType gamma1, const DType clip_weights, const DType epsilon,
+    const OpReqType req) {
+    using namespace mshadow_op;
+    for (int index = 0; index < param.count; ++index) {
+      if ((size_t)i < param.sizes[index]) {
+        const DType w = param.weights[index][i];
+        DType* state_n = param.states[0][index];
+        DType grad_rescaled = rescale_grad * param.grads[index][i] + param.wds[index] * w;
+        if (clip_gradient >= 0.0f) {
+          grad_rescaled = clip::Map(grad_rescaled, clip_gradient);
+        }
+        state_n[i] = (1.f - gamma1) * (grad_rescaled * grad_rescaled) + gamma1 * state_n[i];
+        DType weight = w - param.lrs[index] *
+                       (grad_rescaled / square_root::Map(state_n[i] + epsilon));
+        if (clip_weights >= 0.0f) {
+          weight = clip::Map(weight, clip_weights);
+        }
+        KERNEL_ASSIGN(param.out_data[index][i], req, weight);
+      }
+    }
+  }
+};
+
+struct MultiNAGMomKernel {
+  template<typename DType>
+  MSHADOW_XINLINE static void Map(int i, const MultiTensorKernelParam<DType, 1>& param,
+    const DType clip_gradient, const DType rescale_grad, const DType momentum,
+    const OpReqType req) {
+    using namespace mshadow_op;
+    for (int index = 0; index < param.count; ++index) {
+      if ((size_t)i < param.sizes[index]) {
+        const DType w = param.weights[index][i];
+        DType grad_rescaled = rescale_grad * param.grads[index][i];
+        if (clip_gradient >= 0.0f) {
+          grad_rescaled = clip::Map(grad_rescaled, clip_gradient);
+        }
+        const DType mom = momentum * param.states[0][index][i];
+        const DType step = param.lrs[index] * (grad_rescaled + param.wds[index] * w);
+        KERNEL_ASSIGN(param.out_data[index][i], req, w - mom + (momentum + 1) * (mom - step));
+        param.states[0][index][i] = mom - step;
+      }
+    }
+  }
+};
+
+struct MultiAdagradKernel {
+  template<typename DType>
+  MSHADOW_XINLINE static void Map(int i, const MultiTensorKernelParam<DType, 1>& param,
+    const DType clip_gradient, const DType rescale_grad, const DType epsilon,
+    const OpReqType req) {
+    using namespace mshadow_op;
+    for (int index = 0; index < param.count; ++index) {
+      if ((size_t)i < param.sizes[index]) {
+        const DType w = param.weights[index][i];
+        DType* history = param.states[0][index];
+        DType grad_rescaled = rescale_grad * param.grads[index][i];
+        if (clip_gradient >= 0.0f) {
+          grad_rescaled = clip::Map(grad_rescaled, clip_gradient);
+        }
+        history[i] += grad_rescaled * grad_rescaled;
+        const DType div = grad_rescaled / square_root::Map(history[i] + epsilon);
+        KERNEL_ASSIGN(param.out_data[index][i], req,
+                      w - (div + param.wds[index] * w) * param.lrs[index]);
+      }
+    }
+  }
+};
+
+struct MultiFtrlKernel {
+  template<typename DType>
+  MSHADOW_XINLINE static void Map(int i, const MultiTensorKernelParam<DType, 2>& param,
+    const DType clip_gradient, const DType rescale_grad,
+    const DType beta, const DType lamda1, const OpReqType req) {
+    using namespace mshadow_op;
+    for (int index = 0; index < param.count; ++index) {
+      if ((size_t)i < param.sizes[index]) {
+        const DType w = param.weights[index][i];
+        const DType lr = param.lrs[index];
+        DType* z = param.states[0][index];
+        DType* n = param.states[1][index];
+        DType grad_rescaled = param.grads[index][i] * rescale_grad;
+        if (clip_gradient >= 0.0f) {
+          grad_rescaled = clip::Map(grad_rescaled, clip_gradient);
+        }
+        z[i] += grad_rescaled - (square_root::Map(n[i] + square::Map(grad_rescaled)) -
+                                 square_root::Map(n[i])) * w / lr;
+        n[i] += square::Map(grad_rescaled);
+        KERNEL_ASSIGN(param.out_data[index][i], req,
+                      (sign::Map(z[i]) * lamda1 - z[i]) /
+                      ((beta + square_root::Map(n[i])) / lr + param.wds[index]) *
+                      gt::Map(abs::Map(z[i]), lamda1));
+      }
+    }
+  }
+};
+
+template<typename xpu>
+inline void MultiAdamUpdate(const nnvm::NodeAttrs& attrs,
+                            const OpContext &ctx,
+                            const std::vector<TBlob> &inputs,
+                            const std::vector<OpReqType> &req,
+                            const std::vector<TBlob> &outputs) {
+  using namespace mxnet_op;
+  const MultiAdamParam& p = nnvm::get<MultiAdamParam>(attrs.parsed);
+  Stream<xpu>* s = ctx.get_stream<xpu>();
+  MSHADOW_REAL_TYPE_SWITCH(outputs[0].type_flag_, DType, {
+    MultiTensorKernelParam<DType, 2> param =
+      FillMultiTensorKernelParam<xpu, DType, MultiAdamParam, 2>(attrs, ctx, inputs, outputs);
+    Kernel<MultiAdamKernel, xpu>::Launch(s, param.max_size, param,
+      static_cast<DType>(p.clip_gradient), static_cast<DType>(p.rescale_grad),
+      static_cast<DType>(p.beta1), static_cast<DType>(p.beta2),
+      static_cast<DType>(p.epsilon), req[0]);
+  });
+}
+
+template<typename xpu>
+inline void MultiRMSPropUpdate(const nnvm::NodeAttrs& attrs,
+                               const OpContext &ctx,
+                               const std::vector<TBlob> &inputs,
+                               const std::vector<OpReqType> &req,
+                               const std::vector<TBlob> &outputs) {
+  using namespace mxnet_op;
+  const MultiRMSPropParam& p = nnvm::get<MultiRMSPropParam>(attrs.parsed);
+  Stream<xpu>* s = ctx.get_stream<xpu>();
+  MSHADOW_REAL_TYPE_SWITCH(outputs[0].type_flag_, DType, {
+    MultiTensorKernelParam<DType, 1> param =
+      FillMultiTensorKernelParam<xpu, DType, MultiRMSPropParam, 1>(attrs, ctx, inputs, outputs);
+    Kernel<MultiRMSPropKernel, xpu>::Launch(s, param.max_size, param,
+      static_cast<DType>(p.clip_gradient), static_cast<DType>(p.rescale_grad),
+      static_cast<DType>(p.gamma1), static_cast<DType>(p.clip_weights),
+      static_cast<DType>(p.epsilon), req[0]);
+  });
+}
+
+template<typename xpu>
+inline void MultiNAGMomUpdate(const nnvm::NodeAttrs& attrs,
+                              const OpContext &ctx,
+                              const std::vector<TBlob> &inputs,
+                              const std::vector<OpReqType> &req,
+                              const std::vector<TBlob> &outputs) {
+  using namespace mxnet_op;
+  const MultiNAGMomParam& p = nnvm::get<MultiNAGMomParam>(attrs.parsed);
+  Stream<xpu>* s = ctx.get_stream<xpu>();
+  MSHADOW_REAL_TYPE_SWITCH(outputs[0].type_flag_, DType, {
+    MultiTensorKernelParam<DType, 1> param =
+      FillMultiTensorKernelParam<xpu, DType, MultiNAGMomParam, 1>(attrs, ctx, inputs, outputs);
+    Kernel<MultiNAGMomKernel, xpu>::Launch(s, param.max_size, param,
+      static_cast<DType>(p.clip_gradient), static_cast<DType>(p.rescale_grad),
+      static_cast<DType>(p.momentum), req[0]);
+  });
+}
+
+template<typename xpu>
+inline void MultiAdagradUpdate(const nnvm::NodeAttrs& attrs,
+                               const OpContext &ctx,
+                               const std::vector<TBlob> &inputs,
+                               const std::vector<OpReqType> &req,
+                               const std::vector<TBlob> &outputs) {
+  using namespace mxnet_op;
+  const MultiAdagradParam& p = nnvm::get<MultiAdagradParam>(attrs.parsed);
+  Stream<xpu>* s = ctx.get_stream<xpu>();
+  MSHADOW_REAL_TYPE_SWITCH(outputs[0].type_flag_, DType, {
+    MultiTensorKernelParam<DType, 1> param =
+      FillMultiTensorKernelParam<xpu, DType, MultiAdagradParam, 1>(attrs, ctx, inputs, outputs);
+    Kernel<MultiAdagradKernel, xpu>::Launch(s, param.max_size, param,
+      static_cast<DType>(p.clip_gradient), static_cast<DType>(p.rescale_grad),
+      static_cast<DType>(p.epsilon), req[0]);
+  });
+}
+
+template<typename xpu>
+inline void MultiFtrlUpdate(const nnvm::NodeAttrs& attrs,
+                            const OpContext &ctx,
+                            const std::vector<TBlob> &inputs,
+                            const std::vector<OpReqType> &req,
+                            const std::vector<TBlob> &outputs) {
+  using namespace mxnet_op;
+  const MultiFtrlParam& p = nnvm::get<MultiFtrlParam>(attrs.parsed);
+  Stream<xpu>* s = ctx.get_stream<xpu>();
+  MSHADOW_REAL_TYPE_SWITCH(outputs[0].type_flag_, DType, {
+    MultiTensorKernelParam<DType, 2> param =
+      FillMultiTensorKernelParam<xpu, DType, MultiFtrlParam, 2>(attrs, ctx, inputs, outputs);
+    Kernel<MultiFtrlKernel, xpu>::Launch(s, param.max_size, param,
+      static_cast<DType>(p.clip_gradient), static_cast<DType>(p.rescale_grad),
+      static_cast<DType>(p.beta), static_cast<DType>(p.lamda1), req[0]);
+  });
+}
+
 struct SGDKernel {
   template<typename DType>
   MSHADOW_XINLINE static void Map(int i, DType* out_data, const DType* weight_data,
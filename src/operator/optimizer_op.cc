@@ -33,6 +33,11 @@ DMLC_REGISTER_PARAMETER(SGDParam);
 DMLC_REGISTER_PARAMETER(SGDMomParam);
 DMLC_REGISTER_PARAMETER(MultiSGDParam);
 DMLC_REGISTER_PARAMETER(MultiSGDMomParam);
+DMLC_REGISTER_PARAMETER(MultiAdamParam);
+DMLC_REGISTER_PARAMETER(MultiRMSPropParam);
+DMLC_REGISTER_PARAMETER(MultiNAGMomParam);
+DMLC_REGISTER_PARAMETER(MultiAdagradParam);
+DMLC_REGISTER_PARAMETER(MultiFtrlParam);
 DMLC_REGISTER_PARAMETER(FTMLParam);
 DMLC_REGISTER_PARAMETER(AdamParam);
 DMLC_REGISTER_PARAMETER(NAGParam);
@@ -505,6 +510,249 @@ Where the parameter ``momentum`` is the decay rate of momentum estimates at each
 .add_argument("data", "NDArray-or-Symbol[]", "Weights")
 .add_arguments(MultiSGDMomParam::__FIELDS__());
 
+NNVM_REGISTER_OP(multi_adam_update)
+.describe(R"code(Adam update for multiple weights with a single kernel launch.
+
+Each weight is updated as in ``adam_update``::
+
+  grad = clip(grad * rescale_grad + wd * weight, clip_gradient)
+  mean = beta1 * mean + (1 - beta1) * grad
+  var = beta2 * var + (1 - beta2) * square(grad)
+  weight = weight - lr * mean / (sqrt(var) + epsilon)
+
+``lrs`` and ``wds`` hold one learning rate and one weight decay per weight. Bias
+correction is expected to be folded into ``lrs`` by the caller.
+
+)code" ADD_FILELINE)
+.set_num_inputs([](const nnvm::NodeAttrs& attrs) {
+    const MultiAdamParam& param = dmlc::get<MultiAdamParam>(attrs.parsed);
+    return static_cast<uint32_t>(param.num_weights * 4);
+  })
+.set_num_outputs([](const nnvm::NodeAttrs& attrs) {
+    const MultiAdamParam& param = dmlc::get<MultiAdamParam>(attrs.parsed);
+    return static_cast<uint32_t>(param.num_weights);
+  })
+.set_attr_parser(ParamParser<MultiAdamParam>)
+.set_attr<mxnet::FInferShape>("FInferShape", MultiSGDShape<MultiAdamParam, 4>)
+.set_attr<nnvm::FInferType>("FInferType", ElemwiseType<-1, -1>)
+.set_attr<nnvm::FListInputNames>("FListInputNames",
+  [](const NodeAttrs& attrs) {
+    uint32_t num_args = dmlc::get<MultiAdamParam>(attrs.parsed).num_weights;
+    std::vector<std::string> ret;
+    for (uint32_t i = 0; i < num_args; ++i) {
+      ret.push_back(std::string("weight_") + std::to_string(i));
+      ret.push_back(std::string("grad_") + std::to_string(i));
+      ret.push_back(std::string("mean_") + std::to_string(i));
+      ret.push_back(std::string("var_") + std::to_string(i));
+    }
+    return ret;
+  })
+.set_attr<nnvm::FMutateInputs>("FMutateInputs",
+  [](const nnvm::NodeAttrs& attrs) {
+    std::vector<uint32_t> ret;
+    const MultiAdamParam& param = dmlc::get<MultiAdamParam>(attrs.parsed);
+    for (int i = 0; i < param.num_weights; ++i) {
+      ret.push_back(i * 4 + 2);
+      ret.push_back(i * 4 + 3);
+    }
+    return ret;
+  })
+.set_attr<FCompute>("FCompute<cpu>", MultiAdamUpdate<cpu>)
+.add_argument("data", "NDArray-or-Symbol[]", "Weights, gradients, means and variances")
+.add_arguments(MultiAdamParam::__FIELDS__());
+
+NNVM_REGISTER_OP(multi_rmsprop_update)
+.describe(R"code(RMSProp update for multiple weights with a single kernel launch.
+
+Each weight is updated as in ``rmsprop_update``::
+
+  grad = clip(grad * rescale_grad + wd * weight, clip_gradient)
+  n = (1 - gamma1) * square(grad) + gamma1 * n
+  weight = clip(weight - lr * grad / sqrt(n + epsilon), clip_weights)
+
+``lrs`` and ``wds`` hold one learning rate and one weight decay per weight.
+
+)code" ADD_FILELINE)
+.set_num_inputs([](const nnvm::NodeAttrs& attrs) {
+    const MultiRMSPropParam& param = dmlc::get<MultiRMSPropParam>(attrs.parsed);
+    return static_cast<uint32_t>(param.num_weights * 3);
+  })
+.set_num_outputs([](const nnvm::NodeAttrs& attrs) {
+    const MultiRMSPropParam& param = dmlc::get<MultiRMSPropParam>(attrs.parsed);
+    return static_cast<uint32_t>(param.num_weights);
+  })
+.set_attr_parser(ParamParser<MultiRMSPropParam>)
+.set_attr<mxnet::FInferShape>("FInferShape", MultiSGDShape<MultiRMSPropParam, 3>)
+.set_attr<nnvm::FInferType>("FInferType", ElemwiseType<-1, -1>)
+.set_attr<nnvm::FListInputNames>("FListInputNames",
+  [](const NodeAttrs& attrs) {
+    uint32_t num_args = dmlc::get<MultiRMSPropParam>(attrs.parsed).num_weights;
+    std::vector<std::string> ret;
+    for (uint32_t i = 0; i < num_args; ++i) {
+      ret.push_back(std::string("weight_") + std::to_string(i));
+      ret.push_back(std::string("grad_") + std::to_string(i));
+      ret.push_back(std::string("n_") + std::to_string(i));
+    }
+    return ret;
+  })
+.set_attr<nnvm::FMutateInputs>("FMutateInputs",
+  [](const nnvm::NodeAttrs& attrs) {
+    std::vector<uint32_t> ret;
+    const MultiRMSPropParam& param = dmlc::get<MultiRMSPropParam>(attrs.parsed);
+    for (int i = 0; i < param.num_weights; ++i) {
+      ret.push_back(i * 3 + 2);
+    }
+    return ret;
+  })
+.set_attr<FCompute>("FCompute<cpu>", MultiRMSPropUpdate<cpu>)
+.add_argument("data", "NDArray-or-Symbol[]", "Weights, gradients and mean squares")
+.add_arguments(MultiRMSPropParam::__FIELDS__());
+
+NNVM_REGISTER_OP(multi_nag_mom_update)
+.describe(R"code(Nesterov momentum update for multiple weights with a single kernel launch.
+
+Each weight is updated as in ``nag_mom_update``::
+
+  step = lr * (clip(grad * rescale_grad, clip_gradient) + wd * weight)
+  mom = momentum * mom
+  weight = weight - mom + (momentum + 1) * (mom - step)
+  mom = mom - step
+
+``lrs`` and ``wds`` hold one learning rate and one weight decay per weight.
+
+)code" ADD_FILELINE)
+.set_num_inputs([](const nnvm::NodeAttrs& attrs) {
+    const MultiNAGMomParam& param = dmlc::get<MultiNAGMomParam>(attrs.parsed);
+    return static_cast<uint32_t>(param.num_weights * 3);
+  })
+.set_num_outputs([](const nnvm::NodeAttrs& attrs) {
+    const MultiNAGMomParam& param = dmlc::get<MultiNAGMomParam>(attrs.parsed);
+    return static_cast<uint32_t>(param.num_weights);
+  })
+.set_attr_parser(ParamParser<MultiNAGMomParam>)
+.set_attr<mxnet::FInferShape>("FInferShape", MultiSGDShape<MultiNAGMomParam, 3>)
+.set_attr<nnvm::FInferType>("FInferType", ElemwiseType<-1, -1>)
+.set_attr<nnvm::FListInputNames>("FListInputNames",
+  [](const NodeAttrs& attrs) {
+    uint32_t num_args = dmlc::get<MultiNAGMomParam>(attrs.parsed).num_weights;
+    std::vector<std::string> ret;
+    for (uint32_t i = 0; i < num_args; ++i) {
+      ret.push_back(std::string("weight_") + std::to_string(i));
+      ret.push_back(std::string("grad_") + std::to_string(i));
+      ret.push_back(std::string("mom_") + std::to_string(i));
+    }
+    return ret;
+  })
+.set_attr<nnvm::FMutateInputs>("FMutateInputs",
+  [](const nnvm::NodeAttrs& attrs) {
+    std::vector<uint32_t> ret;
+    const MultiNAGMomParam& param = dmlc::get<MultiNAGMomParam>(attrs.parsed);
+    for (int i = 0; i < param.num_weights; ++i) {
+      ret.push_back(i * 3 + 2);
+    }
+    return ret;
+  })
+.set_attr<FCompute>("FCompute<cpu>", MultiNAGMomUpdate<cpu>)
+.add_argument("data", "NDArray-or-Symbol[]", "Weights, gradients and momentum")
+.add_arguments(MultiNAGMomParam::__FIELDS__());
+
+NNVM_REGISTER_OP(multi_adagrad_update)
+.describe(R"code(AdaGrad update for multiple dense weights with a single kernel launch.
+
+Each weight is updated by::
+
+  grad = clip(grad * rescale_grad, clip_gradient)
+  history = history + square(grad)
+  weight = weight - lr * (grad / sqrt(history + epsilon) + wd * weight)
+
+``lrs`` and ``wds`` hold one learning rate and one weight decay per weight.
+
+)code" ADD_FILELINE)
+.set_num_inputs([](const nnvm::NodeAttrs& attrs) {
+    const MultiAdagradParam& param = dmlc::get<MultiAdagradParam>(attrs.parsed);
+    return static_cast<uint32_t>(param.num_weights * 3);
+  })
+.set_num_outputs([](const nnvm::NodeAttrs& attrs) {
+    const MultiAdagradParam& param = dmlc::get<MultiAdagradParam>(attrs.parsed);
+    return static_cast<uint32_t>(param.num_weights);
+  })
+.set_attr_parser(ParamParser<MultiAdagradParam>)
+.set_attr<mxnet::FInferShape>("FInferShape", MultiSGDShape<MultiAdagradParam, 3>)
+.set_attr<nnvm::FInferType>("FInferType", ElemwiseType<-1, -1>)
+.set_attr<nnvm::FListInputNames>("FListInputNames",
+  [](const NodeAttrs& attrs) {
+    uint32_t num_args = dmlc::get<MultiAdagradParam>(attrs.parsed).num_weights;
+    std::vector<std::string> ret;
+    for (uint32_t i = 0; i < num_args; ++i) {
+      ret.push_back(std::string("weight_") + std::to_string(i));
+      ret.push_back(std::string("grad_") + std::to_string(i));
+      ret.push_back(std::string("history_") + std::to_string(i));
+    }
+    return ret;
+  })
+.set_attr<nnvm::FMutateInputs>("FMutateInputs",
+  [](const nnvm::NodeAttrs& attrs) {
+    std::vector<uint32_t> ret;
+    const MultiAdagradParam& param = dmlc::get<MultiAdagradParam>(attrs.parsed);
+    for (int i = 0; i < param.num_weights; ++i) {
+      ret.push_back(i * 3 + 2);
+    }
+    return ret;
+  })
+.set_attr<FCompute>("FCompute<cpu>", MultiAdagradUpdate<cpu>)
+.add_argument("data", "NDArray-or-Symbol[]", "Weights, gradients and accumulated squared gradients")
+.add_arguments(MultiAdagradParam::__FIELDS__());
+
+NNVM_REGISTER_OP(multi_ftrl_update)
+.describe(R"code(Ftrl update for multiple weights with a single kernel launch.
+
+Each weight is updated as in ``ftrl_update``::
+
+  rescaled_grad = clip(grad * rescale_grad, clip_gradient)
+  z += rescaled_grad - (sqrt(n + rescaled_grad**2) - sqrt(n)) * weight / lr
+  n += rescaled_grad**2
+  w = (sign(z) * lamda1 - z) / ((beta + sqrt(n)) / lr + wd) * (abs(z) > lamda1)
+
+``lrs`` and ``wds`` hold one learning rate and one weight decay per weight.
+
+)code" ADD_FILELINE)
+.set_num_inputs([](const nnvm::NodeAttrs& attrs) {
+    const MultiFtrlParam& param = dmlc::get<MultiFtrlParam>(attrs.parsed);
+    return static_cast<uint32_t>(param.num_weights * 4);
+  })
+.set_num_outputs([](const nnvm::NodeAttrs& attrs) {
+    const MultiFtrlParam& param = dmlc::get<MultiFtrlParam>(attrs.parsed);
+    return static_cast<uint32_t>(param.num_weights);
+  })
+.set_attr_parser(ParamParser<MultiFtrlParam>)
+.set_attr<mxnet::FInferShape>("FInferShape", MultiSGDShape<MultiFtrlParam, 4>)
+.set_attr<nnvm::FInferType>("FInferType", ElemwiseType<-1, -1>)
+.set_attr<nnvm::FListInputNames>("FListInputNames",
+  [](const NodeAttrs& attrs) {
+    uint32_t num_args = dmlc::get<MultiFtrlParam>(attrs.parsed).num_weights;
+    std::vector<std::string> ret;
+    for (uint32_t i = 0; i < num_args; ++i) {
+      ret.push_back(std::string("weight_") + std::to_string(i));
+      ret.push_back(std::string("grad_") + std::to_string(i));
+      ret.push_back(std::string("z_") + std::to_string(i));
+      ret.push_back(std::string("n_") + std::to_string(i));
+    }
+    return ret;
+  })
+.set_attr<nnvm::FMutateInputs>("FMutateInputs",
+  [](const nnvm::NodeAttrs& attrs) {
+    std::vector<uint32_t> ret;
+    const MultiFtrlParam& param = dmlc::get<MultiFtrlParam>(attrs.parsed);
+    for (int i = 0; i < param.num_weights; ++i) {
+      ret.push_back(i * 4 + 2);
+      ret.push_back(i * 4 + 3);
+    }
+    return ret;
+  })
+.set_attr<FCompute>("FCompute<cpu>", MultiFtrlUpdate<cpu>)
+.add_argument("data", "NDArray-or-Symbol[]", "Weights, gradients, z and n")
+.add_arguments(MultiFtrlParam::__FIELDS__());
+
 NNVM_REGISTER_OP(sgd_update)
 MXNET_ADD_SPARSE_OP_ALIAS(sgd_update)
 .describe(R"code(Update function for Stochastic Gradient Descent (SGD) optimizer.
@@ -251,6 +251,17 @@ NNVM_REGISTER_OP(multi_mp_sgd_update)
 NNVM_REGISTER_OP(multi_mp_sgd_mom_update)
 .set_attr<FCompute>("FCompute<gpu>", MultiSGDMomUpdate<gpu, single_precision, 4>);
 
+NNVM_REGISTER_OP(multi_adam_update)
+.set_attr<FCompute>("FCompute<gpu>", MultiAdamUpdate<gpu>);
+NNVM_REGISTER_OP(multi_rmsprop_update)
+.set_attr<FCompute>("FCompute<gpu>", MultiRMSPropUpdate<gpu>);
+NNVM_REGISTER_OP(multi_nag_mom_update)
+.set_attr<FCompute>("FCompute<gpu>", MultiNAGMomUpdate<gpu>);
+NNVM_REGISTER_OP(multi_adagrad_update)
+.set_attr<FCompute>("FCompute<gpu>", MultiAdagradUpdate<gpu>);
+NNVM_REGISTER_OP(multi_ftrl_update)
+.set_attr<FCompute>("FCompute<gpu>", MultiFtrlUpdate<gpu>);
+
 NNVM_REGISTER_OP(nag_mom_update)
 .set_attr<FCompute>("FCompute<gpu>", NAGMomUpdate<gpu>);
 
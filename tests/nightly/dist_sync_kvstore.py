@@ -26,6 +26,7 @@ import numpy as np
 import numpy.random as rnd
 from mxnet.test_utils import assert_almost_equal, assert_exception
 from test_kvstore import compute_expected_2bit_quantization
+from test_kvstore import compute_expected_1bit_quantization, compute_expected_topk_quantization
 
 def check_diff(A, x, rank=None):
     """ assert A == x
@@ -328,6 +329,39 @@ def test_sync_2bit_compression(threshold, nrepeat):
     check_compr_random(threshold, nrepeat)
     print('worker ' + str(my_rank) + ' is done with compression tests')
 
+def test_sync_sparsified_compression(compression, ratio, nrepeat):
+    # set a seed so all workers generate same data. knowing this helps
+    # calculate expected value after pull
+    mx.random.seed(123)
+    rnd.seed(123)
+    for k, s in compr_random_keys_shapes:
+        kv.init(k, mx.nd.zeros(s))
+    for k, s in compr_random_keys_shapes:
+        curr_residual = np.zeros(s)
+        for l in range(nrepeat):
+            orig_val = mx.nd.zeros(s)
+            kv.pull(k, orig_val)
+
+            grad = mx.nd.array(rnd.rand(s[0], s[1]) - 0.5)
+            # creates a copy because push changes grad because of assignment
+            grad_cpy = mx.nd.array(grad)
+            kv.push(k, grad)
+            val = mx.nd.zeros(s)
+            kv.pull(k, val)
+
+            diff = val - orig_val
+
+            # big arrays are split across servers at block boundaries,
+            # so the expected value can be simulated on the whole array
+            if compression == '1bit':
+                curr_residual, decompr = compute_expected_1bit_quantization(grad_cpy, curr_residual)
+            else:
+                curr_residual, decompr = compute_expected_topk_quantization(grad_cpy, curr_residual,
+                                                                            ratio)
+            decompr *= nworker * rate
+            assert_almost_equal(diff.asnumpy(), decompr, rtol=1e-4, atol=1e-5)
+    print('worker ' + str(my_rank) + ' is done with ' + compression + ' compression tests')
+
 def test_sync_init(gpu_tests=False):
     def get_dtype(idx, cur_keys):
         if idx < len(cur_keys)/2:
@@ -415,6 +449,57 @@ def test_gluon_trainer_step():
     check_trainer_step()
     print('worker ' + str(my_rank) + ' passed test_gluon_trainer_step')
 
+def test_gluon_trainer_overlap_step():
+    def check_trainer_overlap_step(grad_bucket_size):
+        ctx = mx.cpu(0)
+        params = mx.gluon.ParameterDict()
+        xs = [params.get('x%d' % i, shape=(10, i + 1)) for i in range(4)]
+        params.initialize(ctx=ctx, init='ones')
+        trainer = mx.gluon.Trainer(params, 'sgd', {'learning_rate': 1.0, 'multi_precision': False},
+                                   kvstore=kv, update_on_kvstore=False,
+                                   grad_bucket_size=grad_bucket_size, overlap_grad_comm=True)
+        with mx.autograd.record():
+            y = sum([((my_rank + 1) * x.data(ctx)).sum() for x in xs])
+        y.backward()
+        trainer.step(1)
+        expected = 1 - (1 + nworker) * nworker / 2
+        for x in xs:
+            assert_almost_equal(x.data(ctx).asnumpy(), np.full(x.shape, expected))
+    check_trainer_overlap_step(0)
+    check_trainer_overlap_step(256)
+    print('worker ' + str(my_rank) + ' passed test_gluon_trainer_overlap_step')
+
+def test_gluon_trainer_local_sgd():
+    def check_trainer_local_sgd():
+        ctx = mx.cpu(0)
+        shape = (10, 1)
+        x = mx.gluon.Parameter('x', shape=shape)
+        x.initialize(ctx=ctx, init='ones')
+        trainer = mx.gluon.Trainer([x], 'sgd', {'learning_rate': 1.0, 'momentum': 0.5},
+                                   kvstore=kv, local_sgd_steps=2,
+                                   local_sgd_average_states=True)
+        expected = np.ones(shape)
+        mom = np.zeros(shape)
+        for i in range(2):
+            with mx.autograd.record():
+                w = x.data(ctx)
+                y = (my_rank + 1) * w
+                y.backward()
+            trainer.step(1)
+            mom = 0.5 * mom - (my_rank + 1)
+            expected += mom
+            if i == 0:
+                # the first step is local
+                assert_almost_equal(x.data(ctx).asnumpy(), expected)
+        # the weight is 1 - 2.5 * (rank + 1) and the momentum -1.5 * (rank + 1)
+        # on every worker, which are averaged over the workers
+        expected = np.full(shape, 1 - 2.5 * (nworker + 1) / 2.0)
+        assert_almost_equal(x.data(ctx).asnumpy(), expected)
+        mom = np.full(shape, -1.5 * (nworker + 1) / 2.0)
+        assert_almost_equal(trainer._updaters[0].states[0].asnumpy(), mom)
+    check_trainer_local_sgd()
+    print('worker ' + str(my_rank) + ' passed test_gluon_trainer_local_sgd')
+
 def test_gluon_trainer_sparse_step():
     def check_trainer_sparse_step():
         ctx = mx.cpu(0)
@@ -444,6 +529,10 @@ if __name__ == "__main__":
         test_gluon_trainer_type()
     elif opt.type == 'gluon_step_cpu':
         test_gluon_trainer_step()
+    elif opt.type == 'gluon_overlap_step_cpu':
+        test_gluon_trainer_overlap_step()
+    elif opt.type == 'gluon_local_sgd_cpu':
+        test_gluon_trainer_local_sgd()
     elif opt.type == 'gluon_sparse_step_cpu':
         test_gluon_trainer_sparse_step()
     elif opt.type == 'invalid_cpu':
@@ -458,5 +547,10 @@ if __name__ == "__main__":
         kv, threshold = init_kv_compressed(kv)
         kv = set_optimizer(use_multiprecision=opt.multiprecision)
         test_sync_2bit_compression(threshold, opt.nrepeat)
+    elif opt.type in ['compressed_1bit_cpu', 'compressed_topk_cpu']:
+        compression = opt.type.split('_')[1]
+        kv.set_gradient_compression({'type': compression, 'ratio': 0.01})
+        kv = set_optimizer(use_multiprecision=opt.multiprecision)
+        test_sync_sparsified_compression(compression, 0.01, opt.nrepeat)
     else:
         raise RuntimeError("Unknown test type")
@@ -75,6 +75,59 @@ def compute_expected_2bit_quantization(arr, curr_residual, threshold):
         i+=32
     return np.array(compr), np.array(new_residual).reshape(arr.shape), np.array(decompr).reshape(arr.shape)
 
+def compute_expected_1bit_quantization(arr, curr_residual, block_size=256):
+    vals = (arr.asnumpy() + curr_residual).reshape(-1).astype(np.float32)
+    decompr = np.zeros_like(vals)
+    for start in range(0, vals.size, block_size):
+        block = vals[start:start+block_size]
+        scale = np.abs(block).mean()
+        decompr[start:start+block_size] = np.where(block >= 0, scale, -scale)
+    return (vals - decompr).reshape(arr.shape), decompr.reshape(arr.shape)
+
+def compute_expected_topk_quantization(arr, curr_residual, ratio, block_size=1024):
+    topk = max(1, int(ratio * block_size + 0.5))
+    vals = (arr.asnumpy() + curr_residual).reshape(-1).astype(np.float32)
+    decompr = np.zeros_like(vals)
+    for start in range(0, vals.size, block_size):
+        block = vals[start:start+block_size].copy()
+        for _ in range(topk):
+            i = np.argmax(np.abs(block))
+            decompr[start+i] += block[i]
+            block[i] = 0
+    return (vals - decompr).reshape(arr.shape), decompr.reshape(arr.shape)
+
+def test_sparsified_compress_kvstore(kv_type, compression, ratio=0.01):
+    print(kv_type + ' with ' + compression + ' compression')
+    rate = 2
+    kv = mx.kv.create(kv_type)
+    kv.set_gradient_compression({'type': compression, 'ratio': ratio})
+    kv.set_optimizer(mx.optimizer.create('test', rescale_grad=rate))
+    for k, s in zip(keys, shapes):
+        kv.init(k, mx.nd.zeros(s))
+    for k, s in zip(keys, shapes):
+        # residuals are kept per key and device
+        curr_residual = [np.zeros(s) for g in range(nworker)]
+        for r in range(3):
+            orig_val = [mx.nd.zeros(s, mx.gpu(g)) for g in range(nworker)]
+            kv.pull(k, out=orig_val)
+            grads = [mx.nd.random_uniform(-0.6, 0.6, shape=s, ctx=mx.gpu(g)) for g in range(nworker)]
+            grads_cpy = copy.deepcopy(grads)
+            kv.push(k, grads)
+            val = [mx.nd.zeros(s, mx.gpu(g)) for g in range(nworker)]
+            kv.pull(k, out=val)
+            sum_dequantized_vals = np.zeros(s)
+            for g in range(nworker):
+                if compression == '1bit':
+                    curr_residual[g], decompr = compute_expected_1bit_quantization(
+                                                    grads_cpy[g], curr_residual[g])
+                else:
+                    curr_residual[g], decompr = compute_expected_topk_quantization(
+                                                    grads_cpy[g], curr_residual[g], ratio)
+                sum_dequantized_vals += (decompr * rate)
+            for g in range(nworker):
+                assert_almost_equal((val[g] - orig_val[g]).asnumpy(), sum_dequantized_vals,
+                                    rtol=1e-4, atol=1e-5)
+
 ## individual key interface
 def test_kvstore(kv_type, stype):
     print(kv_type)
@@ -252,6 +305,8 @@ if __name__ == "__main__":
 
     ## compression for local kvstore happens only when reduce is on device
     test_compress_kvstore('local_allreduce_device')
+    test_sparsified_compress_kvstore('local_allreduce_device', '1bit')
+    test_sparsified_compress_kvstore('local_allreduce_device', 'topk')
     for stype in stypes:
         test_group_kvstore('local_update_cpu', stype)
         test_group_kvstore('local_allreduce_cpu', stype)
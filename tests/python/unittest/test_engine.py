@@ -15,6 +15,8 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import threading
+
 import nose
 import mxnet as mx
 
@@ -31,6 +33,21 @@ def test_bulk():
     assert (x.asnumpy() == 104).all()
 
 
+def test_on_complete():
+    done = threading.Event()
+    x = mx.nd.ones((100, 100))
+    y = mx.nd.dot(x, x)
+    mx.engine.on_complete([x, y], done.set)
+    assert done.wait(10)
+    assert (y.asnumpy() == 100).all()
+    # the callback also runs if an operation writing the array failed
+    z = mx.nd.random.normal(0, -1, shape=(2,))
+    done.clear()
+    mx.engine.on_complete([z], done.set)
+    assert done.wait(10)
+    nose.tools.assert_raises(mx.MXNetError, z.asnumpy)
+
+
 if __name__ == '__main__':
     import nose
     nose.runmodule()
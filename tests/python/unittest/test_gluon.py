@@ -24,7 +24,7 @@ from mxnet.gluon import nn
 from mxnet.base import py_str
 from mxnet.test_utils import assert_almost_equal
 from mxnet.ndarray.ndarray import _STORAGE_TYPE_STR_TO_ID
-from common import (setup_module, with_seed, assertRaises, teardown,
+from common import (setup_module, with_seed, assertRaises, teardown, TemporaryDirectory,
                     assert_raises_cudnn_not_satisfied)
 import numpy as np
 from numpy.testing import assert_array_equal
@@ -33,6 +33,7 @@ from copy import deepcopy
 import warnings
 import json
 import unittest
+import threading
 
 @with_seed()
 def test_parameter():
@@ -1483,6 +1484,133 @@ def test_hybrid_static_memory_switching():
     check_hybrid_static_memory_switching(static_alloc=True)
     check_hybrid_static_memory_switching(static_alloc=True, static_shape=True)
 
+@with_seed()
+def test_hybrid_cached_op_cache():
+    net = nn.HybridSequential()
+    with net.name_scope():
+        net.add(nn.Dense(3, flatten=False))
+    net.initialize()
+    x = mx.nd.random.uniform(shape=(3, 5, 4))
+    expected = net(x).asnumpy()
+
+    net.hybridize(static_alloc=True, static_shape=True, cache_size=2)
+    for shape in [(3, 5, 4), (3, 6, 4), (3, 5, 4), (3, 7, 4), (3, 5, 4), (3, 6, 4)]:
+        net(mx.nd.ones(shape))
+    stats = net.cached_op_stats()
+    assert stats[((3, 5, 4), 'float32')]['hits'] == 2
+    assert stats[((3, 5, 4), 'float32')]['misses'] == 1
+    # (3, 6, 4) was evicted by (3, 7, 4)
+    assert stats[((3, 6, 4), 'float32')]['misses'] == 2
+    assert stats[((3, 6, 4), 'float32')]['build_time'] > 0
+    assert len(net._cached_ops) == 2
+    assert_almost_equal(net(x).asnumpy(), expected)
+    # statistics are only kept for the most recent 4 * cache_size signatures
+    for length in range(10, 20):
+        net(mx.nd.ones((3, length, 4)))
+    assert list(net.cached_op_stats().keys()) == \
+        [((3, length, 4), 'float32') for length in range(12, 20)]
+
+    # inputs are padded along axis 1 to multiples of 4 and outputs sliced back
+    net.hybridize(static_alloc=True, static_shape=True, cache_size=2, shape_buckets={1: 4})
+    assert_almost_equal(net(x).asnumpy(), expected)
+    net(mx.nd.ones((3, 7, 4)))
+    net(mx.nd.ones((3, 8, 4)))
+    assert list(net.cached_op_stats().keys()) == [((3, 8, 4), 'float32')]
+    assert net(mx.nd.ones((3, 6, 4))).shape == (3, 6, 3)
+
+@with_seed()
+def test_hybrid_cached_param_handles():
+    net = nn.Dense(3, in_units=4)
+    net.initialize()
+    net.hybridize()
+    x = mx.nd.ones((2, 4))
+    net(x)
+    ctx = mx.context.current_context()
+    handles = net._cached_op_handles[ctx][1]
+    # set_data writes in place, so the cached handles stay valid
+    net.weight.set_data(mx.nd.ones((3, 4)))
+    net.bias.set_data(mx.nd.zeros((3,)))
+    assert_almost_equal(net(x).asnumpy(), 4 * np.ones((2, 3)))
+    assert net._cached_op_handles[ctx][1] is handles
+    # re-initialization replaces the arrays
+    net.initialize(mx.init.Zero(), force_reinit=True)
+    assert_almost_equal(net(x).asnumpy(), np.zeros((2, 3)))
+    assert net._cached_op_handles[ctx][1] is not handles
+
+@with_seed()
+def test_hybrid_graph_cache():
+    class Net(gluon.HybridBlock):
+        def __init__(self, **kwargs):
+            super(Net, self).__init__(**kwargs)
+            with self.name_scope():
+                self.dense = nn.Dense(3)
+
+        def hybrid_forward(self, F, x):
+            return F.relu(self.dense(x))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("graph should be loaded from the graph cache")
+
+    with TemporaryDirectory() as tmpdir:
+        x = mx.nd.random.uniform(shape=(2, 5))
+        net = Net(prefix='net_')
+        net.initialize()
+        net.hybridize(graph_cache_dir=tmpdir)
+        out = net(x)
+        assert len(os.listdir(tmpdir)) == 1
+
+        net2 = Net(prefix='net_')
+        net2.initialize()
+        net2.hybridize(graph_cache_dir=tmpdir)
+        net2.hybrid_forward = fail
+        net2(x)
+        assert net2.dense.weight.shape == (3, 5)
+        net2.dense.weight.set_data(net.dense.weight.data())
+        net2.dense.bias.set_data(net.dense.bias.data())
+        assert_almost_equal(net2(x).asnumpy(), out.asnumpy())
+
+        # a different input signature is traced and cached again
+        net3 = Net(prefix='net_')
+        net3.initialize()
+        net3.hybridize(graph_cache_dir=tmpdir)
+        net3(mx.nd.ones((2, 6)))
+        assert len(os.listdir(tmpdir)) == 2
+
+@with_seed()
+def test_hybrid_thread_safe():
+    net = nn.HybridSequential()
+    with net.name_scope():
+        net.add(nn.Dense(16, activation='relu'))
+        net.add(nn.Dense(4))
+    net.initialize()
+    inputs = [mx.nd.random.uniform(shape=(8, 10)) for _ in range(8)]
+    expected = [net(x).asnumpy() for x in inputs]
+    net.hybridize(static_alloc=True, static_shape=True, thread_safe=True)
+
+    errors = []
+    def worker(x, out):
+        try:
+            for _ in range(50):
+                assert_almost_equal(net(x).asnumpy(), out, rtol=1e-5, atol=1e-6)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(x, out))
+               for x, out in zip(inputs, expected)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors, errors
+    # every execution state shares the parameter arrays
+    states = net._cached_op_pool
+    assert 1 <= len(states) <= len(threads)
+    weight = net[0].weight.data().handle.value
+    for _, handle_cache in states:
+        _, _, arrays = handle_cache[mx.context.current_context()]
+        assert weight in [arr.handle.value for arr in arrays if arr is not None]
+    assert_raises(ValueError, net.hybridize, thread_safe=True, cache_size=2)
+
 @with_seed()
 def test_hook():
     global hook_call_count
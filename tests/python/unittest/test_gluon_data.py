@@ -17,18 +17,20 @@
 
 import os
 import tarfile
+import multiprocessing
 import unittest
 import mxnet as mx
 import numpy as np
 import random
 from mxnet import gluon
 import platform
-from common import setup_module, with_seed, teardown
+from common import setup_module, with_seed, teardown, TemporaryDirectory
 from mxnet.gluon.data import DataLoader
 import mxnet.ndarray as nd
 from mxnet import context
 from mxnet.gluon.data.dataset import Dataset
 from mxnet.gluon.data.dataset import ArrayDataset
+from nose.tools import assert_raises
 
 @with_seed()
 def test_array_dataset():
@@ -121,6 +123,190 @@ def test_sampler():
     rand_batch_keep = gluon.data.BatchSampler(rand_sampler, 3, 'keep')
     assert sorted(sum(list(rand_batch_keep), [])) == list(range(10))
 
+@with_seed()
+def test_sampler_state():
+    rand_sampler = gluon.data.RandomSampler(10, seed=123)
+    epochs = [list(rand_sampler) for _ in range(3)]
+    assert all(sorted(epoch) == list(range(10)) for epoch in epochs)
+    assert list(gluon.data.RandomSampler(10, seed=123)) == epochs[0]
+
+    # stop in the middle of the second epoch and resume from the state
+    rand_sampler = gluon.data.RandomSampler(10, seed=123)
+    list(rand_sampler)
+    it = iter(rand_sampler)
+    head = [next(it) for _ in range(4)]
+    state = rand_sampler.state_dict()
+    assert state == {'seed': 123, 'epoch': 1, 'cursor': 4}
+    resumed = gluon.data.RandomSampler(10)
+    resumed.load_state_dict(state)
+    assert head + list(resumed) == epochs[1]
+    assert list(resumed) == epochs[2]
+
+    # live iterators do not share a position
+    seq_sampler = gluon.data.SequentialSampler(5)
+    assert list(zip(seq_sampler, seq_sampler)) == [(i, i) for i in range(5)]
+    assert [(i, j) for i in seq_sampler for j in seq_sampler] == \
+        [(i, j) for i in range(5) for j in range(5)]
+    rand_sampler = gluon.data.RandomSampler(10, seed=123)
+    first, second = iter(rand_sampler), iter(rand_sampler)
+    assert list(first) == epochs[0] and list(second) == epochs[1]
+
+    batch_sampler = gluon.data.BatchSampler(gluon.data.SequentialSampler(10), 3, 'rollover')
+    list(batch_sampler)
+    state = batch_sampler.state_dict()
+    resumed = gluon.data.BatchSampler(gluon.data.SequentialSampler(10), 3, 'rollover')
+    resumed.load_state_dict(state)
+    # the saved iteration sampled the whole epoch, the next one starts a new epoch
+    assert list(resumed) == []
+    assert list(resumed) == list(batch_sampler)
+
+class _DecodeCounter(object):
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, x):
+        self.count += 1
+        return x * 2
+
+def _read_all(dataset):
+    for i in range(len(dataset)):
+        dataset[i]
+
+@with_seed()
+def test_cached_dataset():
+    data = mx.gluon.data.SimpleDataset(list(range(20)))
+    decode = _DecodeCounter()
+    cached = data.transform(decode).cache(max_items=5)
+    assert [cached[i] for i in range(5)] == list(range(0, 10, 2))
+    assert [cached[i] for i in range(5)] == list(range(0, 10, 2))
+    assert (cached.hits, cached.misses, decode.count) == (5, 5, 5)
+    cached[5]
+    cached[0]
+    assert (cached.hits, cached.misses) == (5, 7)
+    cached.reset_stats()
+    assert cached._getitems([1, 2, 3, 6, 7]) == [2, 4, 6, 12, 14]
+    assert (cached.hits, cached.misses) == (2, 3)
+
+    with TemporaryDirectory() as spill_dir:
+        decode = _DecodeCounter()
+        cached = data.transform(decode).cache(max_items=2, spill_dir=spill_dir)
+        augmented = cached.transform(lambda x: x + random.random())
+        assert [int(augmented[i]) for i in range(20)] == list(range(0, 40, 2))
+        assert [int(augmented[i]) for i in range(20)] == list(range(0, 40, 2))
+        assert (cached.misses, cached.spill_hits, decode.count) == (20, 20, 20)
+
+        # workers share the on-disk store and the counters
+        cached = mx.gluon.data.ArrayDataset(np.arange(40).reshape(20, 2)).cache(
+            max_items=0, spill_dir=spill_dir)
+        for num_workers in [0, 2]:
+            loader = DataLoader(cached, batch_size=4, num_workers=num_workers)
+            assert np.concatenate([x.asnumpy() for x in loader]).tolist() == \
+                np.arange(40).reshape(20, 2).tolist()
+        assert (cached.misses, cached.spill_hits) == (20, 20)
+
+        # concurrent writers publish every entry exactly once
+        cached = mx.gluon.data.ArrayDataset(np.arange(200)).cache(
+            max_items=0, spill_dir=spill_dir)
+        workers = [multiprocessing.Process(target=_read_all, args=(cached,)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        cached.reset_stats()
+        assert [cached[i] for i in range(200)] == list(range(200))
+        assert (cached.misses, cached.spill_hits) == (0, 200)
+
+@with_seed()
+def test_bucket_batch_sampler():
+    lengths = np.random.randint(1, 50, size=(200,)).tolist()
+    sampler = gluon.data.BucketBatchSampler(lengths, batch_size=8, num_buckets=5, seed=1)
+    keys = sampler.bucket_keys
+    batches = list(sampler)
+    assert len(batches) == len(sampler)
+    assert sorted(sum(batches, [])) == list(range(200))
+    for batch in batches:
+        assert 0 < len(batch) <= 8
+        bucket_ids = set(np.searchsorted(keys, [lengths[i] for i in batch]).tolist())
+        assert len(bucket_ids) == 1
+    assert batches != list(sampler)
+
+    sampler = gluon.data.BucketBatchSampler([3, 9, 4, 8, 2, 10], batch_size=2,
+                                            bucket_keys=[5, 10], shuffle=False)
+    assert list(sampler) == [[0, 2], [4], [1, 3], [5]]
+    sampler = gluon.data.BucketBatchSampler([3, 9, 4, 8, 2, 10], batch_size=2,
+                                            bucket_keys=[5, 10], shuffle=False,
+                                            last_batch='discard')
+    assert list(sampler) == [[0, 2], [1, 3]]
+
+    # token budget counts the padded length of each bucket
+    sampler = gluon.data.BucketBatchSampler(lengths, max_tokens=100, num_buckets=5)
+    for batch in sampler:
+        key = keys[np.searchsorted(keys, lengths[batch[0]])]
+        assert len(batch) * key <= 100
+    assert_raises(ValueError, gluon.data.BucketBatchSampler, lengths)
+
+    # resume in the middle of an epoch
+    sampler = gluon.data.BucketBatchSampler(lengths, batch_size=8, seed=3)
+    it = iter(sampler)
+    head = [next(it) for _ in range(5)]
+    resumed = gluon.data.BucketBatchSampler(lengths, batch_size=8)
+    resumed.load_state_dict(sampler.state_dict())
+    assert head + list(resumed) == list(gluon.data.BucketBatchSampler(lengths, batch_size=8,
+                                                                      seed=3))
+    sampler = gluon.data.BucketBatchSampler(lengths, batch_size=8, shuffle=False)
+    assert all(a == b for a, b in zip(sampler, sampler))
+
+    data = gluon.data.SimpleDataset([np.arange(l) for l in lengths])
+    def pad(samples):
+        out = np.zeros((len(samples), max(len(s) for s in samples)))
+        for i, s in enumerate(samples):
+            out[i, :len(s)] = s
+        return mx.nd.array(out)
+    loader = DataLoader(data, batch_sampler=gluon.data.BucketBatchSampler(lengths, batch_size=8),
+                        batchify_fn=pad, num_workers=2)
+    assert sum(batch.shape[0] for batch in loader) == 200
+
+def _check_dataloader_resume(num_workers, thread_pool=False, num_seen=5):
+    data = mx.gluon.data.SimpleDataset(list(range(50)))
+    def make_loader():
+        return DataLoader(data, batch_size=4, sampler=gluon.data.RandomSampler(50, seed=7),
+                          num_workers=num_workers, thread_pool=thread_pool)
+    expected = [batch.asnumpy().tolist() for batch in make_loader()]
+
+    loader = make_loader()
+    it = iter(loader)
+    seen = [next(it).asnumpy().tolist() for _ in range(num_seen)]
+    assert seen == expected[:num_seen]
+    state = loader.state_dict()
+    # prefetched batches are recorded instead of being lost
+    assert bool(state['inflight']) == (num_workers > 0)
+    del it
+
+    loader = DataLoader(data, batch_size=4, shuffle=True, num_workers=num_workers,
+                        thread_pool=thread_pool)
+    loader.load_state_dict(state)
+    rest = [batch.asnumpy().tolist() for batch in loader]
+    assert rest == expected[num_seen:]
+    # the following epoch is not affected by the resumed one
+    assert sorted(sum([b.asnumpy().tolist() for b in loader], [])) == list(range(50))
+
+    # a state saved after a whole epoch resumes with the next epoch
+    state = loader.state_dict()
+    loader = make_loader()
+    loader.load_state_dict(state)
+    assert sorted(sum([b.asnumpy().tolist() for b in loader], [])) == list(range(50))
+
+@with_seed()
+def test_dataloader_resume():
+    _check_dataloader_resume(0)
+    _check_dataloader_resume(2, thread_pool=True)
+    if os.name != 'nt':
+        _check_dataloader_resume(2)
+    # checkpoints within the last prefetched batches, after the sampler is exhausted
+    _check_dataloader_resume(2, thread_pool=True, num_seen=11)
+    if os.name != 'nt':
+        _check_dataloader_resume(2, num_seen=11)
+
 @with_seed()
 def test_datasets():
     assert len(gluon.data.vision.MNIST(root='data/mnist')) == 60000
@@ -261,6 +447,102 @@ def test_multi_worker_dataloader_release_pool():
         del D
 
 
+class _ShmDataset(Dataset):
+    """Dataset producing mixed dtype samples for shared memory ring tests."""
+    def __getitem__(self, idx):
+        return (mx.nd.full((3, 8, 8), idx, dtype='uint8'),
+                mx.nd.full((5,), idx, dtype='float32'), idx)
+
+    def __len__(self):
+        return 40
+
+@with_seed()
+def test_multi_worker_shm_ring():
+    if os.name == 'nt':
+        print('Skip for windows since spawn on windows is too expensive.')
+        return
+    data = _ShmDataset()
+    for slot_size in [1 << 20, 128]:
+        # the small slot forces the pickle fallback
+        loader = DataLoader(data, batch_size=4, num_workers=2, shm_slots=6,
+                            shm_slot_size=slot_size)
+        for epoch in range(2):
+            for i, (x, y, z) in enumerate(loader):
+                assert x.dtype == np.uint8 and x.shape == (4, 3, 8, 8)
+                assert y.dtype == np.float32 and y.shape == (4, 5)
+                expected = np.arange(i * 4, (i + 1) * 4)
+                assert (x.asnumpy()[:, 0, 0, 0] == expected).all()
+                assert (y.asnumpy()[:, 0] == expected).all()
+                assert (z.asnumpy() == expected).all()
+            del x, y, z
+            mx.nd.waitall()
+            assert loader._shm_ring.num_free == 6
+
+    # holding on to batches exhausts the ring and falls back to pickle
+    loader = DataLoader(data, batch_size=4, num_workers=2, shm_slots=2, prefetch=1)
+    batches = list(loader)
+    assert len(batches) == 10
+    for i, (x, _, _) in enumerate(batches):
+        assert (x.asnumpy()[:, 0, 0, 0] == np.arange(i * 4, (i + 1) * 4)).all()
+    del batches, x
+    mx.nd.waitall()
+    assert loader._shm_ring.num_free == 2
+
+@with_seed()
+def test_shm_write_unsupported_dtype():
+    from mxnet.gluon.data.dataloader import _shm_write_batch
+    buf = bytearray(1 << 12)
+    for dtype in ['float16', 'float32', 'float64', 'uint8', 'int8', 'int32', 'int64']:
+        assert _shm_write_batch([mx.nd.zeros((4,), dtype=dtype)], buf) is not None
+    # arrays which cannot be mapped by nd.from_numpy fall back to pickle
+    for dtype in [np.bool_, np.uint32, np.uint64]:
+        class _Unsupported(mx.nd.NDArray):
+            __slots__ = []
+            dtype = property(lambda self, dtype=dtype: dtype)
+        x = mx.nd.zeros((4,), dtype='int64')
+        x.__class__ = _Unsupported
+        assert _shm_write_batch([mx.nd.zeros((4,)), x], buf) is None
+
+class _StreamDataset(gluon.data.IterableDataset):
+    """Iterable dataset without random access."""
+    def __init__(self, length):
+        self._length = length
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield mx.nd.full((2,), i), i
+
+@with_seed()
+def test_iterable_dataset():
+    data = _StreamDataset(23)
+    assert sorted(sum([[i for _, i in data.shard(3, k)] for k in range(3)], [])) == list(range(23))
+    assert [i for _, i in data.transform_first(lambda x: x * 2)] == list(range(23))
+
+    loader = DataLoader(data, batch_size=5)
+    batches = list(loader)
+    assert [len(y) for _, y in batches] == [5, 5, 5, 5, 3]
+    assert (mx.nd.concat(*[x for x, _ in batches], dim=0).asnumpy()[:, 0] == np.arange(23)).all()
+    loader = DataLoader(data, batch_size=5, last_batch='discard')
+    assert len(list(loader)) == 4
+    assert_raises(TypeError, len, loader)
+    assert_raises(ValueError, DataLoader, data, batch_size=5, shuffle=True)
+    assert_raises(ValueError, DataLoader, data, batch_size=5, last_batch='rollover')
+
+    for thread_pool in [True, False]:
+        if os.name == 'nt' and not thread_pool:
+            continue
+        # shards have 8, 8 and 7 samples, last_batch applies to each shard
+        for last_batch, num_samples in [('keep', 23), ('discard', 22)]:
+            loader = DataLoader(data, batch_size=2, num_workers=3, prefetch=3,
+                                thread_pool=thread_pool, last_batch=last_batch)
+            for _ in range(2):
+                labels = []
+                for x, y in loader:
+                    assert (x.asnumpy()[:, 0] == y.asnumpy()).all()
+                    labels.extend(y.asnumpy().tolist())
+                assert len(labels) == num_samples
+                assert len(set(labels)) == num_samples
+
 def test_dataloader_context():
     X = np.random.uniform(size=(10, 20))
     dataset = gluon.data.ArrayDataset(X)
@@ -283,6 +565,23 @@ def test_dataloader_context():
     for _, x in enumerate(loader3):
         assert x.context == context.cpu_pinned(custom_dev_id)
 
+def test_dataloader_pinned_buffers():
+    X = mx.nd.random.uniform(shape=(32, 20))
+    dataset = gluon.data.ArrayDataset(X)
+    for num_workers, thread_pool in [(0, False), (2, False), (2, True)]:
+        loader = gluon.data.DataLoader(dataset, 8, pin_memory=True, pin_buffers=2,
+                                       num_workers=num_workers, thread_pool=thread_pool)
+        for _ in range(3):
+            batches = []
+            for x in loader:
+                assert x.context == context.cpu_pinned(0)
+                batches.append(x.asnumpy())
+            assert mx.test_utils.almost_equal(np.concatenate(batches), X.asnumpy())
+        assert loader._pin_pool.copied_bytes == 3 * X.size * 4
+        if not thread_pool:
+            # batches released by the training loop are staged into the same buffers
+            assert loader._pin_pool.num_allocations == 2
+
 def batchify(a):
     return a
 
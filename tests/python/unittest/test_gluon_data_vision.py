@@ -236,6 +236,52 @@ def test_transformer():
     transform(mx.nd.ones((245, 480, 3), dtype='uint8')).wait_to_read()
 
 
+@with_seed()
+def test_batch_transforms():
+    data_in = np.random.uniform(0, 1, (16, 3, 32, 40)).astype(np.float32)
+    data = nd.array(data_in)
+
+    out = transforms.BatchRandomFlipLeftRight()(data).asnumpy()
+    for x, y in zip(data_in, out):
+        assert np.array_equal(x, y) or np.array_equal(x[:, :, ::-1], y)
+    out = transforms.BatchRandomFlipTopBottom()(data).asnumpy()
+    for x, y in zip(data_in, out):
+        assert np.array_equal(x, y) or np.array_equal(x[:, ::-1, :], y)
+
+    # a crop of the whole image is the identity
+    crop = transforms.BatchRandomResizedCrop((40, 32), scale=(1, 1), ratio=(1.25, 1.25))
+    assert_almost_equal(crop(data).asnumpy(), data_in, atol=1e-5)
+    out = transforms.BatchRandomResizedCrop(24)(data)
+    assert out.shape == (16, 3, 24, 24)
+
+    # zero hue rotation and unit factors keep the images unchanged
+    jitter = transforms.BatchRandomColorJitter(brightness=1e-7, contrast=1e-7,
+                                               saturation=1e-7, hue=1e-7)
+    assert_almost_equal(jitter(data).asnumpy(), data_in, atol=1e-4)
+    out = transforms.BatchRandomColorJitter(brightness=0.5)(data).asnumpy()
+    factor = out.reshape(16, -1) / data_in.reshape(16, -1)
+    assert_almost_equal(factor.min(axis=1), factor.max(axis=1), atol=1e-4)
+    assert len(np.unique(np.round(factor[:, 0], 4))) > 1
+    gray = transforms.BatchRandomColorJitter(saturation=1.0, hue=0.5)(
+        nd.ones((4, 3, 8, 8)) * 0.5).asnumpy()
+    assert_almost_equal(gray, np.ones((4, 3, 8, 8)) * 0.5, atol=1e-4)
+
+    images = np.random.uniform(0, 255, (10, 32, 32, 3)).astype(np.uint8)
+    dataset = gluon.data.ArrayDataset(nd.array(images, dtype='uint8'), list(range(10)))
+    batch_transform = transforms.Compose([
+        transforms.ToTensor(),
+        transforms.BatchRandomResizedCrop(24),
+        transforms.BatchRandomFlipLeftRight(),
+        transforms.BatchRandomColorJitter(0.1, 0.1, 0.1, 0.1),
+        transforms.Normalize([0, 0, 0], [1, 1, 1])])
+    for num_workers in [0, 2]:
+        loader = gluon.data.DataLoader(dataset, batch_size=4, num_workers=num_workers,
+                                       batch_transform=batch_transform)
+        for x, y in loader:
+            assert x.shape[1:] == (3, 24, 24)
+            assert x.shape[0] == y.shape[0]
+
+
 
 if __name__ == '__main__':
     import nose
@@ -75,6 +75,28 @@ def test_fit():
                 epochs=num_epochs)
 
 
+
+def test_fit_micro_batches():
+    ''' test estimator accumulating gradients over micro-batches '''
+    net = _get_test_network()
+    dataloader, _ = _get_test_data()
+    ctx = mx.cpu()
+    net.initialize(ctx=ctx)
+    trainer = gluon.Trainer(net.collect_params(), 'sgd', {'learning_rate': 0.001},
+                            accumulate_steps=2)
+    est = Estimator(net=net,
+                    loss=gluon.loss.L2Loss(),
+                    trainer=trainer,
+                    context=ctx)
+    est.fit(train_data=dataloader, epochs=1)
+    est.fit(train_data=dataloader, epochs=1, micro_batches=2)
+    # each batch of the epoch has triggered exactly one update
+    assert trainer._optimizer.num_update == 2 * 3
+
+    # micro-batches must agree with the trainer
+    with assert_raises(ValueError):
+        est.fit(train_data=dataloader, epochs=1, micro_batches=4)
+
 def test_validation():
     ''' test different validation data types'''
     net = _get_test_network()
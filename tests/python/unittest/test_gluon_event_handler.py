@@ -60,6 +60,7 @@ def test_checkpoint_handler():
         assert os.path.isfile(file_path + '-best.states')
         assert os.path.isfile(file_path + '-epoch0batch4.params')
         assert os.path.isfile(file_path + '-epoch0batch4.states')
+        assert os.path.isfile(file_path + '-epoch0batch4.loader')
 
         model_prefix = 'test_batch'
         file_path = os.path.join(tmpdir, model_prefix)
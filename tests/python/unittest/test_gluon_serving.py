@@ -0,0 +1,92 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import threading
+
+import mxnet as mx
+import numpy as np
+from common import with_seed
+from mxnet.base import MXNetError
+from mxnet.gluon import nn
+from mxnet.gluon.contrib import serving
+from mxnet.test_utils import assert_almost_equal
+from nose.tools import assert_raises
+
+
+@with_seed()
+def test_batching_server():
+    net = nn.HybridSequential()
+    net.add(nn.Dense(3, in_units=4))
+    net.initialize()
+    x = np.random.uniform(size=(64, 4)).astype('float32')
+    expected = net(mx.nd.array(x)).asnumpy()
+
+    server = serving.BatchingServer(net, max_batch_size=8, max_wait=0.05)
+    server.warmup(x[0])
+    results = [None] * len(x)
+
+    def client(indices):
+        for i in indices:
+            results[i] = server.predict(x[i])
+
+    with server:
+        clients = [threading.Thread(target=client, args=(range(i, len(x), 8),))
+                   for i in range(8)]
+        for c in clients:
+            c.start()
+        for c in clients:
+            c.join()
+    for i in range(len(x)):
+        assert_almost_equal(results[i], expected[i])
+    stats = server.stats()
+    assert stats['requests'] == len(x)
+    # concurrent requests are coalesced
+    assert stats['batches'] < len(x)
+    assert 0 < stats['batch_fill'] <= 1
+    assert 0 < stats['latency_p50'] <= stats['latency_p99']
+
+    # errors are raised to the clients of the failed batch
+    with server:
+        request = server.submit(np.ones((5,), dtype='float32'))
+        assert_raises(MXNetError, request.result)
+
+@with_seed()
+def test_batching_server_signatures():
+    net = nn.Dense(3, in_units=4, flatten=False)
+    net.initialize()
+    x = [np.random.uniform(size=(2 + i % 2, 4)).astype('float32') for i in range(16)]
+
+    # requests of different shapes are batched separately
+    server = serving.BatchingServer(net, max_batch_size=8, max_wait=5)
+    assert net._cached_op_cache_size == 4 * 4
+    with server:
+        requests = [server.submit(i) for i in x]
+        results = [request.result() for request in requests]
+    for i, out in zip(x, results):
+        assert_almost_equal(out, net(mx.nd.array(i)).asnumpy(), rtol=1e-5, atol=1e-6)
+    assert server.stats()['batches'] == 2
+
+    # inputs are padded to shape buckets and outputs sliced back
+    x = [np.random.uniform(size=(i, 4)).astype('float32') for i in range(1, 5)]
+    server = serving.BatchingServer(net, max_batch_size=4, max_wait=5, shape_buckets={0: 4})
+    with server:
+        requests = [server.submit(i) for i in x]
+        results = [request.result() for request in requests]
+    for i, out in zip(x, results):
+        assert out.shape == (i.shape[0], 3)
+        assert_almost_equal(out, net(mx.nd.array(i)).asnumpy(), rtol=1e-5, atol=1e-6)
+    assert server.stats()['batches'] == 1
@@ -18,6 +18,7 @@
 import mxnet as mx
 import unittest
 import os
+import json
 import numpy as np
 from mxnet import gluon
 from mxnet.gluon import nn
@@ -214,6 +215,281 @@ def test_trainer_reset_kv():
     for kv in kvs:
         check_trainer_reset_kv(kv)
 
+@with_seed()
+def test_trainer_grad_buckets():
+    def make_net():
+        net = nn.HybridSequential()
+        with net.name_scope():
+            net.add(nn.Dense(8, in_units=5), nn.LayerNorm(in_channels=8),
+                    nn.Dense(8, in_units=8, use_bias=False), nn.Dense(2, in_units=8))
+        net.initialize(mx.init.Xavier(), ctx=ctx)
+        return net
+
+    def train(grad_bucket_size, kv):
+        net = make_net()
+        net.load_parameters('test_trainer_grad_buckets.params', ctx=ctx)
+        trainer = gluon.Trainer(net.collect_params(), 'sgd',
+                                {'learning_rate': 0.1, 'momentum': 0.9},
+                                kvstore=kv, grad_bucket_size=grad_bucket_size)
+        for _ in range(3):
+            with mx.autograd.record():
+                losses = [net(x).sum() for x in data]
+            mx.autograd.backward(losses)
+            trainer.step(8)
+        return trainer, [p.data(ctx[1]).asnumpy() for p in net.collect_params().values()]
+
+    ctx = [mx.cpu(0), mx.cpu(1)]
+    data = [mx.nd.random.uniform(shape=(4, 5), ctx=c) for c in ctx]
+    make_net().save_parameters('test_trainer_grad_buckets.params')
+    for kv in ['local', 'device']:
+        _, expected = train(0, kv)
+        for grad_bucket_size in [1, 128, 1 << 20]:
+            trainer, params = train(grad_bucket_size, kv)
+            assert not trainer._update_on_kvstore
+            num_buckets = len(trainer._grad_buckets)
+            assert num_buckets == {1: 7, 128: 4, 1 << 20: 1}[grad_bucket_size]
+            for p, e in zip(params, expected):
+                assert_almost_equal(p, e, rtol=1e-5, atol=1e-6)
+    os.remove('test_trainer_grad_buckets.params')
+
+@with_seed()
+def test_trainer_clip_global_norm():
+    def step(trainer, grad):
+        with mx.autograd.record():
+            losses = [grad * (x.data(c).sum() + y.data(c).sum()) for c in ctx]
+        mx.autograd.backward(losses)
+        trainer.step(1)
+
+    ctx = [mx.cpu(0), mx.cpu(1)]
+    params = gluon.ParameterDict()
+    x = params.get('x', shape=(3, 4), init='zeros')
+    y = params.get('y', shape=(4,), init='zeros')
+    params.initialize(ctx=ctx)
+    trainer = gluon.Trainer(params, 'sgd', {'learning_rate': 1.0},
+                            kvstore='device', clip_global_norm=1.0)
+    # the reduced gradients are all 2 and have norm sqrt(16 * 2**2) = 8
+    step(trainer, 1.0)
+    assert not trainer._update_on_kvstore
+    for c in ctx:
+        assert_almost_equal(x.data(c).asnumpy(), -np.ones((3, 4)) / 4, rtol=1e-5)
+        assert_almost_equal(y.data(c).asnumpy(), -np.ones((4,)) / 4, rtol=1e-5)
+    # gradients below the threshold are left untouched
+    step(trainer, 0.01)
+    assert_almost_equal(x.data(ctx[0]).asnumpy(), -np.ones((3, 4)) * 0.27, rtol=1e-5)
+
+    trainer = gluon.Trainer(params, 'sgd', kvstore='device',
+                            update_on_kvstore=True, clip_global_norm=1.0)
+    assert_raises(ValueError, trainer._init_kvstore)
+
+@with_seed()
+def test_trainer_shard_optimizer_state():
+    def train(shard, kv, states_file=None):
+        net = nn.HybridSequential()
+        with net.name_scope():
+            net.add(nn.Dense(8, in_units=5), nn.Dense(16, in_units=8), nn.Dense(2, in_units=16))
+        net.initialize(ctx=ctx)
+        net.load_parameters('test_trainer_shard_optimizer_state.params', ctx=ctx)
+        trainer = gluon.Trainer(net.collect_params(), 'adam', {'learning_rate': 0.1},
+                                kvstore=kv, shard_optimizer_state=shard)
+        if states_file:
+            trainer.load_states(states_file)
+        for _ in range(3):
+            with mx.autograd.record():
+                losses = [net(x).sum() for x in data]
+            mx.autograd.backward(losses)
+            trainer.step(8)
+        return trainer, net
+
+    ctx = [mx.cpu(0), mx.cpu(1)]
+    data = [mx.nd.random.uniform(shape=(4, 5), ctx=c) for c in ctx]
+    net = nn.HybridSequential()
+    net.add(nn.Dense(8, in_units=5), nn.Dense(16, in_units=8), nn.Dense(2, in_units=16))
+    net.initialize()
+    net.save_parameters('test_trainer_shard_optimizer_state.params')
+    for kv in ['local', 'device']:
+        _, expected = train(False, kv)
+        trainer, sharded = train(True, kv)
+        num_params = len(sharded.collect_params())
+        # every parameter has its optimizer state on exactly one context
+        keys = [set(updater.states.keys()) for updater in trainer._updaters]
+        assert all(keys), keys
+        assert not keys[0] & keys[1]
+        assert len(keys[0] | keys[1]) == num_params
+        for p, e in zip(sharded.collect_params().values(), expected.collect_params().values()):
+            for c in ctx:
+                assert_almost_equal(p.data(c).asnumpy(), e.data(ctx[0]).asnumpy(),
+                                    rtol=1e-5, atol=1e-6)
+        # sharded states are gathered on save and split again on load
+        trainer.save_states('test_trainer_shard_optimizer_state.states')
+        trainer, _ = train(True, kv, 'test_trainer_shard_optimizer_state.states')
+        assert sum(len(updater.states) for updater in trainer._updaters) == num_params
+    # without kvstore the gradients of the other contexts would be discarded
+    params = gluon.ParameterDict()
+    params.get('x', shape=(3,))
+    params.initialize(ctx=ctx)
+    trainer = gluon.Trainer(params, 'adam', kvstore=None, shard_optimizer_state=True)
+    assert_raises(ValueError, trainer._init_kvstore)
+    os.remove('test_trainer_shard_optimizer_state.params')
+    os.remove('test_trainer_shard_optimizer_state.states')
+
+@with_seed()
+def test_trainer_accumulate_steps():
+    def train(bounds, manual=False):
+        net = nn.Dense(2, in_units=5)
+        net.initialize(ctx=ctx)
+        net.load_parameters('test_trainer_accumulate_steps.params', ctx=ctx)
+        trainer = gluon.Trainer(net.collect_params(), 'sgd', {'learning_rate': 0.1},
+                                kvstore='device', update_on_kvstore=False,
+                                accumulate_steps=len(bounds) - 1)
+        for _ in range(2):
+            # micro-batches of uneven size are normalized by the total batch size
+            for begin, end in zip(bounds[:-1], bounds[1:]):
+                micro = gluon.utils.split_and_load(data[begin:end], ctx)
+                with mx.autograd.record():
+                    losses = [net(x).sum() for x in micro]
+                mx.autograd.backward(losses)
+                if manual:
+                    trainer.allreduce_grads()
+                    trainer.update(end - begin)
+                else:
+                    trainer.step(end - begin)
+        return net
+
+    ctx = [mx.cpu(0), mx.cpu(1)]
+    data = mx.nd.random.uniform(shape=(12, 5))
+    net = nn.Dense(2, in_units=5)
+    net.initialize()
+    net.save_parameters('test_trainer_accumulate_steps.params')
+    expected = train([0, 12])
+    for manual in [False, True]:
+        # allreduce_grads() and update() accumulate like step()
+        accumulated = train([0, 2, 6, 12], manual)
+        for p, e in zip(accumulated.collect_params().values(),
+                        expected.collect_params().values()):
+            assert p.grad_req == 'add'
+            for c in ctx:
+                assert_almost_equal(p.data(c).asnumpy(), e.data(ctx[0]).asnumpy(),
+                                    rtol=1e-5, atol=1e-6)
+                assert (p.grad(c).asnumpy() == 0).all()
+    os.remove('test_trainer_accumulate_steps.params')
+
+@with_seed()
+def test_trainer_overlap_grad_comm():
+    def train(overlap, bucket_size):
+        net = nn.HybridSequential()
+        net.add(nn.Dense(8, in_units=5), nn.Dense(16, in_units=8), nn.Dense(2, in_units=16))
+        net.initialize(ctx=ctx)
+        net.load_parameters('test_trainer_overlap_grad_comm.params', ctx=ctx)
+        trainer = gluon.Trainer(net.collect_params(), 'sgd', {'learning_rate': 0.1},
+                                kvstore='device', grad_bucket_size=bucket_size,
+                                overlap_grad_comm=overlap)
+        for _ in range(2):
+            with mx.autograd.record():
+                losses = [net(x).sum() for x in data]
+            mx.autograd.backward(losses)
+            trainer.step(8)
+        return [p.data(c).asnumpy() for p in net.collect_params().values() for c in ctx]
+
+    ctx = [mx.cpu(0), mx.cpu(1)]
+    data = [mx.nd.random.uniform(shape=(4, 5), ctx=c) for c in ctx]
+    net = nn.HybridSequential()
+    net.add(nn.Dense(8, in_units=5), nn.Dense(16, in_units=8), nn.Dense(2, in_units=16))
+    net.initialize()
+    net.save_parameters('test_trainer_overlap_grad_comm.params')
+    expected = train(False, 0)
+    for bucket_size in [0, 256]:
+        for p, e in zip(train(True, bucket_size), expected):
+            assert_almost_equal(p, e, rtol=1e-5, atol=1e-6)
+    os.remove('test_trainer_overlap_grad_comm.params')
+
+@with_seed()
+def test_trainer_local_sgd():
+    def train(kv, batch_size, **kwargs):
+        net = nn.Dense(2, in_units=5)
+        net.initialize(ctx=ctx)
+        net.load_parameters('test_trainer_local_sgd.params', ctx=ctx)
+        trainer = gluon.Trainer(net.collect_params(), 'sgd',
+                                {'learning_rate': 0.1, 'momentum': 0.9}, kvstore=kv, **kwargs)
+        weights = []
+        for x in data:
+            with mx.autograd.record():
+                losses = [net(x[i].as_in_context(c)).sum() for i, c in enumerate(ctx)]
+            mx.autograd.backward(losses)
+            trainer.step(batch_size)
+            weights.append([net.weight.data(c).asnumpy() for c in ctx])
+        return trainer, weights
+
+    ctx = [mx.cpu(0), mx.cpu(1)]
+    data = [mx.nd.random.uniform(shape=(2, 4, 5)) for _ in range(2)]
+    net = nn.Dense(2, in_units=5)
+    net.initialize()
+    net.save_parameters('test_trainer_local_sgd.params')
+    # without kvstore every context is updated independently with its own gradient
+    _, expected = train(None, 4)
+    trainer, weights = train('device', 8, local_sgd_steps=2, local_sgd_average_states=True)
+    assert not trainer._update_on_kvstore
+    for w, e in zip(weights[0], expected[0]):
+        assert_almost_equal(w, e, rtol=1e-5, atol=1e-6)
+    # the second step averages the copies of all contexts
+    for w in weights[1]:
+        assert_almost_equal(w, (expected[1][0] + expected[1][1]) / 2, rtol=1e-5, atol=1e-6)
+    moms = [updater.states[0].asnumpy() for updater in trainer._updaters]
+    assert_almost_equal(moms[0], moms[1], rtol=1e-5, atol=1e-6)
+
+    trainer.local_sgd_steps = 4
+    assert trainer.local_sgd_steps == 4
+
+    # the float32 master copies of float16 weights are averaged with the weights
+    params = gluon.ParameterDict()
+    params.get('x', shape=(3,), dtype='float16', init=mx.init.Zero())
+    params.initialize(ctx=ctx)
+    trainer = gluon.Trainer(params, 'sgd', {'learning_rate': 1, 'multi_precision': True},
+                            kvstore='device', local_sgd_steps=1)
+    for k in range(2):
+        for i, c in enumerate(ctx):
+            params['x'].grad(c)[:] = i + k
+        trainer.step(2)
+        masters = [updater.states[0][-1].asnumpy() for updater in trainer._updaters]
+        assert masters[0].dtype == np.float32
+        assert_almost_equal(masters[0], masters[1])
+        for c in ctx:
+            assert_almost_equal(params['x'].data(c).asnumpy().astype(np.float32), masters[0])
+    assert_almost_equal(masters[0], -np.ones((3,)) * 2)
+
+    params = gluon.ParameterDict()
+    params.get('x', shape=(3,))
+    params.initialize(ctx=ctx)
+    trainer = gluon.Trainer(params, 'sgd', kvstore='device',
+                            update_on_kvstore=True, local_sgd_steps=2)
+    assert_raises(ValueError, trainer._init_kvstore)
+    os.remove('test_trainer_local_sgd.params')
+
+@with_seed()
+def test_trainer_batched_allreduce():
+    ctx = [mx.cpu(0), mx.cpu(1)]
+    net = nn.HybridSequential()
+    net.add(nn.Dense(8, in_units=5), nn.Dense(16, in_units=8), nn.Dense(2, in_units=16))
+    net.initialize(ctx=ctx)
+    trainer = gluon.Trainer(net.collect_params(), 'sgd', {'learning_rate': 0.1},
+                            kvstore='device', update_on_kvstore=False)
+    trainer._init_kvstore()
+    calls = []
+    pushpull = trainer._kvstore.pushpull
+    def counted_pushpull(key, value, out=None, priority=0):
+        calls.append((key, priority))
+        pushpull(key, value, out=out, priority=priority)
+    trainer._kvstore.pushpull = counted_pushpull
+    data = [mx.nd.random.uniform(shape=(4, 5), ctx=c) for c in ctx]
+    for _ in range(2):
+        with mx.autograd.record():
+            losses = [net(x).sum() for x in data]
+        mx.autograd.backward(losses)
+        trainer.step(8)
+    # gradients are reduced with one call per priority tier, first layers first
+    assert calls == [([0], 0), ([1, 2], -1), ([3], -3), ([4, 5], -4)] * 2
+    for p in net.collect_params().values():
+        assert_almost_equal(p.data(ctx[0]).asnumpy(), p.data(ctx[1]).asnumpy())
+
 @with_seed()
 def test_trainer_sparse_kv():
     def check_trainer_sparse_kv(kv, stype, grad_stype, update_on_kv, expected):
@@ -291,3 +567,65 @@ def test_trainer_lr_sched():
             assert trainer.learning_rate == lr, (lr, trainer.learning_rate, i)
             lr *= factor
     mx.nd.waitall()
+
+@with_seed()
+def test_checkpointer():
+    from common import TemporaryDirectory
+
+    def make_net():
+        net = nn.HybridSequential()
+        with net.name_scope():
+            net.add(nn.Dense(4, in_units=3), nn.Dense(2, in_units=4))
+        net.initialize()
+        net[0].collect_params().setattr('grad_req', 'null')
+        trainer = gluon.Trainer(net.collect_params(), 'sgd',
+                                {'learning_rate': 0.1, 'momentum': 0.9},
+                                update_on_kvstore=False)
+        return net, trainer
+
+    def train(net, trainer):
+        with mx.autograd.record():
+            loss = net(mx.nd.ones((5, 3))).sum()
+        loss.backward()
+        trainer.step(5)
+
+    for shard in [False, True]:
+        with TemporaryDirectory() as tmpdir:
+            net, trainer = make_net()
+            checkpointer = gluon.Checkpointer(net, trainer, shard=shard)
+            train(net, trainer)
+            checkpointer.save(os.path.join(tmpdir, 'ckpt0'))
+            train(net, trainer)
+            checkpointer.save(os.path.join(tmpdir, 'ckpt1'))
+            checkpointer.wait()
+            if shard:
+                # the frozen first layer is written only once
+                shards = os.listdir(os.path.join(tmpdir, 'checkpoint-shards'))
+                assert len([f for f in shards if f.endswith('.params')]) == 6
+                checkpointer.remove(os.path.join(tmpdir, 'ckpt0'))
+                checkpointer.wait()
+                shards = os.listdir(os.path.join(tmpdir, 'checkpoint-shards'))
+                assert len([f for f in shards if f.endswith('.params')]) == 4
+            else:
+                assert os.path.isfile(os.path.join(tmpdir, 'ckpt1.params'))
+                assert os.path.isfile(os.path.join(tmpdir, 'ckpt1.states'))
+
+            net2, trainer2 = make_net()
+            gluon.Checkpointer(net2, trainer2, shard=shard).load(os.path.join(tmpdir, 'ckpt1'))
+            for p, p2 in zip(net.collect_params().values(), net2.collect_params().values()):
+                assert_almost_equal(p.data().asnumpy(), p2.data().asnumpy())
+            # training continues identically from the restored momentum
+            train(net, trainer)
+            train(net2, trainer2)
+            for p, p2 in zip(net.collect_params().values(), net2.collect_params().values()):
+                assert_almost_equal(p.data().asnumpy(), p2.data().asnumpy())
+
+            if shard:
+                # saving to the same prefix again frees the shards it no longer uses
+                checkpointer.save(os.path.join(tmpdir, 'ckpt1'))
+                checkpointer.wait()
+                with open(os.path.join(tmpdir, 'ckpt1.manifest')) as fin:
+                    manifest = json.load(fin)
+                used = set(manifest['params'].values()) | set(manifest['states'].values())
+                used.add(manifest['optimizer'])
+                assert set(os.listdir(os.path.join(tmpdir, 'checkpoint-shards'))) == used
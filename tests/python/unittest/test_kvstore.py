@@ -284,6 +284,20 @@ def test_get_type():
     kv = mx.kv.create(kvtype)
     assert kv.type == kvtype
 
+def test_ctype_key_value_cache():
+    from mxnet.kvstore import _ctype_key_value
+    vals = [[mx.nd.ones(shape) for _ in range(2)] for _ in keys]
+    ckeys, cvals, use_str_keys = _ctype_key_value(keys, vals)
+    assert not use_str_keys
+    assert list(ckeys) == [k for k in keys for _ in range(2)]
+    assert [v for v in cvals] == [v.handle.value for val in vals for v in val]
+    # the prepared arrays are reused for the same keys and arrays
+    assert _ctype_key_value(keys, vals)[1] is cvals
+    assert _ctype_key_value(keys, [val[::-1] for val in vals])[1] is not cvals
+    ckeys, _, use_str_keys = _ctype_key_value(str_keys, [mx.nd.ones(shape)] * len(str_keys))
+    assert use_str_keys
+    assert [py_str(k) for k in ckeys] == str_keys
+
 @with_seed()
 def test_invalid_pull():
     def check_ignored_pull_single(kv, key):
@@ -4793,6 +4793,20 @@ def test_all_finite():
     assert sym_output[0] == 1
 
 
+@with_seed()
+def test_multi_sum_sq():
+    # array sizes span several reduction blocks and include an empty array
+    shapes = [(3, 4), (0,), (5000,), (17, 33, 20), (1,)]
+    for dtype in [np.float16, np.float32, np.float64]:
+        arrays = [mx.nd.random.uniform(-1, 1, shape=shape, dtype=dtype) for shape in shapes]
+        out = mx.nd.multi_sum_sq(*arrays, num_arrays=len(arrays))
+        assert out.dtype == np.float32
+        assert out.shape == (len(arrays),)
+        expected = [np.square(a.asnumpy().astype(np.float64)).sum() for a in arrays]
+        rtol = 1e-2 if dtype == np.float16 else 1e-4
+        assert_almost_equal(out.asnumpy(), np.array(expected), rtol=rtol, atol=1e-3)
+
+
 @with_seed()
 def test_repeat():
     def test_repeat_forward():
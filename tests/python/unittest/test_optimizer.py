@@ -1147,6 +1147,33 @@ def test_adagrad():
                             compare_optimizer(opt1(**kwarg), opt2(**kwarg), shape, dtype,
                                               g_stype='row_sparse')
 
+@with_seed()
+def test_multi_tensor_updates():
+    shapes = [(3, 4), (17,), (2, 5, 6), (1,)]
+    opt_options = [(mx.optimizer.Adam, {}),
+                   (mx.optimizer.Adam, {'clip_gradient': 0.4, 'wd': 0.03}),
+                   (mx.optimizer.RMSProp, {'clip_weights': 0.5}),
+                   (mx.optimizer.NAG, {'momentum': 0.9, 'wd': 0.03}),
+                   (mx.optimizer.AdaGrad, {'rescale_grad': 0.5}),
+                   (mx.optimizer.Ftrl, {'wd': 0.03})]
+    for opt_class, kwargs in opt_options:
+        # one fused update over all weights versus one update per weight
+        opt1 = opt_class(**kwargs)
+        opt1.aggregate_num = len(shapes)
+        opt2 = opt_class(**kwargs)
+        opt2.aggregate_num = 0
+        updater1 = mx.optimizer.get_updater(opt1)
+        updater2 = mx.optimizer.get_updater(opt2)
+        weights1 = [mx.nd.random.uniform(shape=shape) for shape in shapes]
+        weights2 = [w.copy() for w in weights1]
+        for _ in range(3):
+            grads = [mx.nd.random.uniform(-1, 1, shape=shape) for shape in shapes]
+            updater1(list(range(len(shapes))), grads, weights1)
+            for i, (g, w) in enumerate(zip(grads, weights2)):
+                updater2(i, g, w)
+        for w1, w2 in zip(weights1, weights2):
+            assert_almost_equal(w1.asnumpy(), w2.asnumpy(), rtol=1e-5, atol=1e-6)
+
 # AdaDelta
 class PyAdaDelta(mx.optimizer.Optimizer):
     """The python reference of AdaDelta optimizer.
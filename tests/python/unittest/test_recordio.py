@@ -17,6 +17,7 @@
 
 # pylint: skip-file
 import sys
+import pickle
 import mxnet as mx
 import numpy as np
 import tempfile
@@ -70,6 +71,57 @@ def test_indexed_recordio():
         else:
             assert res == bytes(str(chr(i)), 'utf-8')
 
+@with_seed()
+def test_indexed_recordio_read_batch():
+    fidx = tempfile.mktemp()
+    frec = tempfile.mktemp()
+    N = 255
+
+    writer = mx.recordio.MXIndexedRecordIO(fidx, frec, 'w')
+    for i in range(N):
+        writer.write_idx(i, bytes(str(i) * (i % 7), 'utf-8') if sys.version_info[0] >= 3 \
+            else str(i) * (i % 7))
+    del writer
+
+    reader = mx.recordio.MXIndexedRecordIO(fidx, frec, 'r')
+    assert reader.read_batch([]) == []
+    for idxs in [list(range(N)), random.sample(range(N), 50), [3, 3, 2, 3, 1]]:
+        assert reader.read_batch(idxs) == [reader.read_idx(i) for i in idxs]
+
+    dataset = mx.gluon.data.RecordFileDataset(frec)
+    indices = random.sample(range(N), 20)
+    assert dataset._getitems(indices) == [dataset[i] for i in indices]
+    transformed = dataset.transform(lambda x: len(x))
+    assert transformed._getitems(indices) == [transformed[i] for i in indices]
+
+@with_seed()
+def test_indexed_recordio_binary_idx():
+    fidx = tempfile.mktemp()
+    fbidx = tempfile.mktemp()
+    frec = tempfile.mktemp()
+    N = 255
+
+    for keys in [list(range(N)), random.sample(range(10 * N), N)]:
+        writer = mx.recordio.MXIndexedRecordIO(fidx, frec, 'w')
+        for i in keys:
+            writer.write_idx(i, bytes(str(i), 'utf-8') if sys.version_info[0] >= 3 else str(i))
+        del writer
+        mx.recordio.convert_idx_to_binary(fidx, fbidx)
+
+        reader = mx.recordio.MXIndexedRecordIO(fbidx, frec, 'r')
+        assert list(reader.keys) == keys
+        assert len(reader.idx) == N
+        assert (N * 10 + 1) not in reader.idx
+        shuffled = list(reader.keys)
+        random.shuffle(shuffled)
+        for i in shuffled:
+            assert reader.read_idx(i) == str(i).encode('utf-8')
+        # the index is mapped again after pickling
+        reader = pickle.loads(pickle.dumps(reader))
+        assert list(reader.keys) == keys
+        assert reader.read_idx(keys[-1]) == str(keys[-1]).encode('utf-8')
+        reader.close()
+
 @with_seed()
 def test_recordio_pack_label():
     frec = tempfile.mktemp()
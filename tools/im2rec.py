@@ -27,6 +27,7 @@ import mxnet as mx
 import random
 import argparse
 import cv2
+import json
 import time
 import traceback
 
@@ -212,20 +213,35 @@ def image_encode(args, i, item, q_out):
 def read_worker(args, q_in, q_out):
     """Function that will be spawned to fetch the image
     from the input queue and put it back to output queue.
+    The i-th image is sent to the output queue of shard i % len(q_out),
+    so that images are evenly balanced across shards.
     Parameters
     ----------
     args: object
     q_in: queue
-    q_out: queue
+    q_out: list of queue, one for each shard
     """
     while True:
         deq = q_in.get()
         if deq is None:
             break
         i, item = deq
-        image_encode(args, i, item, q_out)
+        image_encode(args, i // len(q_out), item, q_out[i % len(q_out)])
+
+def shard_name(fname, shard, num_shards):
+    """Returns the file name without extension of a shard.
+    Parameters
+    ----------
+    fname: string
+    shard: int
+    num_shards: int
+    """
+    fname = os.path.splitext(os.path.basename(fname))[0]
+    if num_shards == 1:
+        return fname
+    return '%s-%05d-of-%05d' % (fname, shard, num_shards)
 
-def write_worker(q_out, fname, working_dir):
+def write_worker(q_out, fname, working_dir, shard=0, num_shards=1, q_stats=None):
     """Function that will be spawned to fetch processed image
     from the output queue and write to the .rec file.
     Parameters
@@ -233,12 +249,16 @@ def write_worker(q_out, fname, working_dir):
     q_out: queue
     fname: string
     working_dir: string
+    shard: int
+    num_shards: int
+    q_stats: queue, receives (shard, number of records written) when done
     """
     pre_time = time.time()
     count = 0
-    fname = os.path.basename(fname)
-    fname_rec = os.path.splitext(fname)[0] + '.rec'
-    fname_idx = os.path.splitext(fname)[0] + '.idx'
+    written = 0
+    fname = shard_name(fname, shard, num_shards)
+    fname_rec = fname + '.rec'
+    fname_idx = fname + '.idx'
     record = mx.recordio.MXIndexedRecordIO(os.path.join(working_dir, fname_idx),
                                            os.path.join(working_dir, fname_rec), 'w')
     buf = {}
@@ -255,12 +275,38 @@ def write_worker(q_out, fname, working_dir):
             del buf[count]
             if s is not None:
                 record.write_idx(item[0], s)
+                written += 1
 
             if count % 1000 == 0:
                 cur_time = time.time()
-                print('time:', cur_time - pre_time, ' count:', count)
+                print('time:', cur_time - pre_time, ' count:', count, ' shard:', shard)
                 pre_time = cur_time
             count += 1
+    record.close()
+    if q_stats is not None:
+        q_stats.put((shard, written))
+
+def write_manifest(fname, working_dir, num_records):
+    """Writes a json manifest describing the shards created from a list file.
+    Parameters
+    ----------
+    fname: string
+    working_dir: string
+    num_records: list of int, number of records in each shard
+    """
+    num_shards = len(num_records)
+    shards = []
+    for shard, count in enumerate(num_records):
+        name = shard_name(fname, shard, num_shards)
+        shards.append({'rec': name + '.rec', 'idx': name + '.idx', 'num_records': count})
+    manifest = {'list': os.path.basename(fname),
+                'num_shards': num_shards,
+                'num_records': sum(num_records),
+                'shards': shards}
+    path = os.path.join(working_dir, os.path.splitext(os.path.basename(fname))[0] + '.manifest.json')
+    with open(path, 'w') as fout:
+        json.dump(manifest, fout, indent=2)
+    print('Wrote manifest of', num_shards, 'shards to', path)
 
 def parse_args():
     """Defines all arguments.
@@ -317,6 +363,10 @@ def parse_args():
                         help='specify the encoding of the images.')
     rgroup.add_argument('--pack-label', action='store_true',
         help='Whether to also pack multi dimensional label in the record file')
+    rgroup.add_argument('--num-shards', type=int, default=1,
+                        help='number of .rec/.idx shards to write in parallel, one writer process\
+        each. Shards are named <prefix>-<shard>-of-<num-shards>.rec and described by\
+        <prefix>.manifest.json. Images are assigned to shards in round-robin order.')
     args = parser.parse_args()
     args.prefix = os.path.abspath(args.prefix)
     args.root = os.path.abspath(args.root)
@@ -342,18 +392,24 @@ if __name__ == '__main__':
                 count += 1
                 image_list = read_list(fname)
                 # -- write_record -- #
-                if args.num_thread > 1 and multiprocessing is not None:
+                num_shards = max(1, args.num_shards)
+                if (args.num_thread > 1 or num_shards > 1) and multiprocessing is not None:
                     q_in = [multiprocessing.Queue(1024) for i in range(args.num_thread)]
-                    q_out = multiprocessing.Queue(1024)
+                    q_out = [multiprocessing.Queue(1024) for i in range(num_shards)]
+                    q_stats = multiprocessing.Queue()
                     # define the process
                     read_process = [multiprocessing.Process(target=read_worker, args=(args, q_in[i], q_out)) \
                                     for i in range(args.num_thread)]
                     # process images with num_thread process
                     for p in read_process:
                         p.start()
-                    # only use one process to write .rec to avoid race-condtion
-                    write_process = multiprocessing.Process(target=write_worker, args=(q_out, fname, working_dir))
-                    write_process.start()
+                    # only use one process per shard to write .rec to avoid race-condtion
+                    write_process = [multiprocessing.Process(target=write_worker,
+                                                             args=(q_out[i], fname, working_dir,
+                                                                   i, num_shards, q_stats)) \
+                                     for i in range(num_shards)]
+                    for p in write_process:
+                        p.start()
                     # put the image list into input queue
                     for i, item in enumerate(image_list):
                         q_in[i % len(q_in)].put((i, item))
@@ -362,8 +418,16 @@ if __name__ == '__main__':
                     for p in read_process:
                         p.join()
 
-                    q_out.put(None)
-                    write_process.join()
+                    for q in q_out:
+                        q.put(None)
+                    num_records = [0] * num_shards
+                    for _ in range(num_shards):
+                        shard, written = q_stats.get()
+                        num_records[shard] = written
+                    for p in write_process:
+                        p.join()
+                    if num_shards > 1:
+                        write_manifest(fname, working_dir, num_records)
                 else:
                     print('multiprocessing not available, fall back to single threaded encoding')
                     try:
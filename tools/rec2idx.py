@@ -44,23 +44,29 @@ class IndexCreator(mx.recordio.MXRecordIO):
         Path to the index file, that will be created/overwritten.
     key_type : type
         Data type for keys (optional, default = int).
+    binary : bool
+        Whether to create a memory-mappable binary index instead of a text index
+        (optional, default = False). Requires int keys.
     """
-    def __init__(self, uri, idx_path, key_type=int):
+    def __init__(self, uri, idx_path, key_type=int, binary=False):
         self.key_type = key_type
+        self.binary = binary
         self.fidx = None
         self.idx_path = idx_path
         super(IndexCreator, self).__init__(uri, 'r')
 
     def open(self):
         super(IndexCreator, self).open()
-        self.fidx = open(self.idx_path, 'w')
+        if not self.binary:
+            self.fidx = open(self.idx_path, 'w')
 
     def close(self):
         """Closes the record and index files."""
         if not self.is_open:
             return
         super(IndexCreator, self).close()
-        self.fidx.close()
+        if self.fidx is not None:
+            self.fidx.close()
 
     def tell(self):
         """Returns the current position of read head.
@@ -75,6 +81,8 @@ class IndexCreator(mx.recordio.MXRecordIO):
         self.reset()
         counter = 0
         pre_time = time.time()
+        keys = []
+        offsets = []
         while True:
             if counter % 1000 == 0:
                 cur_time = time.time()
@@ -84,8 +92,14 @@ class IndexCreator(mx.recordio.MXRecordIO):
             if cont is None:
                 break
             key = self.key_type(counter)
-            self.fidx.write('%s\t%d\n'%(str(key), pos))
+            if self.binary:
+                keys.append(key)
+                offsets.append(pos)
+            else:
+                self.fidx.write('%s\t%d\n'%(str(key), pos))
             counter = counter + 1
+        if self.binary:
+            mx.recordio._write_binary_idx(self.idx_path, keys, offsets)
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -93,6 +107,13 @@ def parse_args():
         description='Create an index file from .rec file')
     parser.add_argument('record', help='path to .rec file.')
     parser.add_argument('index', help='path to index file.')
+    parser.add_argument('--binary', action='store_true',
+                        help='create a memory-mappable binary index instead of a text index. '
+                        'It loads much faster for large record files, but can only be read '
+                        'by mx.recordio.MXIndexedRecordIO.')
+    parser.add_argument('--from-idx', type=str, default=None,
+                        help='convert an existing text index file into the binary index '
+                        'instead of scanning the record file.')
     args = parser.parse_args()
     args.record = os.path.abspath(args.record)
     args.index = os.path.abspath(args.index)
@@ -101,6 +122,9 @@ def parse_args():
 
 if __name__ == '__main__':
     args = parse_args()
-    creator = IndexCreator(args.record, args.index)
-    creator.create_index()
-    creator.close()
+    if args.from_idx:
+        mx.recordio.convert_idx_to_binary(args.from_idx, args.index)
+    else:
+        creator = IndexCreator(args.record, args.index, binary=args.binary)
+        creator.create_index()
+        creator.close()